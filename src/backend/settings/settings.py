@@ -158,6 +158,25 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Simulation result cache (seeded blueprints only). Without a directory
+# results are only cached in memory.
+SIMULATION_CACHE_DIR = os.getenv("SIMULATION_CACHE_DIR") or None
+SIMULATION_CACHE_MAX_MEMORY_BYTES = int(
+    os.getenv("SIMULATION_CACHE_MAX_MEMORY_BYTES", 64 * 1024 * 1024)
+)
+SIMULATION_CACHE_MAX_DISK_BYTES = int(
+    os.getenv("SIMULATION_CACHE_MAX_DISK_BYTES", 1024 * 1024 * 1024)
+)
+
+# Per-request simulation budget. A run reaching a limit returns the partial
+# recording with a truncation marker (and the X-Simulation-Truncated header)
+# instead of pinning the worker. All limits are off by default (0 disables a
+# limit); deployments opt in, e.g. SIMULATION_MAX_WALL_SECONDS=30.
+SIMULATION_MAX_WALL_SECONDS = float(os.getenv("SIMULATION_MAX_WALL_SECONDS", 0)) or None
+SIMULATION_MAX_EVENTS = int(os.getenv("SIMULATION_MAX_EVENTS", 0)) or None
+SIMULATION_MAX_SEGMENTS = int(os.getenv("SIMULATION_MAX_SEGMENTS", 0)) or None
+
+
 # Logging
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
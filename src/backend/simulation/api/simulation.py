@@ -1,15 +1,89 @@
+from functools import cache
 from typing import List, Optional
 
-from django.http import HttpRequest
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from destiny_sim.builder.cache import RecordingCache
 from destiny_sim.builder.runner import get_registered_entities, run_blueprint
 from destiny_sim.builder.schema import Blueprint, BuilderEntitySchema
-from destiny_sim.core.timeline import SimulationRecording
-from ninja import Router
+from destiny_sim.core.budget import RunBudget
+from destiny_sim.core.timeline import (
+    BINARY_RECORDING_MEDIA_TYPE,
+    NORMALIZED_RECORDING_MEDIA_TYPE,
+    SimulationRecording,
+    encode_recording,
+)
+from ninja import Query, Router
+from ninja.errors import HttpError
 
 from agent.storage import BlueprintStorage
 
 router = Router()
 
+# Response header set to the truncation reason when a run hit its budget
+TRUNCATION_HEADER = "X-Simulation-Truncated"
+# Accept entries that select the default SimulationRecording JSON
+_DEFAULT_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+# Alternative recording formats, in increasing order of preference
+_RECORDING_MEDIA_TYPES = (NORMALIZED_RECORDING_MEDIA_TYPE, BINARY_RECORDING_MEDIA_TYPE)
+
+
+@cache
+def _recording_cache() -> RecordingCache:
+    """Process-wide cache of simulation results, configured from settings."""
+    return RecordingCache(
+        directory=settings.SIMULATION_CACHE_DIR,
+        max_memory_bytes=settings.SIMULATION_CACHE_MAX_MEMORY_BYTES,
+        max_disk_bytes=settings.SIMULATION_CACHE_MAX_DISK_BYTES,
+    )
+
+
+def _run_budget() -> RunBudget:
+    """Limits of a single simulation request, configured from settings."""
+    return RunBudget(
+        max_wall_seconds=settings.SIMULATION_MAX_WALL_SECONDS,
+        max_events=settings.SIMULATION_MAX_EVENTS,
+        max_segments=settings.SIMULATION_MAX_SEGMENTS,
+    )
+
+
+def _accepted_media_types(request: HttpRequest) -> dict[str, float]:
+    """Return the media types of the request's Accept header by q-value."""
+    accepted = {}
+    for item in request.headers.get("accept", "").split(","):
+        media_type, *parameters = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type:
+            accepted[media_type.lower()] = quality
+    return accepted
+
+
+def _recording_media_type(request: HttpRequest) -> str | None:
+    """
+    Return the recording format to respond with, or None for the default.
+
+    The supported type with the highest q-value wins; q=0 refuses a type.
+    The recording formats win ties with the default JSON (application/json
+    or a wildcard), binary before normalized JSON.
+    """
+    accepted = _accepted_media_types(request)
+    default_quality = max(
+        accepted.get(media_type, 0.0) for media_type in _DEFAULT_MEDIA_TYPES
+    )
+    # (quality, rank, media type); on equal quality the higher rank wins
+    candidates = [(default_quality, 0, None)]
+    for rank, media_type in enumerate(_RECORDING_MEDIA_TYPES, start=1):
+        candidates.append((accepted.get(media_type, 0.0), rank, media_type))
+    quality, _, media_type = max(candidates)
+    return media_type if quality > 0 else None
+
 
 @router.get("/schema", response=List[BuilderEntitySchema])
 def get_schema(request):
@@ -19,25 +93,94 @@ def get_schema(request):
     entities = get_registered_entities()
     return [cls.get_parameters_schema() for cls in entities.values()]
 
+def _parse_labels(labels: Optional[List[str]]) -> dict[str, str]:
+    """Parse "key:value" label filters from the query string."""
+    parsed = {}
+    for label in labels or []:
+        key, separator, value = label.partition(":")
+        if not separator or not key:
+            raise HttpError(
+                400, f"Invalid label filter '{label}', expected 'key:value'"
+            )
+        parsed[key] = value
+    return parsed
+
+
 @router.post("/simulate", response=SimulationRecording, by_alias=True)
-def run_simulation(request: HttpRequest, blueprint: Optional[Blueprint] = None) -> SimulationRecording:
+def run_simulation(
+    request: HttpRequest,
+    response: HttpResponse,
+    blueprint: Optional[Blueprint] = None,
+    metric: Optional[str] = None,
+    label: List[str] = Query(None),
+) -> SimulationRecording:
     """
     Runs a simulation using the provided blueprint or the one stored in session.
-    
+
+    Results of seeded blueprints are cached, so re-running an unchanged
+    blueprint returns the cached recording.
+
+    Runs are limited by the SIMULATION_MAX_* settings (no limits by
+    default). A run that reaches a limit returns the recording so far, with
+    truncation set to the reason and the simulation time reached, and the
+    reason in the X-Simulation-Truncated header.
+
+    Metrics can be filtered with query parameters, so that clients only
+    receive what they plot:
+    - metric: metric name to match exactly
+    - label: "key:value" label the metric must have (repeatable), e.g.
+      label=entity_type:buffer
+
+    The response format is negotiated from the Accept header (highest
+    q-value first, q=0 refuses a format):
+    - application/vnd.destiny.recording: compact binary recording
+    - application/vnd.destiny.recording+json: normalized JSON recording
+    - anything else: SimulationRecording JSON (default)
+
     Args:
         request: Django HTTP request
+        response: Response whose headers are used for the default format
         blueprint: Optional blueprint to use. If not provided, uses session-stored blueprint.
-    
+        metric: Optional metric name filter
+        label: Optional "key:value" label filters
+
     Returns:
         SimulationRecording with the simulation results
     """
     if blueprint is None:
         storage = BlueprintStorage(session=request.session)
         blueprint = storage.get_blueprint()
-    
+
+    labels = _parse_labels(label)
+
     try:
-        recording = run_blueprint(blueprint)
-        return recording
+        recording = run_blueprint(
+            blueprint, cache=_recording_cache(), budget=_run_budget()
+        )
     except Exception as e:
         # We'll let Ninja handle the 500, or we could catch and return 400
         raise e
+
+    if metric is not None or labels:
+        recording.metrics = recording.metrics.filter(metric, labels)
+
+    headers = {}
+    if recording.truncation is not None:
+        headers[TRUNCATION_HEADER] = recording.truncation.reason.value
+
+    media_type = _recording_media_type(request)
+    if media_type == BINARY_RECORDING_MEDIA_TYPE:
+        return HttpResponse(
+            encode_recording(recording),
+            content_type=BINARY_RECORDING_MEDIA_TYPE,
+            headers=headers,
+        )
+    if media_type == NORMALIZED_RECORDING_MEDIA_TYPE:
+        return HttpResponse(
+            recording.normalize().model_dump_json(by_alias=True),
+            content_type=NORMALIZED_RECORDING_MEDIA_TYPE,
+            headers=headers,
+        )
+    for name, value in headers.items():
+        response[name] = value
+    return recording
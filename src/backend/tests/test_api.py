@@ -8,6 +8,11 @@ from django.urls import reverse
 
 from destiny_sim.builder.entities.human import Human
 from destiny_sim.builder.runner import register_entity
+from destiny_sim.core.timeline import (
+    BINARY_RECORDING_MEDIA_TYPE,
+    NORMALIZED_RECORDING_MEDIA_TYPE,
+    decode_recording,
+)
 
 
 @pytest.fixture
@@ -47,6 +52,41 @@ def make_parameters(**kwargs):
     }
 
 
+def make_production_line_blueprint(duration):
+    """Blueprint of a source feeding a manufacturing cell that feeds a sink."""
+    cell_parameters = make_parameters(x=50.0, y=0.0, mean=1.0, std_dev=0.1)
+    cell_parameters["input"] = {
+        "name": "input",
+        "parameterType": "entity",
+        "value": "source-1",
+    }
+    cell_parameters["output"] = {
+        "name": "output",
+        "parameterType": "entity",
+        "value": "sink-1",
+    }
+    return {
+        "simParams": {"duration": duration},
+        "entities": [
+            {
+                "entityType": "source",
+                "name": "source-1",
+                "parameters": make_parameters(x=0.0, y=0.0),
+            },
+            {
+                "entityType": "sink",
+                "name": "sink-1",
+                "parameters": make_parameters(x=100.0, y=0.0),
+            },
+            {
+                "entityType": "manufacturing_cell",
+                "name": "cell-1",
+                "parameters": cell_parameters,
+            },
+        ],
+    }
+
+
 class TestSchemaEndpoint:
     """Tests for GET /api/schema endpoint."""
 
@@ -571,6 +611,112 @@ class TestSimulateEndpoint:
             assert "endX" in segment
             assert "endY" in segment
 
+    @pytest.mark.django_db
+    def test_simulate_binary_recording(self, api_client, register_human):
+        """Simulate endpoint should return the binary format when it is accepted."""
+        blueprint = {
+            "simParams": {"duration": 10},
+            "entities": [
+                {
+                    "entityType": "human",
+                    "name": "person-1",
+                    "parameters": make_parameters(
+                        x=100.0,
+                        y=100.0,
+                        targetX=500.0,
+                        targetY=300.0,
+                    ),
+                },
+            ],
+        }
+
+        response = api_client.post(
+            "/api/simulate",
+            data=blueprint,
+            content_type="application/json",
+            HTTP_ACCEPT=BINARY_RECORDING_MEDIA_TYPE,
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == BINARY_RECORDING_MEDIA_TYPE
+        # No budget is configured by default
+        assert "X-Simulation-Truncated" not in response
+
+        recording = decode_recording(response.content).to_recording()
+        assert recording.duration == 10
+        assert len(recording.motion_segments_by_entity) == 1
+
+    @pytest.mark.django_db
+    def test_simulate_respects_accept_q_values(self, api_client, register_human):
+        """Refused (q=0) or less preferred formats should not be returned."""
+        blueprint = {
+            "simParams": {"duration": 10},
+            "entities": [
+                {
+                    "entityType": "human",
+                    "name": "person-1",
+                    "parameters": make_parameters(
+                        x=100.0,
+                        y=100.0,
+                        targetX=500.0,
+                        targetY=300.0,
+                    ),
+                },
+            ],
+        }
+
+        def content_type(accept):
+            response = api_client.post(
+                "/api/simulate",
+                data=blueprint,
+                content_type="application/json",
+                HTTP_ACCEPT=accept,
+            )
+            assert response.status_code == 200
+            return response["Content-Type"]
+
+        refused = f"application/json, {BINARY_RECORDING_MEDIA_TYPE};q=0"
+        assert content_type(refused) == "application/json; charset=utf-8"
+        preferred = (
+            f"{BINARY_RECORDING_MEDIA_TYPE};q=0.5, "
+            f"{NORMALIZED_RECORDING_MEDIA_TYPE};q=0.8, application/json;q=0.2"
+        )
+        assert content_type(preferred) == NORMALIZED_RECORDING_MEDIA_TYPE
+        assert content_type(f"*/*;q=0.1, {BINARY_RECORDING_MEDIA_TYPE}") == (
+            BINARY_RECORDING_MEDIA_TYPE
+        )
+
+    @pytest.mark.django_db
+    def test_simulate_normalized_recording(self, api_client, register_human):
+        """Simulate endpoint should return normalized JSON when it is accepted."""
+        blueprint = {
+            "simParams": {"duration": 10},
+            "entities": [
+                {
+                    "entityType": "human",
+                    "name": "person-1",
+                    "parameters": make_parameters(
+                        x=100.0,
+                        y=100.0,
+                        targetX=500.0,
+                        targetY=300.0,
+                    ),
+                },
+            ],
+        }
+
+        response = api_client.post(
+            "/api/simulate",
+            data=blueprint,
+            content_type="application/json",
+            HTTP_ACCEPT=NORMALIZED_RECORDING_MEDIA_TYPE,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["entities"][0]["name"] == "person-1"
+        assert data["motion_segments"]["entity"] == [0, 0]
+
 
 class TestBlueprintEndpoint:
     """Tests for GET /api/blueprint and PUT /api/blueprint endpoints."""
@@ -711,3 +857,77 @@ class TestBlueprintEndpoint:
         names = [e["name"] for e in retrieved_data["entities"]]
         assert "person-1" in names
         assert "person-2" in names
+
+    @pytest.mark.django_db
+    def test_simulate_filters_metrics(self, api_client):
+        """Simulate endpoint should only return metrics matching the filters."""
+        blueprint = make_production_line_blueprint(duration=10)
+
+        response = api_client.post(
+            "/api/simulate?label=entity_type:sink",
+            data=blueprint,
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        metrics = response.json()["metrics"]
+        assert [m["labels"]["entity"] for m in metrics["counter"]] == ["sink-1"]
+        assert metrics["state"] == []
+
+        response = api_client.post(
+            "/api/simulate?label=entity",
+            data=blueprint,
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.django_db
+    def test_simulate_returns_cached_result_for_seeded_blueprint(
+        self, api_client, register_human, monkeypatch
+    ):
+        """Re-running an unchanged seeded blueprint should not simulate again."""
+        blueprint = {
+            "simParams": {"duration": 10, "seed": 3},
+            "entities": [
+                {
+                    "entityType": "human",
+                    "name": "person-1",
+                    "parameters": make_parameters(
+                        x=0.0, y=0.0, targetX=50.0, targetY=0.0
+                    ),
+                },
+            ],
+        }
+        first = api_client.post(
+            "/api/simulate", data=blueprint, content_type="application/json"
+        )
+
+        def fail(*args):
+            raise AssertionError("simulation was run")
+
+        monkeypatch.setattr("destiny_sim.builder.runner._instantiate_entities", fail)
+        second = api_client.post(
+            "/api/simulate", data=blueprint, content_type="application/json"
+        )
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+
+    @pytest.mark.django_db
+    def test_simulate_returns_truncated_recording_over_budget(
+        self, api_client, settings
+    ):
+        """A run exceeding the budget should return its partial recording."""
+        settings.SIMULATION_MAX_EVENTS = 20
+        blueprint = make_production_line_blueprint(duration=1000)
+
+        response = api_client.post(
+            "/api/simulate", data=blueprint, content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        recording = response.json()
+        assert recording["truncation"]["reason"] == "events"
+        assert recording["truncation"]["until"] == 1000
+        assert recording["duration"] == recording["truncation"]["sim_time"] < 1000
+        assert response["X-Simulation-Truncated"] == "events"
@@ -12,6 +12,7 @@ from destiny_sim.agv.location import Location
 from destiny_sim.agv.planning import TripPlan, WaypointType
 from destiny_sim.agv.store_location import StoreLocation
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import ENTITY_LABEL, ENTITY_TYPE_LABEL
 from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
 from destiny_sim.core.simulation_entity import SimulationEntity
 
@@ -42,7 +43,15 @@ class AGV(SimulationEntity):
         self._planned_destination: Location = start_location
         self._angle: float = 0.0
 
-        env.record_stay(
+        self._state_metric = env.state_metric(
+            f"{AGV_STATE_METRIC} {self.id}",
+            AGVState,
+            {ENTITY_LABEL: self.id, ENTITY_TYPE_LABEL: SimulationEntityType.AGV.value},
+        )
+        self._active_metric = env.gauge_metric(AGV_ACTIVE_METRIC)
+        self._delivery_time_metric = env.sample_metric(DELIVERY_TIME_METRIC)
+
+        env.record_stay_nowait(
             entity=self, x=self._current_location.x, y=self._current_location.y
         )
 
@@ -56,8 +65,8 @@ class AGV(SimulationEntity):
 
         if self._is_available:
             self._is_available = False
-            env.set_state(f"{AGV_STATE_METRIC} {self.id}", AGVState.BUSY)
-            env.adjust_gauge(AGV_ACTIVE_METRIC, 1)
+            self._state_metric.set(AGVState.BUSY)
+            self._active_metric.adjust(1)
             env.process(self._process_queue(env))
 
     def _process_queue(
@@ -68,8 +77,8 @@ class AGV(SimulationEntity):
             plan = self._plan_queue.popleft()
             yield from self._execute_plan(env, plan)
         self._is_available = True
-        env.adjust_gauge(AGV_ACTIVE_METRIC, -1)
-        env.set_state(f"{AGV_STATE_METRIC} {self.id}", AGVState.IDLE)
+        self._active_metric.adjust(-1)
+        self._state_metric.set(AGVState.IDLE)
 
     def _execute_plan(
         self, env: RecordingEnvironment, plan: TripPlan
@@ -86,7 +95,7 @@ class AGV(SimulationEntity):
             self._angle = end_angle  # update to face next destination
 
             # Record motion for AGV and yield the timeout including the carried item
-            env.record_stay(entity=self._carried_item, parent=self)
+            env.record_stay_nowait(entity=self._carried_item, parent=self)
             yield env.record_motion(
                 entity=self,
                 start_time=start_time,
@@ -120,13 +129,13 @@ class AGV(SimulationEntity):
                 # Record delivery time sample
                 if self._pickup_time is not None:
                     delivery_time = env.now - self._pickup_time
-                    env.record_sample(DELIVERY_TIME_METRIC, delivery_time)
+                    self._delivery_time_metric.record(delivery_time)
                     self._pickup_time = None
                 
                 self._carried_item = None
 
                 # Record AGV staying at drop location (infinite stay)
-                env.record_stay(
+                env.record_stay_nowait(
                     entity=self,
                     x=end_location.x,
                     y=end_location.y,
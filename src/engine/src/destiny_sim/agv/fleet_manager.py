@@ -2,9 +2,9 @@
 Fleet manager for coordinating AGVs.
 """
 
-import random
 from typing import Any, Generator
 
+import numpy as np
 from simpy import Event
 
 from destiny_sim.agv.agv import AGV
@@ -12,6 +12,7 @@ from destiny_sim.agv.items import Box
 from destiny_sim.agv.planning import AGVTask, TripPlan, Waypoint, WaypointType
 from destiny_sim.agv.site_graph import SiteGraph
 from destiny_sim.agv.store_location import StoreLocation
+from destiny_sim.core.distributions import Empirical, Normal
 from destiny_sim.core.environment import RecordingEnvironment
 
 
@@ -22,36 +23,54 @@ class TaskProvider:
         self,
         sources: list[StoreLocation],
         sinks: list[StoreLocation],
+        name: str,
         expected_task_interval: float = 10.0,
     ):
+        """
+        Args:
+            sources: Locations tasks pick up from
+            sinks: Locations tasks deliver to
+            name: Key of the provider's random stream (see
+                RecordingEnvironment.rng), unique within the environment
+            expected_task_interval: Mean time between tasks
+        """
         self._sources = sources
         self._sinks = sinks
         self._expected_task_interval = expected_task_interval
         self._first_task = True
+        self.name = name
+        self._task_interval: Normal | None = None
+        self._source_choice: Empirical | None = None
+        self._sink_choice: Empirical | None = None
+
+    def _create_distributions(self, env: RecordingEnvironment) -> None:
+        rng = env.rng(self.name)
+        interval = self._expected_task_interval
+        # Task intervals are at least 0.1
+        self._task_interval = Normal(rng, interval, interval * 0.2, low=0.1)
+        self._source_choice = Empirical(rng, self._sources)
+        self._sink_choice = Empirical(rng, self._sinks)
 
     def get_next_task(
         self, env: RecordingEnvironment
     ) -> Generator[Event, Any, AGVTask]:
         if self._first_task:
             self._first_task = False
+            self._create_distributions(env)
             return (yield from self._get_next_task(env))
 
-        sigma = self._expected_task_interval * 0.2
-        delay = random.gauss(self._expected_task_interval, sigma)
-        delay = max(0.1, delay)
-
-        yield env.timeout(delay)
+        yield env.timeout(self._task_interval.sample())
 
         return (yield from self._get_next_task(env))
 
     def _get_next_task(
         self, env: RecordingEnvironment
     ) -> Generator[Event, Any, AGVTask]:
-        source = random.choice(self._sources)
-        sink = random.choice(self._sinks)
+        source = self._source_choice.sample()
+        sink = self._sink_choice.sample()
 
         box = Box()
-        env.record_stay(entity=box, start_time=env.now, parent=source)
+        env.record_stay_nowait(entity=box, start_time=env.now, parent=source)
         yield source.put_item(env, box)
 
         return AGVTask(source=source, sink=sink)
@@ -65,8 +84,21 @@ class FleetManager:
     load balancing, or advanced scheduling.
     """
 
-    def __init__(self, task_provider: TaskProvider, site_graph: SiteGraph):
+    def __init__(
+        self,
+        task_provider: TaskProvider,
+        site_graph: SiteGraph,
+        name: str,
+    ):
+        """
+        Args:
+            task_provider: Source of the tasks to assign
+            site_graph: Graph the AGVs move on
+            name: Key of the manager's random stream (see
+                RecordingEnvironment.rng), unique within the environment
+        """
         self._task_provider = task_provider
+        self.name = name
         self._site_graph = site_graph
         self._agvs: list[AGV] = []
 
@@ -82,16 +114,18 @@ class FleetManager:
         self, env: RecordingEnvironment
     ) -> Generator[Event, Any, Any]:
         """Continuously assign tasks to available AGVs."""
+        rng = env.rng(self.name)
         while True:
             new_task = yield env.process(self._task_provider.get_next_task(env))
-            assigned_agv = self._find_best_agv_for_task(new_task)
+            assigned_agv = self._find_best_agv_for_task(new_task, rng)
             self._schedule_plan(env, assigned_agv, new_task)
 
-    def _find_best_agv_for_task(self, _task: AGVTask) -> AGV:
+    def _find_best_agv_for_task(
+        self, _task: AGVTask, rng: np.random.Generator
+    ) -> AGV:
         taskless_agvs = [agv for agv in self._agvs if agv.is_available()]
-        if len(taskless_agvs) == 0:
-            return random.choice(self._agvs)
-        return random.choice(taskless_agvs)
+        candidates = taskless_agvs or self._agvs
+        return candidates[rng.integers(len(candidates))]
 
     def _schedule_plan(
         self, env: RecordingEnvironment, agv: AGV, task: AGVTask
@@ -159,7 +159,7 @@ class SiteGraph:
             # Create a visual entity for the node
             node_entity = GridNode()
 
-            env.record_stay(entity=node_entity, x=location.x, y=location.y)
+            env.record_stay_nowait(entity=node_entity, x=location.x, y=location.y)
 
 
 class GridSiteGraph(SiteGraph):
@@ -43,7 +43,7 @@ class StoreLocation(Location, SimulationEntity, Generic[T]):
             self.store.items.extend(initial_items)
 
         # Record static position (same start/end = not moving)
-        env.record_stay(entity=self, x=x, y=y)
+        env.record_stay_nowait(entity=self, x=x, y=y)
 
     def get_rendering_info(self) -> RenderingInfo:
         return RenderingInfo(entity_type=SimulationEntityType.PALETTE)
@@ -60,22 +60,30 @@ class StoreLocation(Location, SimulationEntity, Generic[T]):
 class Source(StoreLocation[T]):
     """A store location that provides items."""
 
+    def __init__(self, env: RecordingEnvironment, *args, **kwargs):
+        super().__init__(env, *args, **kwargs)
+        self._requests_metric = env.counter_metric(SOURCE_ITEM_REQUEST_METRIC)
+
     def get_rendering_info(self) -> RenderingInfo:
         return RenderingInfo(entity_type=SimulationEntityType.PALETTE)
     
     def get_item(self, env: RecordingEnvironment) -> simpy.events.Event:
         """Request an item from the store location."""
-        env.incr_counter(SOURCE_ITEM_REQUEST_METRIC)
+        self._requests_metric.incr()
         return super().get_item(env)
 
 
 class Sink(StoreLocation[T]):
     """A store location that receives items."""
 
+    def __init__(self, env: RecordingEnvironment, *args, **kwargs):
+        super().__init__(env, *args, **kwargs)
+        self._requests_metric = env.counter_metric(SINK_ITEM_REQUEST_METRIC)
+
     def get_rendering_info(self) -> RenderingInfo:
         return RenderingInfo(entity_type=SimulationEntityType.PALETTE)
     
     def put_item(self, env: RecordingEnvironment, item: T) -> simpy.events.Event:
         """Put an item into the store location."""
-        env.incr_counter(SINK_ITEM_REQUEST_METRIC)
+        self._requests_metric.incr()
         return super().put_item(env, item)
@@ -0,0 +1,199 @@
+"""
+Content-addressed cache of blueprint simulation results.
+
+A run is identified by a hash of the canonical JSON of its blueprint
+(without presentation-only fields such as the canvas size), the run mode
+and the engine version. Only seeded blueprints are cached: without
+a seed every run draws fresh randomness and is expected to differ.
+
+Recordings are stored in the binary recording format, in two tiers:
+- memory: LRU of encoded recordings, bounded by max_memory_bytes
+- disk (optional): one file per key in a directory, bounded by
+  max_disk_bytes; the least recently used files are evicted first
+
+A cache can be shared between threads (e.g. the backend's request workers):
+the memory tier and disk eviction are guarded by a lock, and files are
+written to a temporary file and renamed into place, so readers (also in
+other processes) never see partial entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from destiny_sim.builder.schema import Blueprint
+from destiny_sim.core.timeline import (
+    BINARY_RECORDING_SUFFIX,
+    SimulationRecording,
+    decode_recording,
+    encode_recording,
+)
+
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024  # 64 MiB
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+# Blueprint fields the simulation does not read, left out of cache keys
+_PRESENTATION_FIELDS = {"simParams": {"canvasSize"}}
+
+
+def engine_version() -> str:
+    """Installed version of the engine, part of every cache key."""
+    try:
+        return version("destiny-sim")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class RecordingCache:
+    """
+    Two-tier (memory LRU and disk) cache of recordings by content hash.
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Args:
+            directory: Directory of the disk tier, or None for memory only
+            max_memory_bytes: Size budget of the encoded recordings in memory
+            max_disk_bytes: Size budget of the files in the directory
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(blueprint: Blueprint, metrics_only: bool = False) -> str | None:
+        """
+        Return the cache key of a run, or None if the run is not cacheable.
+
+        The key is the SHA-256 of the blueprint's canonical JSON (sorted keys,
+        no whitespace, presentation-only fields left out), the run mode and
+        the engine version.
+        """
+        if blueprint.simParams.seed is None:
+            return None
+        content = json.dumps(
+            {
+                "blueprint": blueprint.model_dump(
+                    mode="json", exclude=_PRESENTATION_FIELDS
+                ),
+                "metrics_only": metrics_only,
+                "engine": engine_version(),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> SimulationRecording | None:
+        """Return the cached recording of a key, or None on a miss."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is not None:
+            return decode_recording(data).to_recording()
+
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = path.read_bytes()
+            # Mark as recently used for disk eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by a concurrent writer
+            return None
+        with self._lock:
+            self._remember(key, data)
+        return decode_recording(data).to_recording()
+
+    def put(self, key: str, recording: SimulationRecording) -> None:
+        """Store a recording under a key in both tiers."""
+        data = encode_recording(recording)
+        with self._lock:
+            self._remember(key, data)
+
+        path = self._path(key)
+        if path is None or len(data) > self.max_disk_bytes:
+            return
+        # Write atomically so concurrent readers never see partial files
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._evict_disk(keep=path)
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.directory is not None:
+                for path in self.directory.glob(f"*{BINARY_RECORDING_SUFFIX}"):
+                    path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / f"{key}{BINARY_RECORDING_SUFFIX}"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """
+        Add an entry to the memory tier and evict down to the budget.
+
+        Called with the lock held.
+        """
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self, keep: Path) -> None:
+        """
+        Delete the least recently used files (but keep) until within budget.
+
+        Called with the lock held.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{BINARY_RECORDING_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort(key=lambda entry: (entry[2] == keep, entry[0]))
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -58,4 +58,4 @@ class Human(BuilderEntity):
             self.y = self.target_y
 
             # Stay at destination indefinitely
-            env.record_stay(self, x=self.x, y=self.y)
+            env.record_stay_nowait(self, x=self.x, y=self.y)
@@ -8,6 +8,7 @@ import simpy
 
 from destiny_sim.builder.entity import BuilderEntity
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import GaugeHandle
 from destiny_sim.core.rendering import SimulationEntityType
 
 BUFFER_NUMBER_OF_ITEMS_METRIC = "Number of items in buffer"
@@ -32,6 +33,7 @@ class Buffer(BuilderEntity):
         self.capacity = capacity
         
         self._store: simpy.Store | None = None
+        self._items_metric: GaugeHandle | None = None
         
     def process(self, env: RecordingEnvironment):
         yield env.record_stay(self, x=self.x, y=self.y)
@@ -39,9 +41,10 @@ class Buffer(BuilderEntity):
     def get_item(self, env: RecordingEnvironment) -> simpy.events.Event:
         """Request an item from the buffer."""
         event = self._get_store(env).get()
+        items_metric = self._items_metric
         
         def _decrement_buffer_gauge(event):
-            env.adjust_gauge(f"{BUFFER_NUMBER_OF_ITEMS_METRIC} {self.name}", -1)
+            items_metric.adjust(-1)
         
         event.callbacks.append(_decrement_buffer_gauge)
         return event
@@ -49,15 +52,19 @@ class Buffer(BuilderEntity):
     def put_item(self, env: RecordingEnvironment, item: Any) -> simpy.events.Event:
         """Put an item into the buffer."""
         event = self._get_store(env).put(item)
+        items_metric = self._items_metric
 
         def _increment_buffer_gauge(event):
-            env.adjust_gauge(f"{BUFFER_NUMBER_OF_ITEMS_METRIC} {self.name}", 1)
+            items_metric.adjust(1)
         
         event.callbacks.append(_increment_buffer_gauge)
         return event
 
     def _create_store(self, env: RecordingEnvironment):
         self._store = simpy.Store(env, capacity=self.capacity)
+        self._items_metric = env.gauge_metric(
+            f"{BUFFER_NUMBER_OF_ITEMS_METRIC} {self.name}", self.metric_labels()
+        )
     
     def _get_store(self, env: RecordingEnvironment) -> simpy.Store:
         if self._store is None:
@@ -2,9 +2,9 @@
 Control entity for simulation.
 """
 
-import random
 from typing import Any, Union
 
+import numpy as np
 import simpy
 
 from destiny_sim.agv.items import Box
@@ -12,6 +12,7 @@ from destiny_sim.builder.entities.material_flow.buffer import Buffer
 from destiny_sim.builder.entities.material_flow.sink import Sink
 from destiny_sim.builder.entity import BuilderEntity
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import CounterHandle
 from destiny_sim.core.rendering import SimulationEntityType
 
 CONTROL_OK_ITEMS_METRIC = "OK items from control"
@@ -42,6 +43,10 @@ class Control(BuilderEntity):
         self.nok_output = nok_output
         self.nok_probability = nok_probability
 
+        self._ok_metric: CounterHandle | None = None
+        self._nok_metric: CounterHandle | None = None
+        self._rng: np.random.Generator | None = None
+
     def process(self, env: RecordingEnvironment):
         """
         Main process: record stay at control position.
@@ -60,19 +65,29 @@ class Control(BuilderEntity):
             SimPy event for the put_item operation
         """
         # Determine if item is NOK based on probability
-        is_nok = random.random() < self.nok_probability
+        if self._rng is None:
+            self._rng = self.get_rng(env)
+        is_nok = self._rng.random() < self.nok_probability
         
         # Select output based on result
         output = self.nok_output if is_nok else self.ok_output
         
         # Record metric
+        if self._ok_metric is None:
+            labels = self.metric_labels()
+            self._ok_metric = env.counter_metric(
+                f"{CONTROL_OK_ITEMS_METRIC} {self.name}", labels
+            )
+            self._nok_metric = env.counter_metric(
+                f"{CONTROL_NOK_ITEMS_METRIC} {self.name}", labels
+            )
         if is_nok:
-            env.incr_counter(f"{CONTROL_NOK_ITEMS_METRIC} {self.name}")
+            self._nok_metric.incr()
         else:
-            env.incr_counter(f"{CONTROL_OK_ITEMS_METRIC} {self.name}")
+            self._ok_metric.incr()
         
         # Visualize material flow to selected output
-        env.record_motion(
+        env.record_motion_nowait(
             Box(),
             start_x=self.x,
             start_y=self.y,
@@ -5,14 +5,13 @@ ManufacturingCell entity for simulation.
 from enum import StrEnum
 from typing import Union
 
-import numpy as np
-
 from destiny_sim.agv.items import Box
 from destiny_sim.builder.entities.material_flow.buffer import Buffer
 from destiny_sim.builder.entities.material_flow.control import Control
 from destiny_sim.builder.entities.material_flow.sink import Sink
 from destiny_sim.builder.entities.material_flow.source import Source
 from destiny_sim.builder.entity import BuilderEntity
+from destiny_sim.core.distributions import LogNormal
 from destiny_sim.core.environment import RecordingEnvironment
 from destiny_sim.core.rendering import SimulationEntityType
 
@@ -57,26 +56,24 @@ class ManufacturingCell(BuilderEntity):
         process them (with lognormal duration), and put them in output buffer.
         """
         # Record stay at manufacturing cell position
-        env.record_stay(self, x=self.x, y=self.y)
-        env.set_state(
+        env.record_stay_nowait(self, x=self.x, y=self.y)
+        state_metric = env.state_metric(
             f"{MANUFACTURING_CELL_STATE_METRIC} {self.name}",
-            ManufacturingCellState.IDLE,
+            ManufacturingCellState,
+            self.metric_labels(),
         )
+        state_metric.set(ManufacturingCellState.IDLE)
+        processing_time = LogNormal(self.get_rng(env), self.mean, self.std_dev)
 
         while True:
             # Get item from input buffer
             item = yield self.input.get_item(env)
 
             # Set state to processing
-            env.set_state(
-                f"{MANUFACTURING_CELL_STATE_METRIC} {self.name}",
-                ManufacturingCellState.PROCESSING,
-            )
+            state_metric.set(ManufacturingCellState.PROCESSING)
 
-            # Calculate processing duration using lognormal distribution
-            mu = np.log(self.mean**2 / np.sqrt(self.std_dev**2 + self.mean**2))
-            sigma = np.sqrt(np.log(1 + self.std_dev**2 / self.mean**2))
-            duration = np.random.lognormal(mean=mu, sigma=sigma)
+            # Draw processing duration from the lognormal distribution
+            duration = processing_time.sample()
 
             # Visualize material flow
             self._visualize_material_flow(env, duration)
@@ -85,10 +82,7 @@ class ManufacturingCell(BuilderEntity):
             yield env.timeout(duration)
 
             # Set state to idle
-            env.set_state(
-                f"{MANUFACTURING_CELL_STATE_METRIC} {self.name}",
-                ManufacturingCellState.IDLE,
-            )
+            state_metric.set(ManufacturingCellState.IDLE)
 
             # Put item in output buffer
             yield self.output.put_item(env, item)
@@ -106,7 +100,7 @@ class ManufacturingCell(BuilderEntity):
 
         box = Box()
         # Visualize material flow in
-        env.record_motion(
+        env.record_motion_nowait(
             box,
             start_x=self.input.x,
             start_y=self.input.y,
@@ -116,7 +110,7 @@ class ManufacturingCell(BuilderEntity):
         )
 
         # Visualize processing
-        env.record_stay(
+        env.record_stay_nowait(
             box,
             x=self.x,
             y=self.y,
@@ -125,7 +119,7 @@ class ManufacturingCell(BuilderEntity):
         )
 
         # Visualize material flow out
-        env.record_motion(
+        env.record_motion_nowait(
             box,
             start_x=self.x,
             start_y=self.y,
@@ -8,6 +8,7 @@ import simpy
 
 from destiny_sim.builder.entity import BuilderEntity
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import CounterHandle
 from destiny_sim.core.rendering import SimulationEntityType
 
 SINK_ITEM_DELIVERED_METRIC = "Items delivered to sink"
@@ -29,6 +30,8 @@ class Sink(BuilderEntity):
         self.x = x
         self.y = y
         self.items_delivered = 0
+
+        self._delivered_metric: CounterHandle | None = None
         
     def process(self, env: RecordingEnvironment):
         yield env.record_stay(self, x=self.x, y=self.y)
@@ -36,5 +39,12 @@ class Sink(BuilderEntity):
     def put_item(self, env: RecordingEnvironment, item: Any) -> simpy.events.Event:
         """Put an item into the sink."""
         self.items_delivered += 1
-        env.incr_counter(f"{SINK_ITEM_DELIVERED_METRIC} {self.name}")
+        self._get_delivered_metric(env).incr()
         return env.timeout(0)
+
+    def _get_delivered_metric(self, env: RecordingEnvironment) -> CounterHandle:
+        if self._delivered_metric is None:
+            self._delivered_metric = env.counter_metric(
+                f"{SINK_ITEM_DELIVERED_METRIC} {self.name}", self.metric_labels()
+            )
+        return self._delivered_metric
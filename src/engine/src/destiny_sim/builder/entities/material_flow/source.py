@@ -6,6 +6,7 @@ import simpy
 
 from destiny_sim.builder.entity import BuilderEntity
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import CounterHandle
 from destiny_sim.core.rendering import SimulationEntityType
 
 SOURCE_ITEM_PRODUCED_METRIC = "Items produced by source"
@@ -26,6 +27,8 @@ class Source(BuilderEntity):
         super().__init__(name=name)
         self.x = x
         self.y = y
+
+        self._produced_metric: CounterHandle | None = None
         
     def process(self, env: RecordingEnvironment):
         yield env.record_stay(self, x=self.x, y=self.y)
@@ -34,5 +37,12 @@ class Source(BuilderEntity):
         """Request an item from the source."""
         event = env.event()
         event.succeed("foo")  # todo: add some actual item
-        env.incr_counter(f"{SOURCE_ITEM_PRODUCED_METRIC} {self.name}")
+        self._get_produced_metric(env).incr()
         return event
+
+    def _get_produced_metric(self, env: RecordingEnvironment) -> CounterHandle:
+        if self._produced_metric is None:
+            self._produced_metric = env.counter_metric(
+                f"{SOURCE_ITEM_PRODUCED_METRIC} {self.name}", self.metric_labels()
+            )
+        return self._produced_metric
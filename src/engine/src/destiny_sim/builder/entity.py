@@ -5,8 +5,11 @@ Base classes for builder entities.
 import inspect
 from typing import get_args
 
+import numpy as np
+
 from destiny_sim.builder.schema import BuilderEntitySchema, ParameterInfo, ParameterType
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import ENTITY_LABEL, ENTITY_TYPE_LABEL
 from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
 from destiny_sim.core.simulation_entity import SimulationEntity
 
@@ -26,6 +29,14 @@ class BuilderEntity(SimulationEntity):
     def get_rendering_info(self) -> RenderingInfo:
         return RenderingInfo(self.entity_type, name=self.name)
 
+    def metric_labels(self) -> dict[str, str]:
+        """Labels of the metrics of this entity, for MetricsContainer.query()."""
+        return {ENTITY_LABEL: self.name, ENTITY_TYPE_LABEL: self.entity_type.value}
+
+    def get_rng(self, env: RecordingEnvironment) -> np.random.Generator:
+        """Random stream of this entity, keyed by its entity type and name."""
+        return env.rng(f"{self.entity_type.value}:{self.name}")
+
     def process(self, env: RecordingEnvironment):
         """
         The main process for this entity.
@@ -0,0 +1,151 @@
+"""
+Results of independent replications of a blueprint.
+
+Each replication is reduced to scalar KPIs, one or more per metric:
+- counter: final value
+- gauge: time-weighted mean
+- sample: mean of the observations
+- state: fraction of time spent in each state
+
+Across replications every KPI is aggregated into a mean with a Student-t
+confidence interval.
+"""
+
+import math
+from statistics import NormalDist
+
+from pydantic import BaseModel
+
+from destiny_sim.core.metrics import Metric, MetricsSchema
+from destiny_sim.core.timeline import SimulationRecording
+
+
+class ReplicationResult(BaseModel):
+    """KPIs of a single replication, and its recording if it was kept."""
+
+    seed: int
+    kpis: dict[str, float]
+    recording: SimulationRecording | None = None
+
+
+class KPIEstimate(BaseModel):
+    """Mean of a KPI over replications with a confidence interval."""
+
+    n: int
+    mean: float
+    std: float
+    lower: float
+    upper: float
+
+
+class ReplicationSummary(BaseModel):
+    """Per-replication results and the KPI estimates aggregated over them."""
+
+    confidence: float
+    replications: list[ReplicationResult]
+    kpis: dict[str, KPIEstimate]
+
+
+def kpi_key(metric: Metric) -> str:
+    """Name of a metric's KPI: the metric name with its labels, if any."""
+    if not metric.labels:
+        return metric.name
+    labels = ",".join(f"{key}={value}" for key, value in sorted(metric.labels.items()))
+    return f"{metric.name}{{{labels}}}"
+
+
+def summarize_metrics(metrics: MetricsSchema) -> dict[str, float]:
+    """Reduce the metrics of one run to scalar KPIs (see module docstring)."""
+    kpis: dict[str, float] = {}
+
+    for metric in metrics.counter:
+        if metric.data.value:
+            kpis[kpi_key(metric)] = metric.data.value[-1]
+
+    for metric in metrics.gauge:
+        summary = metric.summary
+        if summary is not None and summary.time_weighted_mean is not None:
+            kpis[kpi_key(metric)] = summary.time_weighted_mean
+        elif metric.data.value:
+            kpis[kpi_key(metric)] = metric.data.value[-1]
+
+    for metric in metrics.sample:
+        summary = metric.summary
+        if summary is not None and summary.mean is not None:
+            kpis[kpi_key(metric)] = summary.mean
+        elif metric.data.value:
+            kpis[kpi_key(metric)] = sum(metric.data.value) / len(metric.data.value)
+
+    for metric in metrics.state:
+        summary = metric.summary
+        if summary is None:
+            continue
+        duration = summary.end_time - summary.start_time
+        if duration <= 0:
+            continue
+        for state, time in summary.time_in_state.items():
+            kpis[f"{kpi_key(metric)}[{state}]"] = time / duration
+
+    return kpis
+
+
+def t_quantile(p: float, df: int) -> float:
+    """
+    Quantile of Student's t distribution.
+
+    Exact for one and two degrees of freedom, otherwise the Cornish-Fisher
+    expansion around the normal quantile (Abramowitz and Stegun 26.7.5).
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    z3 = z**3
+    z5 = z**5
+    z7 = z**7
+    z9 = z**9
+    return (
+        z
+        + (z3 + z) / (4 * df)
+        + (5 * z5 + 16 * z3 + 3 * z) / (96 * df**2)
+        + (3 * z7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * df**3)
+        + (79 * z9 + 776 * z7 + 1482 * z5 - 1920 * z3 - 945 * z) / (92160 * df**4)
+    )
+
+
+def estimate(values: list[float], confidence: float = 0.95) -> KPIEstimate:
+    """Mean and confidence interval of a KPI from independent replications."""
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return KPIEstimate(n=n, mean=mean, std=0.0, lower=mean, upper=mean)
+    std = math.sqrt(sum((value - mean) ** 2 for value in values) / (n - 1))
+    half_width = t_quantile((1 + confidence) / 2, n - 1) * std / math.sqrt(n)
+    return KPIEstimate(
+        n=n, mean=mean, std=std, lower=mean - half_width, upper=mean + half_width
+    )
+
+
+def aggregate(
+    replications: list[ReplicationResult], confidence: float = 0.95
+) -> ReplicationSummary:
+    """
+    Aggregate the KPIs of replications into estimates.
+
+    KPIs missing from some replications (e.g. a metric that was never
+    recorded) are estimated from the replications that have them.
+    """
+    values: dict[str, list[float]] = {}
+    for replication in replications:
+        for key, value in replication.kpis.items():
+            values.setdefault(key, []).append(value)
+
+    return ReplicationSummary(
+        confidence=confidence,
+        replications=replications,
+        kpis={
+            key: estimate(kpi_values, confidence)
+            for key, kpi_values in values.items()
+        },
+    )
@@ -2,8 +2,12 @@
 Blueprint runner - executes simulations from blueprint definitions.
 """
 
-from typing import Any, Dict, Type
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Type
 
+from destiny_sim.builder.cache import RecordingCache
 from destiny_sim.builder.entities.material_flow.buffer import Buffer
 from destiny_sim.builder.entities.material_flow.control import Control
 from destiny_sim.builder.entities.material_flow.manufacturing_cell import (
@@ -12,14 +16,31 @@ from destiny_sim.builder.entities.material_flow.manufacturing_cell import (
 from destiny_sim.builder.entities.material_flow.sink import Sink
 from destiny_sim.builder.entities.material_flow.source import Source
 from destiny_sim.builder.entity import BuilderEntity
+from destiny_sim.builder.replications import (
+    ReplicationResult,
+    ReplicationSummary,
+    aggregate,
+    summarize_metrics,
+)
 from destiny_sim.builder.schema import (
     Blueprint,
     BlueprintEntity,
     BlueprintParameterType,
+    SimParams,
+    SteadyStateParams,
 )
+from destiny_sim.builder.steady_state import SteadyStateDetector
+from destiny_sim.core.budget import RunBudget
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import MetricHandle, MetricType
+from destiny_sim.core.profiling import EventLoopProfiler
 from destiny_sim.core.rendering import SimulationEntityType
-from destiny_sim.core.timeline import SimulationRecording
+from destiny_sim.core.timeline import RecordingChunk, SimulationRecording
+
+# Simulated time used when the blueprint does not set a duration
+DEFAULT_DURATION = 3600  # 1 hour
+# Metrics-only runs are cheap enough to default to much longer horizons
+DEFAULT_METRICS_ONLY_DURATION = 7 * 24 * 3600  # 1 week
 
 # Registry of available builder entities by their entity_type
 _ENTITY_REGISTRY: Dict[SimulationEntityType, Type[BuilderEntity]] = {
@@ -60,21 +81,189 @@ def get_registered_entities() -> Dict[SimulationEntityType, Type[BuilderEntity]]
 
 def run_blueprint(
     blueprint: Blueprint,
+    metrics_only: bool = False,
+    cache: RecordingCache | None = None,
+    budget: RunBudget | None = None,
+    profiler: EventLoopProfiler | None = None,
 ) -> SimulationRecording:
     """
     Run a simulation from a blueprint definition.
+
+    Metrics recorded before simParams.warmupTime are dropped. With
+    simParams.steadyState, the end of the warm-up is detected from the
+    throughput of the counters instead (unless warmupTime is set), and the
+    run stops as soon as the throughputs are estimated precisely enough,
+    at the latest after the duration.
     
     Args:
         blueprint: Blueprint object defining the simulation
+        metrics_only: Collect metrics only and skip motion and progress
+            recording. Without an explicit duration, metrics-only runs
+            simulate DEFAULT_METRICS_ONLY_DURATION instead of DEFAULT_DURATION.
+        cache: Optional result cache. Runs of seeded blueprints are looked up
+            by content hash and stored after running.
+        budget: Optional limits on wall time, processed events and recorded
+            segments. A run that reaches a limit stops there and returns
+            the recording so far, with truncation set (not cached).
+        profiler: Optional event-loop profiler; its report is returned as
+            recording.profile (not cached) and it is stopped after the run.
     
     Returns:
         SimulationRecording containing all motion segments and metrics
+        (no segments in metrics-only mode)
     
     Raises:
         KeyError: If entity_type is not registered
-        ValueError: If there's a cycle or missing dependencies
+        ValueError: If there's a cycle or missing dependencies, or the
+            warm-up does not end before the run
         TypeError: If entity instantiation fails
     """
+    # A profiled run is measured, so it is never answered from the cache
+    cache_key = None
+    if cache is not None and profiler is None:
+        cache_key = cache.key(blueprint, metrics_only)
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    env, run_until = _create_environment(blueprint, metrics_only, budget, profiler)
+    sim_params = blueprint.simParams
+    warmup_end = _warmup_end(env, sim_params, run_until)
+    try:
+        if warmup_end is not None:
+            env.run(until=warmup_end)
+            if env.truncation is None:
+                env.reset_metrics()
+        if sim_params.steadyState is None:
+            env.run(until=run_until)
+        else:
+            _run_until_steady(
+                env, run_until, sim_params.steadyState, warmed_up=warmup_end is not None
+            )
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+    recording = env.get_recording()
+    if cache_key is not None and recording.truncation is None:
+        cache.put(cache_key, recording)
+    return recording
+
+
+def iter_blueprint(
+    blueprint: Blueprint,
+    step: float,
+    metrics_only: bool = False,
+    budget: RunBudget | None = None,
+) -> Iterator[RecordingChunk]:
+    """
+    Run a simulation from a blueprint incrementally.
+
+    Advances the simulation in steps of simulation time and yields after each
+    step what was recorded since the previous one (see
+    RecordingEnvironment.run_chunks()). merge_chunks() of all chunks equals
+    the recording returned by run_blueprint(), except that metric points
+    from before simParams.warmupTime are kept (they were already yielded)
+    and simParams.steadyState is ignored.
+
+    Args:
+        blueprint: Blueprint object defining the simulation
+        step: Simulation time advanced per chunk
+        metrics_only: Collect metrics only (see run_blueprint)
+        budget: Optional run limits (see run_blueprint); the chunks end
+            where a limit was reached
+
+    Yields:
+        RecordingChunk per step
+
+    Raises:
+        Same as run_blueprint, and ValueError if step is not positive
+    """
+    env, run_until = _create_environment(blueprint, metrics_only, budget)
+    warmup_end = _warmup_end(env, blueprint.simParams, run_until)
+    if warmup_end is not None:
+        yield from env.run_chunks(until=warmup_end, step=step)
+        if env.truncation is None:
+            env.reset_metrics()
+    yield from env.run_chunks(until=run_until, step=step)
+
+
+def run_replications(
+    blueprint: Blueprint,
+    n: int | None = None,
+    seeds: Sequence[int] | None = None,
+    workers: int | None = None,
+    keep_recordings: bool = False,
+    confidence: float = 0.95,
+) -> ReplicationSummary:
+    """
+    Run independent replications of a blueprint on a process pool.
+
+    Each replication is reduced to scalar KPIs in its worker process (see
+    destiny_sim.builder.replications), so only the KPIs cross the process
+    boundary unless keep_recordings is set. Without recordings the
+    replications run in metrics-only mode.
+
+    Args:
+        blueprint: Blueprint object defining the simulation
+        n: Number of replications (defaults to the number of seeds, or 10)
+        seeds: Seed of each replication (defaults to 0..n-1)
+        workers: Number of worker processes (defaults to the CPU count);
+            with 1 the replications run in the calling process
+        keep_recordings: Return the full recording of each replication
+        confidence: Confidence level of the KPI intervals
+
+    Returns:
+        ReplicationSummary with per-replication KPIs and their estimates
+
+    Raises:
+        ValueError: If n and the number of seeds disagree
+    """
+    if seeds is None:
+        seeds = list(range(n if n is not None else 10))
+    elif n is not None and n != len(seeds):
+        raise ValueError(f"Got {len(seeds)} seeds for {n} replications")
+    seeds = list(seeds)
+
+    workers = min(workers or os.cpu_count() or 1, len(seeds)) or 1
+    if workers == 1:
+        results = [_run_replication(blueprint, seed, keep_recordings) for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _run_replication,
+                    [blueprint] * len(seeds),
+                    seeds,
+                    [keep_recordings] * len(seeds),
+                )
+            )
+
+    return aggregate(results, confidence)
+
+
+def _run_replication(
+    blueprint: Blueprint, seed: int, keep_recording: bool
+) -> ReplicationResult:
+    """Run one seeded replication and reduce it to KPIs (in a worker process)."""
+    sim_params = blueprint.simParams.model_copy(update={"seed": seed})
+    blueprint = blueprint.model_copy(update={"simParams": sim_params})
+    recording = run_blueprint(blueprint, metrics_only=not keep_recording)
+    return ReplicationResult(
+        seed=seed,
+        kpis=summarize_metrics(recording.metrics),
+        recording=recording if keep_recording else None,
+    )
+
+
+def _create_environment(
+    blueprint: Blueprint,
+    metrics_only: bool,
+    budget: RunBudget | None = None,
+    profiler: EventLoopProfiler | None = None,
+) -> tuple[RecordingEnvironment, float]:
+    """Create a blueprint's environment and entities; return it with the end time."""
     # Extract simulation parameters
     sim_params = blueprint.simParams
     # Handle None values explicitly - when schema validation includes None,
@@ -82,20 +271,76 @@ def run_blueprint(
     initial_time = sim_params.initialTime if sim_params.initialTime is not None else 0.0
     duration = sim_params.duration
     
-    # Create environment
-    env = RecordingEnvironment(initial_time=initial_time)
+    # Create environment. Builder entities update gauges and states in
+    # bursts at the same timestamp; compactMetrics keeps one point per change.
+    env = RecordingEnvironment(
+        initial_time=initial_time,
+        metrics_only=metrics_only,
+        compact_metrics=sim_params.compactMetrics,
+        seed=sim_params.seed,
+        budget=budget,
+        profiler=profiler,
+    )
     
     # Instantiate entities and start their processes
     _instantiate_entities(blueprint, env)
     
     if duration is None:
-        duration = 3600 # let's cap this at 1 hour for now
+        duration = DEFAULT_METRICS_ONLY_DURATION if metrics_only else DEFAULT_DURATION
+
+    return env, initial_time + duration
+
 
-    run_until = initial_time + duration
-    env.run(until=run_until)
+def _warmup_end(
+    env: RecordingEnvironment, sim_params: SimParams, run_until: float
+) -> float | None:
+    """End time of the warm-up period, or None without one."""
+    if not sim_params.warmupTime:
+        return None
+    warmup_end = env.now + sim_params.warmupTime
+    if warmup_end >= run_until:
+        raise ValueError(
+            f"warmupTime {sim_params.warmupTime} does not end before the run ends"
+        )
+    return warmup_end
+
+
+def _run_until_steady(
+    env: RecordingEnvironment,
+    run_until: float,
+    params: SteadyStateParams,
+    warmed_up: bool,
+) -> None:
+    """
+    Run in intervals until the counter throughputs are precise (or run_until).
 
-    # Return recording
-    return env.get_recording()
+    Metrics are restarted when the warm-up is detected, i.e. at the end of
+    the detection window rather than at the MSER-5 truncation point.
+    """
+    detector = SteadyStateDetector(params, warmed_up=warmed_up)
+    previous: dict[MetricHandle, float] = {}
+    while env.now < run_until:
+        start = env.now
+        env.run(until=min(start + params.interval, run_until))
+        if env.truncation is not None:
+            return
+        counters = [
+            handle
+            for handle in env.metric_handles()
+            if handle.metric_type == MetricType.COUNTER
+        ]
+        detector.observe(
+            {
+                handle: (handle.value - previous.get(handle, 0)) / (env.now - start)
+                for handle in counters
+            }
+        )
+        if not detector.warmed_up:
+            if detector.detect_warmup():
+                env.reset_metrics()
+        elif detector.is_precise():
+            return
+        previous = {handle: handle.value for handle in counters}
 
 
 def _instantiate_entities(
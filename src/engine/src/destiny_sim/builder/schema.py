@@ -73,11 +73,48 @@ class CanvasSize(BaseModel):
     height: int = Field(..., description="Canvas height in pixels")
 
 
+class SteadyStateParams(BaseModel):
+    """
+    Automatic warm-up detection and early stopping.
+
+    The throughput of every counter is observed per interval of simulation
+    time. The warm-up ends where MSER-5 truncates the observations, and the
+    run stops once each throughput's confidence interval is within
+    relativePrecision of its mean (see destiny_sim.builder.steady_state).
+    """
+
+    interval: float = Field(
+        60, gt=0, description="Simulation time per throughput observation"
+    )
+    relativePrecision: float = Field(
+        0.05,
+        gt=0,
+        description=(
+            "Target half-width of the throughput confidence intervals, "
+            "relative to the mean"
+        ),
+    )
+    confidence: float = Field(
+        0.95, gt=0, lt=1, description="Confidence level of the intervals"
+    )
+    batches: int = Field(
+        10, ge=2, description="Number of batch means per confidence interval"
+    )
+
+
 class SimParams(BaseModel):
     """Simulation-level parameters shared between frontend and engine."""
 
     initialTime: float = 0
     duration: float | None = None
+    # Root seed of the entities' random streams; None draws fresh entropy
+    seed: int | None = None
+    # Metrics recorded during the first warmupTime of the run are dropped
+    warmupTime: float | None = Field(None, ge=0)
+    # Detect the warm-up and stop once KPIs are precise; duration is the limit
+    steadyState: SteadyStateParams | None = None
+    # Keep one metric point per change (see RecordingEnvironment compact_metrics)
+    compactMetrics: bool = False
     canvasSize: CanvasSize | None = None
 
 
@@ -0,0 +1,140 @@
+"""
+Steady-state detection for blueprint runs.
+
+A run starts with an empty system, so its early KPIs are biased by the
+start-up transient. SteadyStateDetector observes the throughput of counters
+per interval of simulation time and decides:
+- when the warm-up is over: MSER-5 (White 1997) picks the truncation point
+  that minimizes the standard error of the remaining observations
+- when the run can stop: the throughput of every counter, estimated from
+  batch means of the observations after the warm-up, has a confidence
+  interval within the relative precision target
+
+Detection has a cost: the warm-up is only recognized at the end of the
+detection window (at least MSER_MIN_BATCHES * MSER_BATCH_SIZE intervals).
+Metrics cannot be restarted retroactively at the MSER-5 truncation point, so
+they restart when the warm-up is detected. The steady-state observations
+between the truncation point and detection are discarded with them, and
+precision is estimated from at least params.batches further intervals.
+"""
+
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+
+from destiny_sim.builder.replications import estimate
+from destiny_sim.builder.schema import SteadyStateParams
+
+# Observations averaged per MSER batch
+MSER_BATCH_SIZE = 5
+# Batches needed before MSER-5 is trusted to find the warm-up
+MSER_MIN_BATCHES = 5
+
+
+def mser5(observations: Sequence[float]) -> int | None:
+    """
+    Number of leading observations to truncate as warm-up (MSER-5).
+
+    Observations are averaged in batches of MSER_BATCH_SIZE (an incomplete
+    last batch is ignored). The truncation point d minimizes
+    sum((z_i - mean)^2 for the batches i >= d) / (k - d)^2 over the first
+    half of the k batches (further on, the statistic is dominated by the few
+    remaining batches). Returns None if there are fewer than four batches or
+    the minimum is at the end of the first half, i.e. the series is still
+    drifting and has not reached steady state yet.
+    """
+    k = len(observations) // MSER_BATCH_SIZE
+    if k < 4:
+        return None
+    batches = (
+        np.asarray(observations[: k * MSER_BATCH_SIZE], dtype=np.float64)
+        .reshape(k, MSER_BATCH_SIZE)
+        .mean(axis=1)
+    )
+    # Sums over the batches from d on, for d in the first half
+    half = k // 2
+    sums = np.cumsum(batches[::-1])[::-1][: half + 1]
+    squares = np.cumsum((batches**2)[::-1])[::-1][: half + 1]
+    remaining = np.arange(k, k - half - 1, -1, dtype=np.float64)
+    mser = (squares - sums**2 / remaining) / remaining**2
+    d = int(np.argmin(mser))
+    if d == half:
+        return None
+    return d * MSER_BATCH_SIZE
+
+
+class SteadyStateDetector:
+    """
+    Detects the end of warm-up and sufficient precision from throughputs.
+
+    Feed one throughput per counter and interval to observe(). Counters
+    seen for the first time count as 0 in earlier intervals.
+    """
+
+    def __init__(self, params: SteadyStateParams, warmed_up: bool = False):
+        """
+        Args:
+            params: Precision target and batching of the estimates
+            warmed_up: Skip warm-up detection (e.g. for a fixed warm-up time)
+        """
+        self.params = params
+        self.warmed_up = warmed_up
+        self._intervals = 0
+        self._observations: dict[Hashable, list[float]] = {}
+
+    def observe(self, throughputs: dict[Hashable, float]) -> None:
+        """Add the throughput of each counter in the latest interval."""
+        for key, throughput in throughputs.items():
+            observations = self._observations.get(key)
+            if observations is None:
+                observations = self._observations[key] = [0.0] * self._intervals
+            observations.append(throughput)
+        self._intervals += 1
+        for observations in self._observations.values():
+            if len(observations) < self._intervals:
+                observations.append(0.0)
+
+    def detect_warmup(self) -> bool:
+        """
+        Check whether every counter has passed its warm-up (MSER-5).
+
+        On detection all observations so far are discarded, including the
+        steady-state ones after the MSER-5 truncation point, since the
+        caller restarts its metrics at the current time (not at the
+        truncation point), and True is returned. Detection therefore costs
+        the full detection window on top of the actual warm-up.
+        """
+        if self.warmed_up or self._intervals < MSER_MIN_BATCHES * MSER_BATCH_SIZE:
+            return self.warmed_up
+        if not self._observations:
+            return False
+        if any(
+            mser5(observations) is None
+            for observations in self._observations.values()
+        ):
+            return False
+        self.warmed_up = True
+        self._intervals = 0
+        self._observations.clear()
+        return True
+
+    def is_precise(self) -> bool:
+        """Whether every counter's throughput meets the precision target."""
+        params = self.params
+        if (
+            not self.warmed_up
+            or self._intervals < params.batches
+            or not self._observations
+        ):
+            return False
+        size = self._intervals // params.batches
+        for observations in self._observations.values():
+            # Batch means of the latest batches * size observations
+            latest = observations[len(observations) - params.batches * size :]
+            values = np.asarray(latest)
+            means = values.reshape(params.batches, size).mean(axis=1).tolist()
+            kpi = estimate(means, params.confidence)
+            half_width = (kpi.upper - kpi.lower) / 2
+            if half_width > params.relativePrecision * abs(kpi.mean):
+                return False
+        return True
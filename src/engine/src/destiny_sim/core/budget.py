@@ -0,0 +1,42 @@
+"""
+Budgets that bound the cost of a simulation run.
+
+A RecordingEnvironment created with a RunBudget stops running once any limit
+is reached, instead of running to the requested end time. The recording made
+so far stays valid and is marked with a RunTruncation (see
+destiny_sim.core.timeline) giving the reason and the simulation time reached.
+"""
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class TruncationReason(StrEnum):
+    """Budget that ended a run early."""
+
+    WALL_TIME = "wall_time"
+    EVENTS = "events"
+    SEGMENTS = "segments"
+
+
+@dataclass(frozen=True)
+class RunBudget:
+    """
+    Limits of a simulation run; None means unlimited.
+
+    Attributes:
+        max_wall_seconds: Wall-clock seconds spent running (counted from the
+            first run() call)
+        max_events: SimPy events processed
+        max_segments: Motion and progress segments recorded
+    """
+
+    max_wall_seconds: float | None = None
+    max_events: int | None = None
+    max_segments: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_wall_seconds", "max_events", "max_segments"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
@@ -0,0 +1,357 @@
+"""
+Block-sampled random distributions for entity timing parameters.
+
+Drawing one variate at a time from numpy costs a Python-to-C round trip (and
+for derived parameters several scalar numpy calls) per draw. A Distribution
+precomputes its parameters once, draws variates in vectorized blocks from
+its Generator and hands them out one by one, refilling when the block is
+used up.
+
+- LogNormal: parameterized by the mean and standard deviation of the variate
+- Exponential: parameterized by its mean
+- Normal: normal with values outside [low, high] clamped to the bounds
+- TruncatedNormal: normal restricted to [low, high] (by rejection, or by
+  vectorized inverse-CDF sampling when the interval holds little probability)
+- Triangular: low, mode and high
+- Empirical: resampling of observed values, optionally weighted
+"""
+
+import math
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+
+# Number of variates drawn per refill
+DEFAULT_BLOCK_SIZE = 1024
+# Below this probability of [low, high], TruncatedNormal samples by inverse
+# CDF instead of rejection (which would draw 1 / mass normals per variate)
+TRUNCATED_NORMAL_REJECTION_MIN_MASS = 0.1
+
+
+class Distribution(ABC):
+    """Distribution that draws variates from a Generator in blocks."""
+
+    def __init__(
+        self, rng: np.random.Generator, block_size: int = DEFAULT_BLOCK_SIZE
+    ):
+        """
+        Args:
+            rng: Random stream to draw from (e.g. RecordingEnvironment.rng())
+            block_size: Number of variates drawn per refill
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        self.rng = rng
+        self.block_size = block_size
+        self._block: list = []
+        self._index = 0
+
+    def sample(self) -> Any:
+        """Return the next variate."""
+        index = self._index
+        if index == len(self._block):
+            self._block = self._draw(self.block_size).tolist()
+            index = 0
+        self._index = index + 1
+        return self._block[index]
+
+    @abstractmethod
+    def _draw(self, size: int) -> np.ndarray:
+        """Draw a block of size variates."""
+
+
+class LogNormal(Distribution):
+    """Lognormal distribution with the given mean and standard deviation."""
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        mean: float,
+        std_dev: float,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if mean <= 0 or std_dev < 0:
+            raise ValueError(
+                "LogNormal needs a positive mean and non-negative std_dev, "
+                f"got {mean}, {std_dev}"
+            )
+        super().__init__(rng, block_size)
+        self.mean = mean
+        self.std_dev = std_dev
+        # Parameters of the underlying normal distribution
+        self.mu = math.log(mean**2 / math.sqrt(std_dev**2 + mean**2))
+        self.sigma = math.sqrt(math.log(1 + std_dev**2 / mean**2))
+
+    def _draw(self, size: int) -> np.ndarray:
+        return self.rng.lognormal(self.mu, self.sigma, size)
+
+
+class Exponential(Distribution):
+    """Exponential distribution with the given mean."""
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        mean: float,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if mean <= 0:
+            raise ValueError(f"Exponential needs a positive mean, got {mean}")
+        super().__init__(rng, block_size)
+        self.mean = mean
+
+    def _draw(self, size: int) -> np.ndarray:
+        return self.rng.exponential(self.mean, size)
+
+
+class Normal(Distribution):
+    """Normal distribution with values outside [low, high] clamped to the bounds."""
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        mean: float,
+        std_dev: float,
+        low: float = -math.inf,
+        high: float = math.inf,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if std_dev < 0 or low > high:
+            raise ValueError(
+                "Normal needs std_dev >= 0 and low <= high, "
+                f"got {std_dev}, [{low}, {high}]"
+            )
+        super().__init__(rng, block_size)
+        self.mean = mean
+        self.std_dev = std_dev
+        self.low = low
+        self.high = high
+
+    def _draw(self, size: int) -> np.ndarray:
+        block = self.rng.normal(self.mean, self.std_dev, size)
+        return np.clip(block, self.low, self.high)
+
+
+class TruncatedNormal(Distribution):
+    """
+    Normal distribution restricted to [low, high].
+
+    Samples by rejection while [low, high] holds at least
+    TRUNCATED_NORMAL_REJECTION_MIN_MASS of the probability, otherwise by
+    inverse-CDF sampling, so draws from a far tail do not loop.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        mean: float,
+        std_dev: float,
+        low: float = -math.inf,
+        high: float = math.inf,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if std_dev < 0 or low > high:
+            raise ValueError(
+                "TruncatedNormal needs std_dev >= 0 and low <= high, "
+                f"got {std_dev}, [{low}, {high}]"
+            )
+        if std_dev == 0 and not low <= mean <= high:
+            raise ValueError(f"Mean {mean} is outside [{low}, {high}]")
+        super().__init__(rng, block_size)
+        self.mean = mean
+        self.std_dev = std_dev
+        self.low = low
+        self.high = high
+        self._inverse_cdf = False
+        if std_dev > 0:
+            # Sample an upper tail as the mirrored lower tail, where the CDF
+            # is not rounded to 1
+            self._mirrored = low > mean
+            if self._mirrored:
+                low, high = 2 * mean - high, 2 * mean - low
+            self._normal = NormalDist(mean, std_dev)
+            self._cdf_low = self._normal.cdf(low) if low > -math.inf else 0.0
+            self._cdf_high = self._normal.cdf(high) if high < math.inf else 1.0
+            mass = self._cdf_high - self._cdf_low
+            if mass <= 0:
+                raise ValueError(
+                    f"[{self.low}, {self.high}] has no probability under "
+                    f"Normal({mean}, {std_dev})"
+                )
+            self._inverse_cdf = mass < TRUNCATED_NORMAL_REJECTION_MIN_MASS
+
+    def _draw(self, size: int) -> np.ndarray:
+        if self._inverse_cdf:
+            return self._draw_inverse_cdf(size)
+        accepted = []
+        missing = size
+        while missing > 0:
+            block = self.rng.normal(self.mean, self.std_dev, size)
+            block = block[(block >= self.low) & (block <= self.high)][:missing]
+            accepted.append(block)
+            missing -= len(block)
+        return np.concatenate(accepted)
+
+    def _draw_inverse_cdf(self, size: int) -> np.ndarray:
+        probabilities = self.rng.uniform(self._cdf_low, self._cdf_high, size)
+        # The inverse CDF needs 0 < p < 1
+        probabilities = np.clip(
+            probabilities, sys.float_info.min, 1 - sys.float_info.epsilon
+        )
+        block = self.mean + self.std_dev * _standard_normal_inv_cdf(probabilities)
+        if self._mirrored:
+            block = 2 * self.mean - block
+        # Rounding in the far tail must not leave the interval
+        return np.clip(block, self.low, self.high)
+
+
+class Triangular(Distribution):
+    """Triangular distribution on [low, high] with the given mode."""
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        low: float,
+        mode: float,
+        high: float,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if not low <= mode <= high or low == high:
+            raise ValueError(
+                "Triangular needs low <= mode <= high and low < high, "
+                f"got {low}, {mode}, {high}"
+            )
+        super().__init__(rng, block_size)
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def _draw(self, size: int) -> np.ndarray:
+        return self.rng.triangular(self.low, self.mode, self.high, size)
+
+
+class Empirical(Distribution):
+    """
+    Resampling of observed values, optionally weighted.
+
+    Values can be of any type (e.g. locations to pick from); they are
+    returned as given.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        values: Sequence[Any],
+        weights: Sequence[float] | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if not values:
+            raise ValueError("Empirical needs at least one value")
+        if weights is not None and len(weights) != len(values):
+            raise ValueError(f"Got {len(weights)} weights for {len(values)} values")
+        super().__init__(rng, block_size)
+        self.values = list(values)
+        if weights is None:
+            self._probabilities = None
+        else:
+            total = float(sum(weights))
+            self._probabilities = np.asarray(weights, dtype=np.float64) / total
+
+    def sample(self) -> Any:
+        return self.values[super().sample()]
+
+    def _draw(self, size: int) -> np.ndarray:
+        if self._probabilities is None:
+            return self.rng.integers(len(self.values), size=size)
+        return self.rng.choice(len(self.values), size=size, p=self._probabilities)
+
+# Coefficients of Wichura's AS241 rational approximations (as used by
+# statistics.NormalDist.inv_cdf()), highest degree first
+_AS241_CENTRAL = (
+    (
+        2.5090809287301226727e3,
+        3.3430575583588128105e4,
+        6.7265770927008700853e4,
+        4.5921953931549871457e4,
+        1.3731693765509461125e4,
+        1.9715909503065514427e3,
+        1.3314166789178437745e2,
+        3.3871328727963666080e0,
+    ),
+    (
+        5.2264952788528545610e3,
+        2.8729085735721942674e4,
+        3.9307895800092710610e4,
+        2.1213794301586595867e4,
+        5.3941960214247511077e3,
+        6.8718700749205790830e2,
+        4.2313330701600911252e1,
+        1.0,
+    ),
+)
+_AS241_NEAR_TAIL = (
+    (
+        7.7454501427834140764e-4,
+        2.2723844989269184583e-2,
+        2.4178072517745061177e-1,
+        1.2704582524523683826e0,
+        3.6478483247632046050e0,
+        5.7694972214606914055e0,
+        4.6303378461565452959e0,
+        1.4234371107496835773e0,
+    ),
+    (
+        1.0507500716444168432e-9,
+        5.4759380849953449460e-4,
+        1.5198666563616457197e-2,
+        1.4810397642748007459e-1,
+        6.8976733498510000455e-1,
+        1.6763848301838038494e0,
+        2.0531916266377588219e0,
+        1.0,
+    ),
+)
+_AS241_FAR_TAIL = (
+    (
+        2.0103343992922881327e-7,
+        2.7115555687434875782e-5,
+        1.2426609473880784386e-3,
+        2.6532189526576123093e-2,
+        2.9656057182850489123e-1,
+        1.7848265399172913358e0,
+        5.4637849111641143699e0,
+        6.6579046435011037772e0,
+    ),
+    (
+        2.0442631033899397856e-15,
+        1.4215117583164458887e-7,
+        1.8463183175100546818e-5,
+        7.8686913114561329059e-4,
+        1.4875361290850614853e-2,
+        1.3692988092273580531e-1,
+        5.9983220655588793769e-1,
+        1.0,
+    ),
+)
+
+
+def _rational(coefficients: tuple, x: np.ndarray) -> np.ndarray:
+    numerator, denominator = coefficients
+    return np.polyval(numerator, x) / np.polyval(denominator, x)
+
+
+def _standard_normal_inv_cdf(p: np.ndarray) -> np.ndarray:
+    """Vectorized inverse CDF of the standard normal, for 0 < p < 1."""
+    q = p - 0.5
+    central = _rational(_AS241_CENTRAL, 0.180625 - q * q) * q
+    r = np.sqrt(-np.log(np.minimum(p, 1 - p)))
+    tail = np.where(
+        r <= 5.0,
+        _rational(_AS241_NEAR_TAIL, r - 1.6),
+        _rational(_AS241_FAR_TAIL, r - 5.0),
+    )
+    return np.where(np.abs(q) <= 0.425, central, np.copysign(tail, q))
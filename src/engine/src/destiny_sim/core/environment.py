@@ -4,22 +4,51 @@ Simulation environment with motion recording.
 
 import json
 import math
-from collections import defaultdict
+import time
 from enum import StrEnum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
-
-from simpy import Environment, Timeout
-
-from destiny_sim.core.metrics import MetricsContainer
+from typing import Any, Iterator
+
+import numpy as np
+from simpy import Environment, Event, Timeout
+from simpy.core import NORMAL
+
+from destiny_sim.core.budget import RunBudget, TruncationReason
+from destiny_sim.core.metrics import (
+    DEFAULT_SAMPLE_QUANTILES,
+    CounterHandle,
+    GaugeHandle,
+    MetricHandle,
+    MetricsContainer,
+    MetricsSchema,
+    SampleHandle,
+    StateHandle,
+)
+from destiny_sim.core.profiling import EventLoopProfile, EventLoopProfiler
+from destiny_sim.core.random_streams import RandomStreams
+from destiny_sim.core.recording_sink import RecordingSink
+from destiny_sim.core.rollup import RollupConfig
+from destiny_sim.core.segment_store import (
+    NO_HANDLE,
+    EntityTable,
+    MotionSegmentStore,
+    ProgressSegmentStore,
+)
+from destiny_sim.core.simulation_entity import SimulationEntity
 from destiny_sim.core.timeline import (
+    BINARY_RECORDING_SUFFIX,
     MotionSegment,
+    NormalizedSimulationRecording,
     ProgressSegment,
+    RecordingChunk,
+    RunTruncation,
     SimulationRecording,
+    encode_recording,
 )
 
-if TYPE_CHECKING:
-    from destiny_sim.core.simulation_entity import SimulationEntity
+DEFAULT_CHUNK_SIZE = 100_000
+# Events processed between wall-clock checks of a budgeted run
+_WALL_CLOCK_CHECK_INTERVAL = 256
 
 
 class RecordingEnvironment(Environment):
@@ -27,19 +56,281 @@ class RecordingEnvironment(Environment):
     Simulation environment that records motion segments.
 
     All motion recording goes through this class via record_motion().
+    Segments are kept in columnar stores and only materialized as pydantic
+    models by get_recording() or the per-entity query methods. Entity type
+    and name are taken from get_rendering_info() once, the first time an
+    entity is recorded.
+
+    With a sink, segments and metric points are handed to the sink in
+    chunks of at most chunk_size records while the simulation runs, so
+    memory stays bounded by the chunk size (entity descriptors are kept).
+
+    In metrics-only mode motion and progress recording are no-ops: the
+    record_* methods still return the same timeout events, so simulation
+    logic is unaffected, but no segments are stored. Metrics are collected
+    as usual.
+
+    With a budget, run() stops once a limit is reached and the recording
+    is marked with a RunTruncation; later run() calls return immediately.
+
+    With a profiler, events are stepped and scheduled through instrumented
+    variants that report to it, and its report is attached to recordings.
     """
 
-    def __init__(self, initial_time: float = 0):
+    def __init__(
+        self,
+        initial_time: float = 0,
+        sink: RecordingSink | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        metrics_only: bool = False,
+        coalesce_segments: bool = False,
+        metrics_rollup: RollupConfig | None = None,
+        compact_metrics: bool = False,
+        seed: int | None = None,
+        budget: RunBudget | None = None,
+        profiler: EventLoopProfiler | None = None,
+    ):
         """
         Initialize the environment.
 
         Args:
             initial_time: The starting simulation time.
+            sink: Optional sink receiving recording chunks during the run
+                (e.g. StreamingRecordingWriter).
+            chunk_size: Number of segments and metric points after which a
+                chunk is handed to the sink.
+            metrics_only: Skip motion and progress recording and collect
+                metrics only.
+            coalesce_segments: Merge contiguous collinear motion segments with
+                equal velocity and repeated stays while recording. Playback
+                of the recording is unchanged.
+            metrics_rollup: Aggregate counters and gauges into fixed
+                sim-time buckets instead of keeping every point, so that
+                metric memory is bounded on long runs.
+            compact_metrics: Collapse counter, gauge and state updates at the
+                same timestamp into the final value and skip updates that do
+                not change the value. Charts are unchanged.
+            seed: Root seed of the random streams handed out by rng(). Without
+                a seed fresh entropy is used (available as random_streams.seed).
+            budget: Limits on wall time, processed events and recorded
+                segments, shared by all run() calls.
+            profiler: Collects per-process event counts, wall time and heap
+                size while the simulation runs.
         """
         super().__init__(initial_time=initial_time)
-        self._motion_segments_by_entity: dict[str, list[MotionSegment]] = defaultdict(list)
-        self._progress_segments_by_entity: dict[str, list[ProgressSegment]] = defaultdict(list)
-        self._metrics_container = MetricsContainer()
+        self._entities = EntityTable()
+        self._motion_store = MotionSegmentStore(
+            self._entities, coalesce=coalesce_segments
+        )
+        self._progress_store = ProgressSegmentStore(self._entities)
+        self.random_streams = RandomStreams(seed)
+        self._metrics_container = MetricsContainer(
+            clock=self, rollup=metrics_rollup, compact=compact_metrics
+        )
+        self._sink = sink
+        self._chunk_size = chunk_size
+        self._chunk_start_time = self.now
+        self._drained_entities = 0
+        self._drained_segments = 0
+        self.budget = budget
+        self.truncation: RunTruncation | None = None
+        self._processed_events = 0
+        self._deadline: float | None = None
+        if sink is not None:
+            self._metrics_container.on_point = self._flush_if_full
+        self.metrics_only = metrics_only
+        if metrics_only:
+            # Swap the recording paths for their no-op variants once, so
+            # that the record_* calls cost no per-call mode check.
+            self._store_motion = self._motion_delay
+            self.record_stay_nowait = self._skip_recording
+            self.record_motion_nowait = self._skip_recording
+            self.record_disappearance = self._skip_recording
+            self.record_progress = self._skip_recording
+            self.record_progress_value = self._skip_recording
+        self.profiler = profiler
+        if profiler is not None:
+            # Swap in the instrumented event loop once; unprofiled runs keep
+            # SimPy's own step() and schedule()
+            self.step = self._profiled_step
+            self.schedule = self._profiled_schedule
+            profiler._attach(self)
+
+    def run(self, until: float | Event | None = None) -> Any:
+        """
+        Run the simulation, within the budget if the environment has one.
+
+        Without a budget this is SimPy's run(). With a budget the run stops
+        early, at the time of the last processed event, once a limit is
+        reached; truncation is then set. until is checked as in SimPy: a time
+        must be later than now, and an event's value is returned (or its
+        exception raised) once it has been processed.
+        """
+        if self.budget is None:
+            return super().run(until)
+        if isinstance(until, Event):
+            return self._run_until_event(until)
+        if until is not None and until <= self.now:
+            raise ValueError(
+                f"until (={until}) must be > the current simulation time"
+            )
+        if self.truncation is not None:
+            return None
+
+        until = math.inf if until is None else until
+        while self.peek() < until:
+            if not self.step_within_budget(until):
+                return None
+        if until < math.inf and self.now < until:
+            # Advance the clock to until, as SimPy's run() does
+            super().run(until)
+        return None
+
+    def _run_until_event(self, until: Event) -> Any:
+        """Budgeted run() until an event has been processed."""
+        # Callbacks are None once the event has been processed
+        while until.callbacks is not None:
+            if self.peek() == math.inf:
+                raise RuntimeError(
+                    "No scheduled events left but \"until\" event was not "
+                    f"triggered: {until}"
+                )
+            if not self.step_within_budget():
+                return None
+        if not until.ok:
+            raise until.value
+        return until.value
+
+    def step_within_budget(self, until: float = math.inf) -> bool:
+        """
+        Process the next event unless the budget is exhausted.
+
+        Drivers that step the environment themselves (e.g. LiveRunner) use
+        this instead of step() so that the budget applies to them as well.
+        When a limit is reached, truncation is set (with until as the
+        intended end time) and False is returned without processing the event.
+        """
+        budget = self.budget
+        if budget is None:
+            self.step()
+            return True
+        if self.truncation is not None:
+            return False
+        if budget.max_wall_seconds is not None and self._deadline is None:
+            self._deadline = time.monotonic() + budget.max_wall_seconds
+        reason = self._exhausted_budget()
+        if reason is not None:
+            self.truncation = RunTruncation(
+                reason=reason, sim_time=self.now, until=until
+            )
+            return False
+        self.step()
+        self._processed_events += 1
+        return True
+
+    def _exhausted_budget(self) -> TruncationReason | None:
+        """Return the limit of the budget that was reached, if any."""
+        budget = self.budget
+        max_events, max_segments = budget.max_events, budget.max_segments
+        if max_events is not None and self._processed_events >= max_events:
+            return TruncationReason.EVENTS
+        if max_segments is not None and self.segment_count >= max_segments:
+            return TruncationReason.SEGMENTS
+        if (
+            self._deadline is not None
+            and self._processed_events % _WALL_CLOCK_CHECK_INTERVAL == 0
+            and time.monotonic() >= self._deadline
+        ):
+            return TruncationReason.WALL_TIME
+        return None
+
+    def _profiled_step(self) -> None:
+        """step() with the event and its wall time reported to the profiler."""
+        if not self._queue:
+            return super().step()
+        profiler = self.profiler
+        if profiler._started_at is None:
+            profiler._start()
+        profiles = profiler._resumed_processes(self._queue[0][3])
+        started = profiler.clock()
+        try:
+            super().step()
+        finally:
+            profiler._processed(profiles, started, profiler.clock(), self._now)
+
+    def _profiled_schedule(
+        self, event: Event, priority: int = NORMAL, delay: float = 0
+    ) -> None:
+        """schedule() with the event reported to the profiler."""
+        self.profiler._scheduled(self._active_proc)
+        super().schedule(event, priority, delay)
+
+    @property
+    def sink(self) -> RecordingSink | None:
+        """Sink receiving the recording chunks, if any."""
+        return self._sink
+
+    @property
+    def segment_count(self) -> int:
+        """Number of motion and progress segments recorded so far."""
+        recorded = len(self._motion_store) + len(self._progress_store)
+        return self._drained_segments + recorded
+
+    def rng(self, key: str) -> np.random.Generator:
+        """
+        Return the random stream of a consumer of randomness.
+
+        Each key (e.g. an entity name) gets its own independent Generator,
+        derived from the environment's seed and the key only, so runs with
+        the same seed are reproducible.
+        """
+        return self.random_streams.get(key)
+
+    def counter_metric(
+        self, name: str, labels: dict[str, str] | None = None
+    ) -> CounterHandle:
+        """
+        Return a handle to a counter metric for recording without lookups.
+
+        Register the handle once (e.g. when the entity is created) and call
+        handle.incr() instead of incr_counter() on hot paths.
+        """
+        return self._metrics_container.counter(name, labels)
+
+    def gauge_metric(
+        self, name: str, labels: dict[str, str] | None = None
+    ) -> GaugeHandle:
+        """Return a handle to a gauge metric (handle.set() / handle.adjust())."""
+        return self._metrics_container.gauge(name, labels)
+
+    def sample_metric(
+        self,
+        name: str,
+        labels: dict[str, str] | None = None,
+        summary: bool = False,
+        keep_points: bool = True,
+        quantiles: tuple[float, ...] = DEFAULT_SAMPLE_QUANTILES,
+    ) -> SampleHandle:
+        """
+        Return a handle to a sample metric (handle.record()).
+
+        With summary=True the metric carries streaming statistics (count,
+        mean, variance, min, max, approximate quantiles); with
+        keep_points=False as well, raw observations are not retained.
+        The options only apply when the metric is first registered.
+        """
+        return self._metrics_container.sample(
+            name, labels, summary=summary, keep_points=keep_points, quantiles=quantiles
+        )
+
+    def state_metric(
+        self,
+        name: str,
+        enum_class: type[StrEnum],
+        labels: dict[str, str] | None = None,
+    ) -> StateHandle:
+        """Return a handle to a state metric of enum_class's states (handle.set())."""
+        return self._metrics_container.state(name, enum_class, labels)
 
     def incr_counter(self, name: str, amount: int | float = 1, labels: dict[str, str] | None = None) -> None:
         """
@@ -100,12 +391,53 @@ class RecordingEnvironment(Environment):
         """
         self._metrics_container.set_state(name, self.now, state, labels)
 
+    def metric_handles(
+        self, name: str | None = None, labels: dict[str, str] | None = None
+    ) -> list[MetricHandle]:
+        """
+        Return the handles of the registered metrics with the given name and labels.
+
+        Unlike query_metrics(), no Metric models are built, so this is cheap
+        enough to read current values (handle.value) while the run proceeds.
+        """
+        return self._metrics_container.handles(name, labels)
+
+    def reset_metrics(self) -> None:
+        """
+        Restart all metrics at the current time, e.g. at the end of a warm-up.
+
+        Points and summary statistics recorded so far are dropped: counters
+        count again from 0, gauges and states keep their current value as the
+        first point, and summaries only cover the time from now on. With a
+        sink or run_chunks(), points already handed out are not affected.
+        """
+        self._metrics_container.restart(self.now)
+
+    def query_metrics(
+        self, name: str | None = None, labels: dict[str, str] | None = None
+    ) -> MetricsSchema:
+        """
+        Return the recorded metrics with the given name and labels.
+
+        Args:
+            name: Metric name to match exactly, or None for any name
+            labels: Label pairs the metric must all have, e.g.
+                {"entity": "Buffer 1"} or {"entity_type": "buffer"}
+
+        With a sink, the metrics are read back from the sink and filtered.
+        """
+        if self._sink is not None:
+            return self.get_normalized_recording().metrics.filter(name, labels)
+        return self._metrics_container.query(name, labels)
+
     def record_disappearance(self, entity: Any, time: float | None = None) -> None:
         """
         Record that an entity has disappeared.
+
+        Does not schedule any event.
         """
         time = time if time is not None else self.now
-        self.record_motion(entity=entity, start_time=time, end_time=time)
+        self._store_motion(entity, start_time=time, end_time=time)
 
     def record_stay(
         self,
@@ -116,13 +448,14 @@ class RecordingEnvironment(Environment):
         x: float = 0.0,
         y: float = 0.0,
         angle: float = 0.0,
-        parent: "SimulationEntity | None" = None,
+        parent: SimulationEntity | None = None,
     ) -> Timeout:
         """
         Record a stay in location for an entity.
 
         Returns a timeout event that fires when the stay ends.
         For infinite stays (end_time=None and duration=None), returns timeout(0).
+        Use record_stay_nowait() when the returned event is not yielded.
 
         Args:
             entity: The entity that is staying
@@ -137,7 +470,40 @@ class RecordingEnvironment(Environment):
         Returns:
             Timeout event that fires when the stay ends, or timeout(0) for infinite stays
         """
-        return self.record_motion(
+        return self.timeout(
+            self._store_motion(
+                entity,
+                start_time=start_time,
+                end_time=end_time,
+                duration=duration,
+                start_x=x,
+                start_y=y,
+                end_x=x,
+                end_y=y,
+                start_angle=angle,
+                end_angle=angle,
+                parent=parent,
+            )
+        )
+
+    def record_stay_nowait(
+        self,
+        entity: Any,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        duration: float | None = None,
+        x: float = 0.0,
+        y: float = 0.0,
+        angle: float = 0.0,
+        parent: SimulationEntity | None = None,
+    ) -> None:
+        """
+        Record a stay in location for an entity without scheduling an event.
+
+        Same arguments as record_stay(). Use this when the caller does not
+        wait for the stay to end, so that recording costs no SimPy event.
+        """
+        self._store_motion(
             entity,
             start_time=start_time,
             end_time=end_time,
@@ -164,13 +530,14 @@ class RecordingEnvironment(Environment):
         end_y: float = 0.0,
         start_angle: float = 0.0,
         end_angle: float = 0.0,
-        parent: "SimulationEntity | None" = None,
+        parent: SimulationEntity | None = None,
     ) -> Timeout:
         """
         Record a motion segment for an entity.
 
         Returns a timeout event that fires when the motion ends.
         For infinite motion (end_time=None and duration=None), returns timeout(0).
+        Use record_motion_nowait() when the returned event is not yielded.
 
         Args:
             entity: The entity that is moving
@@ -186,50 +553,145 @@ class RecordingEnvironment(Environment):
         Returns:
             Timeout event that fires when the motion ends, or timeout(0) for infinite motion
         """
-        from destiny_sim.core.simulation_entity import SimulationEntity
-
-        if not isinstance(entity, SimulationEntity):
-            return self.timeout(0)
+        return self.timeout(
+            self._store_motion(
+                entity,
+                start_time=start_time,
+                end_time=end_time,
+                duration=duration,
+                speed=speed,
+                start_x=start_x,
+                start_y=start_y,
+                end_x=end_x,
+                end_y=end_y,
+                start_angle=start_angle,
+                end_angle=end_angle,
+                parent=parent,
+            )
+        )
 
-        start_time = start_time if start_time is not None else self.now
+    def record_motion_nowait(
+        self,
+        entity: Any,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        duration: float | None = None,
+        speed: float | None = None,
+        start_x: float = 0.0,
+        start_y: float = 0.0,
+        end_x: float = 0.0,
+        end_y: float = 0.0,
+        start_angle: float = 0.0,
+        end_angle: float = 0.0,
+        parent: SimulationEntity | None = None,
+    ) -> None:
+        """
+        Record a motion segment for an entity without scheduling an event.
 
-        # Calculate end_time from duration or speed if provided
-        if end_time is None:
-            if duration is not None:
-                end_time = start_time + duration
-            elif speed is not None and speed > 0:
-                # Calculate distance from start to end position
-                distance = math.hypot(end_x - start_x, end_y - start_y)
-                duration = distance / speed
-                end_time = start_time + duration
-            # else: end_time remains None (infinite motion)
-
-        rendering_info = entity.get_rendering_info()
-        segment = MotionSegment(
-            entity_id=entity.id,
-            entity_type=rendering_info.entity_type,  # Already SimulationEntityType enum
-            name=rendering_info.name,
-            parent_id=parent.id if parent else None,
+        Same arguments as record_motion(). Use this when the caller does not
+        wait for the motion to end, so that recording costs no SimPy event.
+        """
+        self._store_motion(
+            entity,
             start_time=start_time,
             end_time=end_time,
+            duration=duration,
+            speed=speed,
             start_x=start_x,
             start_y=start_y,
             end_x=end_x,
             end_y=end_y,
             start_angle=start_angle,
             end_angle=end_angle,
+            parent=parent,
         )
-        self._motion_segments_by_entity[entity.id].append(segment)
 
-        # Return timeout event for finite motion, timeout(0) for infinite or zero duration
+    def _store_motion(
+        self,
+        entity: Any,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        duration: float | None = None,
+        speed: float | None = None,
+        start_x: float = 0.0,
+        start_y: float = 0.0,
+        end_x: float = 0.0,
+        end_y: float = 0.0,
+        start_angle: float = 0.0,
+        end_angle: float = 0.0,
+        parent: SimulationEntity | None = None,
+    ) -> float:
+        """
+        Store a motion segment without scheduling anything.
+
+        Returns the delay until the motion ends: 0 for infinite or zero
+        duration motion and for entities that are not SimulationEntity.
+        """
+        if not isinstance(entity, SimulationEntity):
+            return 0
+
+        start_time = start_time if start_time is not None else self.now
+        end_time = _motion_end_time(
+            start_time, end_time, duration, speed, start_x, start_y, end_x, end_y
+        )
+
+        entities = self._entities
+        self._motion_store.append(
+            entities.register(entity),
+            entities.register(parent) if parent else NO_HANDLE,
+            start_time,
+            end_time,
+            start_x,
+            start_y,
+            end_x,
+            end_y,
+            start_angle,
+            end_angle,
+        )
+        if self._sink is not None:
+            self._flush_if_full()
+
+        # Wait for finite motion, 0 for infinite or zero duration
         if end_time is None:
-            return self.timeout(0)
-        
-        calculated_duration = end_time - start_time
-        if calculated_duration <= 0:
-            return self.timeout(0)
-        
-        return self.timeout(calculated_duration)
+            return 0
+
+        return max(end_time - start_time, 0)
+
+    def _motion_delay(
+        self,
+        entity: Any,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        duration: float | None = None,
+        speed: float | None = None,
+        start_x: float = 0.0,
+        start_y: float = 0.0,
+        end_x: float = 0.0,
+        end_y: float = 0.0,
+        start_angle: float = 0.0,
+        end_angle: float = 0.0,
+        parent: SimulationEntity | None = None,
+    ) -> float:
+        """
+        Metrics-only replacement of _store_motion().
+
+        Returns the same delay as _store_motion() without storing anything.
+        """
+        if not isinstance(entity, SimulationEntity):
+            return 0
+
+        start_time = start_time if start_time is not None else self.now
+        end_time = _motion_end_time(
+            start_time, end_time, duration, speed, start_x, start_y, end_x, end_y
+        )
+        if end_time is None:
+            return 0
+
+        return max(end_time - start_time, 0)
+
+    def _skip_recording(self, *args: Any, **kwargs: Any) -> None:
+        """Metrics-only replacement of the recording calls that return nothing."""
+        pass
 
     def record_progress(
         self,
@@ -241,10 +703,12 @@ class RecordingEnvironment(Environment):
         end_value: float = 1.0,
         min_value: float = 0.0,
         max_value: float = 1.0,
-    ):
+    ) -> None:
         """
         Record a progress segment for an entity.
 
+        Progress recording never schedules an event.
+
         Args:
             entity: The entity whose progress is being tracked
             start_time: When the progress change begins (defaults to env.now)
@@ -255,10 +719,8 @@ class RecordingEnvironment(Environment):
             min_value: Minimum bound for the value
             max_value: Maximum bound for the value
         """
-        from destiny_sim.core.simulation_entity import SimulationEntity
-
         if not isinstance(entity, SimulationEntity):
-            return self.timeout(0)
+            return
 
         start_time = start_time if start_time is not None else self.now
 
@@ -266,17 +728,17 @@ class RecordingEnvironment(Environment):
         if end_time is None and duration is not None:
             end_time = start_time + duration
 
-        segment = ProgressSegment(
-            entity_id=entity.id,
-            start_time=start_time,
-            end_time=end_time,
-            start_value=start_value,
-            end_value=end_value,
-            min_value=min_value,
-            max_value=max_value,
+        self._progress_store.append(
+            self._entities.register(entity),
+            start_time,
+            end_time,
+            start_value,
+            end_value,
+            min_value,
+            max_value,
         )
-        self._progress_segments_by_entity[entity.id].append(segment)
-
+        if self._sink is not None:
+            self._flush_if_full()
 
     def record_progress_value(
         self,
@@ -287,7 +749,7 @@ class RecordingEnvironment(Environment):
         value: float = 0.0,
         min_value: float = 0.0,
         max_value: float = 1.0,
-    ):
+    ) -> None:
         """
         Record a constant progress value for an entity.
 
@@ -313,35 +775,213 @@ class RecordingEnvironment(Environment):
             max_value=max_value,
         )
 
+    def run_chunks(self, until: float, step: float) -> Iterator[RecordingChunk]:
+        """
+        Run the simulation in steps of simulation time, yielding as it goes.
+
+        After each step the segments, metric points and entity descriptors
+        recorded since the previous step are yielded as a RecordingChunk and
+        released, so clients can start playback early and memory stays
+        bounded by what is recorded per step. merge_chunks() of all yielded
+        chunks gives the complete recording.
+
+        Args:
+            until: Simulation time to run until
+            step: Simulation time advanced per chunk
+
+        Raises:
+            ValueError: If step is not positive or the environment has a sink
+                (which consumes the same data)
+        """
+        if step <= 0:
+            raise ValueError(f"step must be positive, got {step}")
+        if self._sink is not None:
+            raise ValueError("run_chunks() cannot be used with a sink")
+
+        start = self.now
+        steps = 0
+        while self.now < until and self.truncation is None:
+            steps += 1
+            self.run(until=min(start + steps * step, until))
+            yield self._drain_chunk()
+
+    def flush(self) -> None:
+        """
+        Hand everything recorded since the previous flush to the sink.
+
+        Does nothing if the environment has no sink.
+        """
+        if self._sink is None:
+            return
+        if self.has_pending():
+            self._sink.write_chunk(self._drain_chunk())
+
+    def has_pending(self) -> bool:
+        """Whether anything was recorded since the previous chunk."""
+        return bool(
+            len(self._motion_store)
+            or len(self._progress_store)
+            or self._metrics_container.pending_points
+            or self._drained_entities < len(self._entities)
+        )
+
+    def _flush_if_full(self) -> None:
+        pending = (
+            len(self._motion_store)
+            + len(self._progress_store)
+            + self._metrics_container.pending_points
+        )
+        if pending >= self._chunk_size:
+            self.flush()
+
+    def drain_chunk(self) -> RecordingChunk:
+        """
+        Return everything recorded since the previous chunk and release it.
+
+        For drivers that hand out the recording while the simulation runs
+        (e.g. LiveRunner); run_chunks() drains the same way.
+
+        Raises:
+            ValueError: If the environment has a sink, which receives the
+                chunks itself
+        """
+        if self._sink is not None:
+            raise ValueError("drain_chunk() cannot be used with a sink")
+        return self._drain_chunk()
+
+    def _drain_chunk(self) -> RecordingChunk:
+        """Return everything recorded since the previous chunk and release it."""
+        chunk = RecordingChunk(
+            start_time=self._chunk_start_time,
+            end_time=self.now,
+            entities=self._entities.descriptors(start=self._drained_entities),
+            motion_segments=self._motion_store.to_table(),
+            progress_segments=self._progress_store.to_table(),
+            metrics=self._metrics_container.drain(),
+        )
+        self._drained_segments += len(self._motion_store) + len(self._progress_store)
+        self._motion_store.clear()
+        self._progress_store.clear()
+        self._drained_entities = len(self._entities)
+        self._chunk_start_time = self.now
+        return chunk
+
+    def get_motion_segments(self, entity: SimulationEntity) -> list[MotionSegment]:
+        """
+        Get the motion segments recorded so far for a single entity.
+
+        Only the segments of the given entity are materialized. With a sink,
+        only segments that were not flushed yet are returned.
+        """
+        return self._motion_store.segments_for(entity.id)
+
+    def get_progress_segments(
+        self, entity: SimulationEntity
+    ) -> list[ProgressSegment]:
+        """
+        Get the progress segments recorded so far for a single entity.
+
+        Only the segments of the given entity are materialized. With a sink,
+        only segments that were not flushed yet are returned.
+        """
+        return self._progress_store.segments_for(entity.id)
+
     def get_recording(self) -> SimulationRecording:
         """
         Get the complete recording of all motion segments.
+
+        With a sink, pending data is flushed first and the recording is read
+        back from the sink.
         """
+        if self._sink is not None:
+            return self.get_normalized_recording().to_recording()
+
         return SimulationRecording(
             duration=self.now,
-            motion_segments_by_entity=self._motion_segments_by_entity,
-            progress_segments_by_entity=self._progress_segments_by_entity,
+            motion_segments_by_entity=self._motion_store.segments_by_entity(),
+            progress_segments_by_entity=self._progress_store.segments_by_entity(),
+            metrics=self._metrics_container.get_all(),
+            truncation=self.truncation,
+            profile=self._profile(),
+        )
+
+    def get_normalized_recording(self) -> NormalizedSimulationRecording:
+        """
+        Get the complete recording in normalized form.
+
+        Built directly from the columnar stores: entities are described once
+        in the entity table and no per-segment models are created. With a
+        sink, pending data is flushed first and the recording is read back
+        from the sink.
+        """
+        if self._sink is not None:
+            self.flush()
+            recording = self._sink.read_recording()
+            recording.duration = self.now
+            recording.truncation = self.truncation
+            recording.profile = self._profile()
+            return recording
+
+        return NormalizedSimulationRecording(
+            duration=self.now,
+            entities=self._entities.descriptors(),
+            motion_segments=self._motion_store.to_table(),
+            progress_segments=self._progress_store.to_table(),
             metrics=self._metrics_container.get_all(),
+            truncation=self.truncation,
+            profile=self._profile(),
         )
 
-    def save_recording(self, file_path: str) -> None:
+    def _profile(self) -> EventLoopProfile | None:
+        return self.profiler.report() if self.profiler is not None else None
+
+    def save_recording(self, file_path: str, binary: bool | None = None) -> None:
         """
-        Save the recording to a JSON file.
+        Save the recording to a JSON or binary file.
 
         Creates directories if needed and prints a confirmation message.
 
         Args:
-            file_path: Path to the output JSON file
+            file_path: Path to the output file
                 (e.g., "simulation_records/recording.json")
+            binary: Write the compact binary format instead of JSON. When None,
+                the binary format is used for paths ending with
+                BINARY_RECORDING_SUFFIX.
         """
-        recording = self.get_recording()
+        path = Path(file_path)
+        if binary is None:
+            binary = path.suffix == BINARY_RECORDING_SUFFIX
 
         # Create parent directories if they don't exist
-        path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write JSON file
-        with open(file_path, "w") as f:
-            json.dump(recording.model_dump(by_alias=True), f, indent=2)
+        if binary:
+            path.write_bytes(encode_recording(self.get_normalized_recording()))
+        else:
+            with open(file_path, "w") as f:
+                json.dump(self.get_recording().model_dump(by_alias=True), f, indent=2)
 
         print(f"Recording exported to {file_path}")
+
+
+def _motion_end_time(
+    start_time: float,
+    end_time: float | None,
+    duration: float | None,
+    speed: float | None,
+    start_x: float,
+    start_y: float,
+    end_x: float,
+    end_y: float,
+) -> float | None:
+    """Resolve the end time of a motion from end_time, duration or speed."""
+    if end_time is not None:
+        return end_time
+    if duration is not None:
+        return start_time + duration
+    if speed is not None and speed > 0:
+        # Calculate distance from start to end position
+        distance = math.hypot(end_x - start_x, end_y - start_y)
+        return start_time + distance / speed
+    # Infinite motion
+    return None
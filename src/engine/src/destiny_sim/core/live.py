@@ -0,0 +1,307 @@
+"""
+Live simulation: run a RecordingEnvironment paced against the wall clock.
+
+LiveRunner steps the environment event by event and, like SimPy's
+RealtimeEnvironment, waits before each event until the wall clock has caught
+up with its simulation time. Whenever simulation time advances, what was
+recorded at the previous time is drained from the environment as a
+RecordingChunk and published to every subscriber.
+
+- speed: simulation time units per wall-clock second (2.0 runs twice as fast
+  as real time); it can be changed, and the run paused and resumed, from
+  other threads while run() is executing
+- backpressure: every subscription holds at most max_pending chunks; while a
+  subscriber lags behind, the runner waits for it instead of buffering
+- idle skipping: when no recorded motion or progress is animating, nothing
+  changes on screen until the next event, so the runner jumps to it at once
+
+Waiting is done on a condition variable (never by polling), so a paused or
+idle-waiting runner uses no CPU.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterator
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.timeline import RecordingChunk
+
+DEFAULT_MAX_PENDING = 16
+
+
+class LiveSubscription:
+    """
+    Bounded queue of the chunks published by a LiveRunner.
+
+    Iterate over the subscription (from another thread than the runner) to
+    receive chunks until the run ends. Subscribers only receive chunks
+    published after subscribing; entities are described in the chunk they
+    first appear in, so subscribe before starting the run.
+    """
+
+    def __init__(self, runner: "LiveRunner", max_pending: int):
+        self._runner = runner
+        self.max_pending = max_pending
+        self._chunks: deque[RecordingChunk] = deque()
+        self.closed = False
+
+    def get(self, timeout: float | None = None) -> RecordingChunk | None:
+        """
+        Return the next chunk, waiting up to timeout seconds for it.
+
+        Returns None on timeout, and once the run has ended (or the
+        subscription was closed) and all chunks were received.
+        """
+        condition = self._runner._condition
+        with condition:
+            if not condition.wait_for(
+                lambda: self._chunks or self.closed or self._runner.finished,
+                timeout,
+            ):
+                return None
+            if not self._chunks:
+                return None
+            chunk = self._chunks.popleft()
+            # Wake the runner if it waits for room
+            condition.notify_all()
+            return chunk
+
+    def __iter__(self) -> Iterator[RecordingChunk]:
+        while (chunk := self.get()) is not None:
+            yield chunk
+
+    def close(self) -> None:
+        """Unsubscribe; pending chunks are discarded."""
+        with self._runner._condition:
+            self.closed = True
+            self._chunks.clear()
+            self._runner._subscriptions.remove(self)
+            self._runner._condition.notify_all()
+
+    def _full(self) -> bool:
+        return len(self._chunks) >= self.max_pending
+
+
+class LiveRunner:
+    """
+    Runs a RecordingEnvironment in real time and publishes its recording.
+
+    run() blocks the calling thread until the run ends; call pause(),
+    resume(), set_speed() and stop() from other threads.
+    """
+
+    def __init__(
+        self,
+        env: RecordingEnvironment,
+        speed: float = 1.0,
+        skip_idle: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            env: Environment to run (processes already started). It must not
+                have a sink, which would consume the same data.
+            speed: Simulation time units per wall-clock second
+            skip_idle: Jump over periods in which no motion or progress is
+                animating instead of waiting them out
+            clock: Wall clock in seconds (monotonic)
+
+        Raises:
+            ValueError: If speed is not positive or the environment has a sink
+        """
+        if env.sink is not None:
+            raise ValueError("LiveRunner cannot be used with a sink")
+        _check_speed(speed)
+        self.env = env
+        self.skip_idle = skip_idle
+        self._speed = speed
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._subscriptions: list[LiveSubscription] = []
+        self._paused = False
+        self._stopped = False
+        self.finished = False
+        # Simulation time until which recorded motion or progress animates
+        self._animated_until = env.now
+        # Simulation time sim_anchor is shown at wall time wall_anchor
+        self._sim_anchor = env.now
+        # Simulation time of the event the runner waits for
+        self._target = env.now
+        self._wall_anchor = clock()
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def subscribe(self, max_pending: int = DEFAULT_MAX_PENDING) -> LiveSubscription:
+        """
+        Subscribe to the published chunks.
+
+        Args:
+            max_pending: Number of chunks the subscription holds before the
+                runner waits for the subscriber
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be positive, got {max_pending}")
+        subscription = LiveSubscription(self, max_pending)
+        with self._condition:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def pause(self) -> None:
+        """Hold the simulation at the current wall-clock position."""
+        with self._condition:
+            if not self._paused:
+                self._reanchor()
+                self._paused = True
+                self._condition.notify_all()
+
+    def resume(self) -> None:
+        """Continue a paused simulation from where it was held."""
+        with self._condition:
+            if self._paused:
+                self._paused = False
+                self._wall_anchor = self._clock()
+                self._condition.notify_all()
+
+    def set_speed(self, speed: float) -> None:
+        """Change the simulation time units per wall-clock second."""
+        _check_speed(speed)
+        with self._condition:
+            self._reanchor()
+            self._speed = speed
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        """End the run early, at the current simulation time."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def run(self, until: float) -> None:
+        """
+        Run the simulation until the given time, paced against the wall clock.
+
+        Returns when until is reached, stop() was called or a limit of the
+        environment's budget was reached (env.truncation is then set);
+        subscriptions then end once their pending chunks are received.
+        """
+        env = self.env
+        with self._condition:
+            self._sim_anchor = self._target = env.now
+            self._wall_anchor = self._clock()
+        try:
+            while True:
+                next_time = min(env.peek(), until)
+                if next_time > env.now:
+                    # Everything at the current time has been processed
+                    self._publish()
+                    if not self._wait_until(next_time):
+                        return
+                if next_time >= until:
+                    break
+                if not env.step_within_budget(until):
+                    # A budget limit was reached (see env.truncation)
+                    break
+            if env.now < until:
+                env.run(until=until)
+            # The last chunk ends at until (unless a budget stopped the run
+            # earlier), even if nothing was recorded
+            self._publish(force=True)
+        finally:
+            with self._condition:
+                self.finished = True
+                self._condition.notify_all()
+
+    def _position(self) -> float:
+        """Simulation time shown at the current wall-clock time."""
+        if self._paused:
+            return self._sim_anchor
+        elapsed = self._clock() - self._wall_anchor
+        return min(self._sim_anchor + elapsed * self._speed, self._target)
+
+    def _reanchor(self) -> None:
+        """Keep the current position while the pacing parameters change."""
+        self._sim_anchor = self._position()
+        self._wall_anchor = self._clock()
+
+    def _wait_until(self, sim_time: float) -> bool:
+        """Wait until sim_time is due; returns False if the run was stopped."""
+        condition = self._condition
+        with condition:
+            self._target = sim_time
+            while not self._stopped:
+                if self._paused:
+                    condition.wait()
+                    continue
+                # Motion ending before sim_time is shown, the rest is idle
+                due_time = sim_time
+                if self.skip_idle:
+                    due_time = min(max(self._animated_until, self.env.now), sim_time)
+                remaining = (
+                    self._wall_anchor
+                    + (due_time - self._sim_anchor) / self._speed
+                    - self._clock()
+                )
+                if remaining > 0:
+                    condition.wait(remaining)
+                    continue
+                if due_time < sim_time:
+                    self._sim_anchor = sim_time
+                    self._wall_anchor = self._clock()
+                return True
+            return False
+
+    def _publish(self, force: bool = False) -> None:
+        """Drain the environment and hand the chunk to every subscriber."""
+        env = self.env
+        if not force and not env.has_pending():
+            return
+        chunk = env.drain_chunk()
+        self._animated_until = max(self._animated_until, _animated_until(chunk))
+
+        condition = self._condition
+        with condition:
+            waited = False
+            while not self._stopped and any(s._full() for s in self._subscriptions):
+                waited = True
+                condition.wait()
+            if waited:
+                # Continue at the pace from here rather than catching up
+                self._sim_anchor = env.now
+                self._wall_anchor = self._clock()
+            for subscription in self._subscriptions:
+                subscription._chunks.append(chunk)
+            condition.notify_all()
+
+
+def _check_speed(speed: float) -> None:
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+
+
+def _animated_until(chunk: RecordingChunk) -> float:
+    """Latest end time of the moving or progressing segments of a chunk."""
+    latest = chunk.start_time
+    motion = chunk.motion_segments
+    for row, end_time in enumerate(motion.end_time):
+        if end_time is not None and end_time > latest and (
+            motion.start_x[row] != motion.end_x[row]
+            or motion.start_y[row] != motion.end_y[row]
+            or motion.start_angle[row] != motion.end_angle[row]
+        ):
+            latest = end_time
+    progress = chunk.progress_segments
+    for row, end_time in enumerate(progress.end_time):
+        if (
+            end_time is not None
+            and end_time > latest
+            and progress.start_value[row] != progress.end_value[row]
+        ):
+            latest = end_time
+    return latest
@@ -6,12 +6,20 @@ Provides a flexible, columnar data format that can represent any metric type:
 - Event metrics: sample (package delivery times, service durations), categorical events (voting choices)
 
 All metrics use a columnar format (col_name: [values]) which is efficient for
-serialization and frontend consumption.
+serialization and frontend consumption. While recording, MetricsContainer keeps
+the columns in growable NumPy arrays (states as integer codes) and builds the
+pydantic models only on export. With a RollupConfig, counters and gauges
+are aggregated into fixed sim-time buckets instead (see destiny_sim.core.rollup).
 """
+import math
 from enum import Enum, StrEnum
-from typing import Generic, TypeVar
+from typing import Annotated, Callable, Generic, Literal, Protocol, TypeVar
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, Field
+
+from destiny_sim.core.rollup import BucketRollup, RollupConfig
+from destiny_sim.core.streaming_stats import SampleStatistics
 
 
 class MetricType(str, Enum):
@@ -46,6 +54,74 @@ class StateMetricData(BaseModel):
 T = TypeVar("T", TimeSeriesMetricData, StateMetricData)
 
 
+class SampleSummary(BaseModel):
+    """
+    Streaming summary statistics of a sample metric.
+
+    Computed online while recording, so the raw points do not need to be
+    kept. Quantiles are approximate (P-square estimates) and keyed by the
+    quantile as a string, e.g. "0.95".
+    """
+
+    kind: Literal["sample"] = "sample"
+    count: int = 0
+    mean: float | None = None
+    variance: float | None = None
+    min: float | None = None
+    max: float | None = None
+    quantiles: dict[str, float] = {}
+
+
+class GaugeSummary(BaseModel):
+    """
+    Time-weighted statistics of a gauge metric.
+
+    The gauge holds each value until the next update; the last value is held
+    until end_time (the simulation time of the export).
+    """
+
+    kind: Literal["gauge"] = "gauge"
+    start_time: float
+    end_time: float
+    integral: float
+    time_weighted_mean: float | None = None
+    min: float
+    max: float
+
+
+class StateSummary(BaseModel):
+    """Cumulative time spent in each state, from start_time to end_time."""
+
+    kind: Literal["state"] = "state"
+    start_time: float
+    end_time: float
+    time_in_state: dict[str, float]
+
+
+MetricSummary = Annotated[
+    SampleSummary | GaugeSummary | StateSummary, Field(discriminator="kind")
+]
+
+
+class MetricRollup(BaseModel):
+    """
+    Counter or gauge aggregated into fixed sim-time buckets.
+
+    Columns are parallel arrays with one entry per bucket that received
+    updates; bucket i covers [start_time[i], start_time[i] + bucket_size).
+    min, max and time_weighted_mean describe the level of the metric over
+    the bucket, mean is the mean of the updated values.
+    """
+
+    bucket_size: float
+    start_time: list[float]
+    last: list[float]
+    min: list[float]
+    max: list[float]
+    mean: list[float]
+    time_weighted_mean: list[float | None]
+
+
 class Metric(BaseModel, Generic[T]):
     """
     Represents a single metric with columnar tabular data.
@@ -54,6 +130,8 @@ class Metric(BaseModel, Generic[T]):
     - name: Unique identifier for the metric (e.g., "queue_length", "service_time")
     - labels: Key-value pairs for filtering/grouping (e.g., {"counter_id": "counter_1", "location": "bank"})
     - data: Metric data (TimeSeriesMetricData or StateMetricData)
+    - summary: Optional summary statistics computed while recording
+    - rollups: Bucketed aggregates at one or more resolutions (rollup mode)
     
     Example:
         Metric[TimeSeriesMetricData](
@@ -71,6 +149,8 @@ class Metric(BaseModel, Generic[T]):
     type: MetricType
     labels: dict[str, str] = {}
     data: T
+    summary: MetricSummary | None = None
+    rollups: list[MetricRollup] = []
 
 
 class MetricsSchema(BaseModel):
@@ -84,49 +164,686 @@ class MetricsSchema(BaseModel):
     sample: list[Metric[TimeSeriesMetricData]] = []
     state: list[Metric[StateMetricData]] = []
 
+    def merge(self, other: "MetricsSchema") -> None:
+        """
+        Append the points of another schema to this one in place.
+
+        Metrics are matched by type, name and labels; points of `other` are
+        appended after the existing ones and its summaries replace the
+        existing ones. Rollups are cumulative as well: a metric with rollups
+        replaces both the rollups and the data. Metrics only present in
+        `other` are added.
+        """
+        for group_name in ("counter", "gauge", "sample", "state"):
+            group = getattr(self, group_name)
+            by_key = {(m.name, tuple(sorted(m.labels.items()))): m for m in group}
+            for metric in getattr(other, group_name):
+                key = (metric.name, tuple(sorted(metric.labels.items())))
+                existing = by_key.get(key)
+                if existing is None:
+                    by_key[key] = metric.model_copy(deep=True)
+                    group.append(by_key[key])
+                    continue
+                if metric.summary is not None:
+                    # Summaries are cumulative, the later one covers both
+                    existing.summary = metric.summary
+                if metric.rollups:
+                    existing.rollups = metric.rollups
+                    existing.data = metric.data
+                    continue
+                existing.data.timestamp.extend(metric.data.timestamp)
+                if isinstance(metric.data, StateMetricData):
+                    existing.data.state.extend(metric.data.state)
+                else:
+                    existing.data.value.extend(metric.data.value)
+
+    def filter(
+        self, name: str | None = None, labels: dict[str, str] | None = None
+    ) -> "MetricsSchema":
+        """
+        Return the metrics with the given name and labels.
+
+        Args:
+            name: Metric name to match exactly, or None for any name
+            labels: Label pairs the metric must all have (it may have more)
+        """
+        schema = MetricsSchema()
+        for group_name in ("counter", "gauge", "sample", "state"):
+            getattr(schema, group_name).extend(
+                metric
+                for metric in getattr(self, group_name)
+                if _matches(metric.name, metric.labels, name, labels)
+            )
+        return schema
+
+
+def _matches(
+    metric_name: str,
+    metric_labels: dict[str, str],
+    name: str | None,
+    labels: dict[str, str] | None,
+) -> bool:
+    """Whether a metric matches a name and label query."""
+    if name is not None and metric_name != name:
+        return False
+    return not labels or all(
+        metric_labels.get(key) == value for key, value in labels.items()
+    )
+
+
+# Label keys of metrics that belong to a single entity
+ENTITY_LABEL = "entity"
+ENTITY_TYPE_LABEL = "entity_type"
+
+# Initial number of points per metric; the arrays double when full
+_INITIAL_CAPACITY = 16
+# Quantiles estimated for sample metrics with a summary
+DEFAULT_SAMPLE_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class MetricClock(Protocol):
+    """Anything that provides the current simulation time (e.g. the environment)."""
+
+    @property
+    def now(self) -> float: ...
+
+
+class MetricHandle:
+    """
+    Pre-resolved reference to a single metric.
+
+    Handles are obtained once from MetricsContainer (or RecordingEnvironment)
+    and append straight to the metric's columns, without building a lookup
+    key from the name and labels on every call. The timestamp of each point
+    is read from the clock the handle was created with.
+
+    Points are stored in NumPy arrays with amortized doubling growth; the
+    pydantic Metric is only built on export (to_metric()).
+
+    With compact enabled (counters, gauges and states of a compacting
+    container), updates at the timestamp of the last point replace its value
+    and updates that do not change the value are not stored. The step
+    function drawn from the points is unchanged.
+
+    Counters and gauges of a container in rollup mode aggregate their points
+    into buckets instead of storing them. On export the data then holds the
+    last value of each bucket of the finest resolution, at the end of the
+    bucket, so that the level is still exact at the exported timestamps.
+    """
+
+    metric_type: MetricType
+    value_dtype: type = np.float64
+    # Set by the container for counters and gauges in rollup mode
+    rollup: BucketRollup | None = None
+    rollup_resolutions: tuple[int, ...] = ()
+    # Set by the container for counters, gauges and states in compact mode
+    compact: bool = False
+    _size: int = 0
+    # Value of the last released point, so that compaction carries over resets
+    _released_value: int | float | None = None
+
+    def __init__(
+        self,
+        container: "MetricsContainer",
+        name: str,
+        labels: dict[str, str] | None,
+        clock: MetricClock | None,
+    ) -> None:
+        self._container = container
+        self._clock = clock
+        self.name = name
+        self.labels = labels or {}
+        self._reset()
+
+    def _reset(self) -> None:
+        """Release the recorded points."""
+        if self._size:
+            self._released_value = self._values[self._size - 1].item()
+        self._rolled_up = self.rollup.updates if self.rollup is not None else 0
+        self._size = 0
+        self._capacity = _INITIAL_CAPACITY
+        self._timestamps = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._values = np.empty(_INITIAL_CAPACITY, dtype=self.value_dtype)
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        timestamps = np.empty(capacity, dtype=np.float64)
+        timestamps[: self._size] = self._timestamps
+        values = np.empty(capacity, dtype=self.value_dtype)
+        values[: self._size] = self._values
+        self._timestamps = timestamps
+        self._values = values
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def has_data(self) -> bool:
+        """Whether the metric has anything to export."""
+        return self._size > 0 or (self.rollup is not None and len(self.rollup) > 0)
+
+    def _now(self, last_time: float) -> float:
+        """Export time of time-weighted summaries: the clock, if any."""
+        if self._clock is None:
+            return last_time
+        return max(self._clock.now, last_time)
+
+    def has_news(self) -> bool:
+        """Whether anything was recorded since the last reset."""
+        return self._size > 0 or (
+            self.rollup is not None and self.rollup.updates != self._rolled_up
+        )
+
+    def restart(self, time: float) -> None:
+        """
+        Drop the points and statistics recorded so far and continue from time.
+
+        Used at the end of a warm-up period. Points already drained (e.g. to
+        a sink) are not affected.
+        """
+        if self.rollup is not None:
+            self.rollup = BucketRollup(self.rollup.bucket_size)
+        self._reset()
+        self._released_value = None
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of the recorded points (a view, valid until the next point)."""
+        return self._timestamps[: self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Values of the recorded points (a view, valid until the next point)."""
+        return self._values[: self._size]
+
+    def _record(self, time: float, value: int | float) -> None:
+        if self.rollup is not None:
+            self.rollup.add(time, value)
+            return
+        size = self._size
+        if self.compact:
+            if not size:
+                if self._released_value == value:
+                    return
+            else:
+                last = size - 1
+                if self._values[last] == value:
+                    return
+                if self._timestamps[last] == time:
+                    # Keep only the final value at a timestamp, and drop the
+                    # point if that restores the previous value
+                    previous = self._values[last - 1] if last else self._released_value
+                    if previous == value:
+                        self._size = last
+                        self._container.pending_points -= 1
+                    else:
+                        self._values[last] = value
+                    return
+        if size == self._capacity:
+            self._grow()
+        self._timestamps[size] = time
+        self._values[size] = value
+        self._size = size + 1
+        container = self._container
+        container.pending_points += 1
+        if container.on_point is not None:
+            container.on_point()
+
+    def to_metric(self) -> Metric:
+        """Export the recorded points as a pydantic Metric."""
+        if self.rollup is not None:
+            return self._rollup_metric()
+        return Metric[TimeSeriesMetricData](
+            name=self.name,
+            type=self.metric_type,
+            labels=self.labels,
+            data=TimeSeriesMetricData(
+                timestamp=self.timestamps.tolist(), value=self.values.tolist()
+            ),
+        )
+
+    def _rollup_metric(self) -> Metric:
+        rollup = self.rollup
+        end_time = self._now(rollup.last_time)
+        rollups = [
+            MetricRollup(**vars(rollup.export(factor, end_time)))
+            for factor in sorted(self.rollup_resolutions)
+        ]
+        finest = rollups[0]
+        return Metric[TimeSeriesMetricData](
+            name=self.name,
+            type=self.metric_type,
+            labels=self.labels,
+            data=TimeSeriesMetricData(
+                timestamp=[
+                    min(start + finest.bucket_size, end_time)
+                    for start in finest.start_time
+                ],
+                value=list(finest.last),
+            ),
+            rollups=rollups,
+        )
+
+
+class CounterHandle(MetricHandle):
+    """Handle to a counter metric."""
+
+    metric_type = MetricType.COUNTER
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.value: int | float = 0
+
+    def incr(self, amount: int | float = 1) -> None:
+        """Increment the counter by amount at the current time."""
+        self.value += amount
+        self._record(self._clock.now, self.value)
+
+    def restart(self, time: float) -> None:
+        """Drop the recorded points and count again from 0 at time."""
+        super().restart(time)
+        if self.value:
+            self.value = 0
+            self._record(time, 0)
+
+
+class GaugeHandle(MetricHandle):
+    """
+    Handle to a gauge metric.
+
+    Keeps the time-weighted integral, min and max of the gauge up to date as
+    values arrive and exports them as a GaugeSummary.
+    """
+
+    metric_type = MetricType.GAUGE
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._start_time: float | None = None
+        self._last_time = 0.0
+        self._last_value = 0.0
+        self._integral = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._summarized_at: float | None = None
+        super().__init__(*args, **kwargs)
+        self.value: int | float = 0
+
+    def set(self, value: int | float) -> None:
+        """Set the gauge to value at the current time."""
+        self.value = value
+        self._record(self._clock.now, value)
+
+    def adjust(self, delta: int | float) -> None:
+        """Change the gauge by delta at the current time."""
+        self.value += delta
+        self._record(self._clock.now, self.value)
+
+    def _record(self, time: float, value: int | float) -> None:
+        if self._start_time is None:
+            self._start_time = time
+        else:
+            self._integral += self._last_value * (time - self._last_time)
+        self._last_time = time
+        self._last_value = value
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        super()._record(time, value)
+
+    def has_data(self) -> bool:
+        return self._start_time is not None
+
+    def restart(self, time: float) -> None:
+        """Drop the recorded points and summary; the level carries over at time."""
+        started = self._start_time is not None
+        self._start_time = None
+        self._integral = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._summarized_at = None
+        super().restart(time)
+        if started:
+            self._record(time, self.value)
+
+    def has_news(self) -> bool:
+        return super().has_news() or (
+            self._start_time is not None
+            and self._now(self._last_time) != self._summarized_at
+        )
+
+    def _reset(self) -> None:
+        super()._reset()
+        if self._start_time is not None:
+            self._summarized_at = self._now(self._last_time)
+
+    def to_metric(self) -> Metric:
+        metric = super().to_metric()
+        if self._start_time is not None:
+            end_time = self._now(self._last_time)
+            integral = self._integral + self._last_value * (end_time - self._last_time)
+            duration = end_time - self._start_time
+            metric.summary = GaugeSummary(
+                start_time=self._start_time,
+                end_time=end_time,
+                integral=integral,
+                time_weighted_mean=integral / duration if duration > 0 else None,
+                min=self._min,
+                max=self._max,
+            )
+        return metric
+
+
+class SampleHandle(MetricHandle):
+    """
+    Handle to a sample metric.
+
+    With summary enabled, count, mean, variance, min, max and the given
+    quantiles are tracked online and exported as the metric's summary. With
+    keep_points disabled only the summary is kept, in constant memory.
+    """
+
+    metric_type = MetricType.SAMPLE
+
+    def __init__(
+        self,
+        container: "MetricsContainer",
+        name: str,
+        labels: dict[str, str] | None,
+        clock: MetricClock | None,
+        summary: bool = False,
+        keep_points: bool = True,
+        quantiles: tuple[float, ...] = DEFAULT_SAMPLE_QUANTILES,
+    ) -> None:
+        self.statistics = SampleStatistics(quantiles) if summary else None
+        self.keep_points = keep_points or not summary
+        self._summarized_count = 0
+        super().__init__(container, name, labels, clock)
+        if self.statistics is None:
+            # Plain samples go straight to the columns
+            self._observe = self._record
+
+    def record(self, value: int | float) -> None:
+        """Record an observation at the current time."""
+        self._observe(self._clock.now, value)
+
+    def _observe(self, time: float, value: int | float) -> None:
+        self.statistics.add(value)
+        if self.keep_points:
+            self._record(time, value)
+
+    def has_data(self) -> bool:
+        return self._size > 0 or self.statistics is not None
+
+    def has_news(self) -> bool:
+        return self._size > 0 or (
+            self.statistics is not None
+            and self.statistics.count != self._summarized_count
+        )
+
+    def _reset(self) -> None:
+        super()._reset()
+        if self.statistics is not None:
+            self._summarized_count = self.statistics.count
+
+    def restart(self, time: float) -> None:
+        """Drop the recorded observations and statistics."""
+        if self.statistics is not None:
+            quantiles = tuple(quantile.p for quantile in self.statistics.quantiles)
+            self.statistics = SampleStatistics(quantiles)
+        super().restart(time)
+
+    def to_metric(self) -> Metric:
+        metric = super().to_metric()
+        statistics = self.statistics
+        if statistics is not None:
+            running = statistics.running
+            empty = running.count == 0
+            metric.summary = SampleSummary(
+                count=running.count,
+                mean=None if empty else running.mean,
+                variance=None if empty else running.variance,
+                min=None if empty else running.min,
+                max=None if empty else running.max,
+                quantiles={
+                    str(quantile.p): quantile.value
+                    for quantile in statistics.quantiles
+                    if quantile.value is not None
+                },
+            )
+        return metric
+
+
+class StateHandle(MetricHandle):
+    """
+    Handle to a state metric. States must be members of the metric's StrEnum.
+
+    States are stored as integer codes, i.e. indices into possible_states.
+    The cumulative time spent in each state is kept up to date as states
+    change and exported as a StateSummary.
+    """
+
+    metric_type = MetricType.STATE
+    value_dtype = np.uint16
+
+    def __init__(
+        self,
+        container: "MetricsContainer",
+        name: str,
+        enum_class: type[StrEnum],
+        labels: dict[str, str] | None,
+        clock: MetricClock | None,
+    ) -> None:
+        self.possible_states = [member.value for member in enum_class]
+        self._codes = {state: code for code, state in enumerate(self.possible_states)}
+        self._start_time: float | None = None
+        self._last_time = 0.0
+        self._last_code = 0
+        self._time_in_state = [0.0] * len(self.possible_states)
+        self._summarized_at: float | None = None
+        super().__init__(container, name, labels, clock)
+
+    def set(self, state: StrEnum) -> None:
+        """Set the state at the current time."""
+        self._record_state(self._clock.now, state)
+
+    def _record_state(self, time: float, state: StrEnum) -> None:
+        code = self._codes.get(state.value)
+        if code is None:
+            raise ValueError(
+                f"State '{state.value}' is not in possible_states for metric "
+                f"'{self.name}': {self.possible_states}"
+            )
+        self._record(time, code)
+
+    def _record(self, time: float, code: int) -> None:
+        if self._start_time is None:
+            self._start_time = time
+        else:
+            self._time_in_state[self._last_code] += time - self._last_time
+        self._last_time = time
+        self._last_code = code
+        super()._record(time, code)
+
+    def has_data(self) -> bool:
+        return self._start_time is not None
+
+    def restart(self, time: float) -> None:
+        """Drop the recorded points and summary; the state carries over at time."""
+        started = self._start_time is not None
+        self._start_time = None
+        self._time_in_state = [0.0] * len(self.possible_states)
+        self._summarized_at = None
+        super().restart(time)
+        if started:
+            self._record(time, self._last_code)
+
+    def has_news(self) -> bool:
+        return self._size > 0 or (
+            self._start_time is not None
+            and self._now(self._last_time) != self._summarized_at
+        )
+
+    def _reset(self) -> None:
+        super()._reset()
+        if self._start_time is not None:
+            self._summarized_at = self._now(self._last_time)
+
+    def to_metric(self) -> Metric:
+        """Export the recorded points as a pydantic Metric with state names."""
+        possible_states = self.possible_states
+        metric = Metric[StateMetricData](
+            name=self.name,
+            type=self.metric_type,
+            labels=self.labels,
+            data=StateMetricData(
+                timestamp=self.timestamps.tolist(),
+                state=[possible_states[code] for code in self.values.tolist()],
+                possible_states=possible_states,
+            ),
+        )
+        if self._start_time is not None:
+            end_time = self._now(self._last_time)
+            time_in_state = list(self._time_in_state)
+            time_in_state[self._last_code] += end_time - self._last_time
+            metric.summary = StateSummary(
+                start_time=self._start_time,
+                end_time=end_time,
+                time_in_state=dict(zip(possible_states, time_in_state, strict=True)),
+            )
+        return metric
+
 
 class MetricsContainer:
     """
     Container for managing and recording metrics.
+
+    Metrics can be recorded through pre-resolved handles (counter(), gauge(),
+    sample(), state()), or through the string-based methods (incr_counter()
+    etc.), which resolve the handle from name and labels on every call.
+
+    Handles are indexed by name and by label pair, so that query() finds
+    the metrics of e.g. one entity without scanning all of them.
     """
 
-    def __init__(self) -> None:
-        # Metrics storage: key is (name, metric_type, sorted_labels_tuple) to ensure uniqueness
-        # Value is tuple of (Metric, MetricType) to track type separately
-        self._metrics: dict[tuple[str, MetricType, tuple[tuple[str, str], ...]], tuple[Metric, MetricType]] = {}
+    def __init__(
+        self,
+        clock: MetricClock | None = None,
+        rollup: RollupConfig | None = None,
+        compact: bool = False,
+    ) -> None:
+        """
+        Args:
+            clock: Provides the time of points recorded through handles
+            rollup: Aggregate counters and gauges into fixed sim-time buckets
+                instead of keeping every point (rollup mode)
+            compact: Collapse counter, gauge and state updates at the same
+                timestamp into the final value and skip unchanged values
+        """
+        self.clock = clock
+        self.rollup = rollup
+        self.compact = compact
+        # Handles keyed by (name, metric_type, sorted_labels_tuple) to ensure uniqueness
+        self._handles: dict[
+            tuple[str, MetricType, tuple[tuple[str, str], ...]], MetricHandle
+        ] = {}
+        # Inverted indexes: name / (label key, label value) -> handles by key
+        self._by_name: dict[str, dict[tuple, MetricHandle]] = {}
+        self._by_label: dict[tuple[str, str], dict[tuple, MetricHandle]] = {}
+        # Number of points recorded since the last drain
+        self.pending_points = 0
+        # Optional callback run after every recorded point
+        self.on_point: Callable[[], None] | None = None
+        # Optional callback run for every newly registered handle
+        self.on_register: Callable[[MetricHandle], None] | None = None
 
     def _get_metric_key(self, name: str, metric_type: MetricType, labels: dict[str, str] | None) -> tuple:
         """Create a unique key for a metric based on name, type, and labels."""
         labels_tuple = tuple(sorted(labels.items())) if labels else ()
         return (name, metric_type, labels_tuple)
 
-    def _get_or_create_time_series_metric(self, name: str, metric_type: MetricType, labels: dict[str, str] | None) -> Metric[TimeSeriesMetricData]:
-        """Get existing time-series metric or create a new one."""
-        key = self._get_metric_key(name, metric_type, labels)
-        if key not in self._metrics:
-            metric = Metric[TimeSeriesMetricData](
-                name=name,
-                type=metric_type,
-                labels=labels or {},
-                data=TimeSeriesMetricData(timestamp=[], value=[])
+    def _register(self, key: tuple, handle: MetricHandle) -> MetricHandle:
+        """Store a new handle and add it to the indexes."""
+        handle.compact = self.compact and handle.metric_type != MetricType.SAMPLE
+        self._handles[key] = handle
+        self._by_name.setdefault(handle.name, {})[key] = handle
+        for pair in key[2]:
+            self._by_label.setdefault(pair, {})[key] = handle
+        if self.on_register is not None:
+            self.on_register(handle)
+        return handle
+
+    def _get_or_create_handle(
+        self,
+        handle_class: type[MetricHandle],
+        name: str,
+        labels: dict[str, str] | None,
+    ) -> MetricHandle:
+        """Get existing handle of a time-series metric or create a new one."""
+        key = self._get_metric_key(name, handle_class.metric_type, labels)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._register(key, handle_class(self, name, labels, self.clock))
+            if self.rollup is not None:
+                handle.rollup = BucketRollup(self.rollup.bucket_size)
+                handle.rollup_resolutions = self.rollup.resolutions
+                handle._reset()
+        return handle
+
+    def counter(self, name: str, labels: dict[str, str] | None = None) -> CounterHandle:
+        """Return the handle of a counter metric, registering it if needed."""
+        return self._get_or_create_handle(CounterHandle, name, labels)  # type: ignore
+
+    def gauge(self, name: str, labels: dict[str, str] | None = None) -> GaugeHandle:
+        """Return the handle of a gauge metric, registering it if needed."""
+        return self._get_or_create_handle(GaugeHandle, name, labels)  # type: ignore
+
+    def sample(
+        self,
+        name: str,
+        labels: dict[str, str] | None = None,
+        summary: bool = False,
+        keep_points: bool = True,
+        quantiles: tuple[float, ...] = DEFAULT_SAMPLE_QUANTILES,
+    ) -> SampleHandle:
+        """
+        Return the handle of a sample metric, registering it if needed.
+
+        Args:
+            name: Metric name
+            labels: Optional filtering labels
+            summary: Track streaming summary statistics (see SampleHandle)
+            keep_points: Keep the raw observations next to the summary
+            quantiles: Quantiles estimated for the summary
+
+        The options only apply when the metric is registered; later calls
+        return the existing handle.
+        """
+        key = self._get_metric_key(name, MetricType.SAMPLE, labels)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._register(
+                key,
+                SampleHandle(
+                    self, name, labels, self.clock, summary, keep_points, quantiles
+                ),
             )
-            self._metrics[key] = (metric, metric_type)
-        return self._metrics[key][0]  # type: ignore
-
-    def _get_or_create_state_metric(self, name: str, enum_class: type[StrEnum], labels: dict[str, str] | None) -> Metric[StateMetricData]:
-        """Get existing state metric or create a new one."""
-        metric_type = MetricType.STATE
-        key = self._get_metric_key(name, metric_type, labels)
-        if key not in self._metrics:
-            possible_states = [member.value for member in enum_class]
-            metric = Metric[StateMetricData](
-                name=name,
-                type=metric_type,
-                labels=labels or {},
-                data=StateMetricData(timestamp=[], state=[], possible_states=possible_states)
+        return handle  # type: ignore
+
+    def state(
+        self,
+        name: str,
+        enum_class: type[StrEnum],
+        labels: dict[str, str] | None = None,
+    ) -> StateHandle:
+        """Return the handle of a state metric, registering it if needed."""
+        key = self._get_metric_key(name, MetricType.STATE, labels)
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._register(
+                key, StateHandle(self, name, enum_class, labels, self.clock)
             )
-            self._metrics[key] = (metric, metric_type)
-        return self._metrics[key][0]  # type: ignore
+        return handle  # type: ignore
 
     def incr_counter(self, name: str, time: float, amount: int | float = 1, labels: dict[str, str] | None = None) -> None:
         """
@@ -138,15 +855,9 @@ class MetricsContainer:
             amount: Amount to increment by (default 1)
             labels: Optional filtering labels
         """
-        metric = self._get_or_create_time_series_metric(name, MetricType.COUNTER, labels)
-        
-        current_value = 0
-        if metric.data.value:
-            current_value = metric.data.value[-1]
-            
-        new_value = current_value + amount
-        metric.data.timestamp.append(time)
-        metric.data.value.append(new_value)
+        handle = self.counter(name, labels)
+        handle.value += amount
+        handle._record(time, handle.value)
 
     def set_gauge(self, name: str, time: float, value: int | float, labels: dict[str, str] | None = None) -> None:
         """
@@ -158,9 +869,9 @@ class MetricsContainer:
             value: New value
             labels: Optional filtering labels
         """
-        metric = self._get_or_create_time_series_metric(name, MetricType.GAUGE, labels)
-        metric.data.timestamp.append(time)
-        metric.data.value.append(value)
+        handle = self.gauge(name, labels)
+        handle.value = value
+        handle._record(time, value)
 
     def adjust_gauge(self, name: str, time: float, delta: int | float, labels: dict[str, str] | None = None) -> None:
         """
@@ -172,15 +883,9 @@ class MetricsContainer:
             delta: Amount to change the gauge by (positive to increase, negative to decrease)
             labels: Optional filtering labels
         """
-        metric = self._get_or_create_time_series_metric(name, MetricType.GAUGE, labels)
-        
-        current_value = 0
-        if metric.data.value:
-            current_value = metric.data.value[-1]
-            
-        new_value = current_value + delta
-        metric.data.timestamp.append(time)
-        metric.data.value.append(new_value)
+        handle = self.gauge(name, labels)
+        handle.value += delta
+        handle._record(time, handle.value)
     
     def record_sample(self, name: str, time: float, value: int | float, labels: dict[str, str] | None = None) -> None:
         """
@@ -196,9 +901,7 @@ class MetricsContainer:
             value: Sample value (e.g., delivery time, service duration)
             labels: Optional filtering labels
         """
-        metric = self._get_or_create_time_series_metric(name, MetricType.SAMPLE, labels)
-        metric.data.timestamp.append(time)
-        metric.data.value.append(value)
+        self.sample(name, labels)._observe(time, value)
     
     def set_state(self, name: str, time: float, state: StrEnum, labels: dict[str, str] | None = None) -> None:
         """
@@ -210,28 +913,85 @@ class MetricsContainer:
             state: State value (must be a StrEnum member)
             labels: Optional filtering labels
         """
-        enum_class = type(state)
-        
-        metric = self._get_or_create_state_metric(name, enum_class, labels)
-
-        if state.value not in metric.data.possible_states:
-            raise ValueError(f"State '{state.value}' is not in possible_states for metric '{name}': {metric.data.possible_states}")
-        
-        metric.data.timestamp.append(time)
-        metric.data.state.append(state.value)
+        self.state(name, type(state), labels)._record_state(time, state)
     
     def get_all(self) -> MetricsSchema:
-        """Return all recorded metrics grouped by type."""
+        """Return all recorded metrics by type. Metrics without data are omitted."""
         schema = MetricsSchema()
         
-        for (metric, metric_type) in self._metrics.values():
-            if metric_type == MetricType.COUNTER:
-                schema.counter.append(metric)
-            elif metric_type == MetricType.GAUGE:
-                schema.gauge.append(metric)
-            elif metric_type == MetricType.SAMPLE:
-                schema.sample.append(metric)
-            elif metric_type == MetricType.STATE:
-                schema.state.append(metric)
+        for handle in self._handles.values():
+            if handle.has_data():
+                getattr(schema, handle.metric_type.value).append(handle.to_metric())
         
         return schema
+
+    def restart(self, time: float) -> None:
+        """
+        Restart all metrics at time (see MetricHandle.restart()).
+
+        Counters count again from 0, gauges and states keep their current
+        value and summaries only cover the time from then on.
+        """
+        for handle in self._handles.values():
+            handle.restart(time)
+        self.pending_points = sum(len(handle) for handle in self._handles.values())
+
+    def handles(
+        self, name: str | None = None, labels: dict[str, str] | None = None
+    ) -> list[MetricHandle]:
+        """
+        Return the handles with the given name and labels, in registration order.
+
+        Args:
+            name: Metric name to match exactly, or None for any name
+            labels: Label pairs the metric must all have (it may have more)
+        """
+        candidates = []
+        if name is not None:
+            candidates.append(self._by_name.get(name, {}))
+        for pair in (labels or {}).items():
+            candidates.append(self._by_label.get(pair, {}))
+        if not candidates:
+            return list(self._handles.values())
+
+        # Walk the smallest index entry and check membership in the others
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return [
+            handle
+            for key, handle in smallest.items()
+            if all(key in other for other in others)
+        ]
+
+    def query(
+        self, name: str | None = None, labels: dict[str, str] | None = None
+    ) -> MetricsSchema:
+        """
+        Return the recorded metrics with the given name and labels.
+
+        Same matching as MetricsSchema.filter(), but resolved through the
+        name and label indexes. Metrics without data are omitted.
+        """
+        schema = MetricsSchema()
+        for handle in self.handles(name, labels):
+            if handle.has_data():
+                getattr(schema, handle.metric_type.value).append(handle.to_metric())
+        return schema
+
+    def drain(self) -> MetricsSchema:
+        """
+        Return the points recorded since the last drain and release them.
+
+        Metrics keep their identity and current value, so recording continues
+        seamlessly after a drain. Metrics without new points are omitted.
+        """
+        schema = MetricsSchema()
+
+        for handle in self._handles.values():
+            if not handle.has_news():
+                continue
+            getattr(schema, handle.metric_type.value).append(handle.to_metric())
+            handle._reset()
+
+        self.pending_points = 0
+        return schema
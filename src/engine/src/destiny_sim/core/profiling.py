@@ -0,0 +1,270 @@
+"""
+Event-loop instrumentation of a simulation run.
+
+A RecordingEnvironment created with an EventLoopProfiler steps its events
+through an instrumented path that counts, per SimPy process, the events the
+process scheduled and the events that resumed it, and measures the wall time
+spent processing those events (i.e. resuming the process's generator).
+Processes are grouped by their generator function and the SimulationEntity
+they are a method of, so a chatty entity stands out even if it starts many
+short-lived processes. The profiler also samples the size of SimPy's event
+heap (the scheduled events) over the run and, optionally, Python memory.
+
+The report (EventLoopProfile) is attached to the recording as
+recording.profile. Without a profiler the environment runs SimPy's own
+step() and schedule(), so profiling costs nothing when disabled.
+"""
+
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+from simpy.events import Event, Process
+
+from destiny_sim.core.simulation_entity import SimulationEntity
+
+if TYPE_CHECKING:
+    from destiny_sim.core.environment import RecordingEnvironment
+
+# Processed events between event heap samples
+DEFAULT_HEAP_INTERVAL = 1000
+
+
+class ProcessProfile(BaseModel):
+    """
+    Event-loop cost of the processes of one generator function and entity.
+
+    Attributes:
+        name: Qualified name of the generator function (e.g.
+            "ManufacturingCell.process")
+        entity_id: Id of the entity the generator is a method of, if any
+        instances: Number of SimPy processes started
+        scheduled: Events scheduled while one of the processes was running
+        processed: Events processed that resumed one of the processes
+        wall_time: Wall-clock seconds spent processing those events
+    """
+
+    name: str
+    entity_id: str | None = None
+    instances: int = 0
+    scheduled: int = 0
+    processed: int = 0
+    wall_time: float = 0.0
+
+
+class EntityProfile(BaseModel):
+    """Event-loop cost of all processes of one entity."""
+
+    entity_id: str
+    entity_type: str
+    name: str | None = None
+    scheduled: int = 0
+    processed: int = 0
+    wall_time: float = 0.0
+
+
+class HeapSample(BaseModel):
+    """
+    Size of the event heap at a point of the run.
+
+    Attributes:
+        wall_time: Wall-clock seconds since the first processed event
+        sim_time: Simulation time
+        events: Events processed so far
+        queue_length: Events scheduled and not yet processed
+        memory_bytes: Size of the memory blocks traced by tracemalloc (only
+            with trace_memory)
+    """
+
+    wall_time: float
+    sim_time: float
+    events: int
+    queue_length: int
+    memory_bytes: int | None = None
+
+
+class EventLoopProfile(BaseModel):
+    """
+    Report of an EventLoopProfiler.
+
+    Processes and entities are sorted by wall time, most expensive first.
+    Events that resumed no process (e.g. the stop event of run(until)) count
+    in the totals only.
+    """
+
+    events: int = 0
+    scheduled: int = 0
+    wall_time: float = 0.0
+    processes: list[ProcessProfile] = []
+    entities: list[EntityProfile] = []
+    heap: list[HeapSample] = []
+
+
+class EventLoopProfiler:
+    """
+    Collects event counts, wall time and event heap size of a RecordingEnvironment.
+
+    Pass it as RecordingEnvironment(profiler=...). With trace_memory, memory
+    tracing with tracemalloc starts with the first processed event (unless
+    tracemalloc is already tracing); it slows the run down several times,
+    which distorts the wall times, so it is off by default. Call stop() to
+    end it once the run is over.
+    """
+
+    def __init__(
+        self,
+        heap_interval: int = DEFAULT_HEAP_INTERVAL,
+        trace_memory: bool = False,
+        clock=time.perf_counter,
+    ):
+        """
+        Args:
+            heap_interval: Processed events between event heap samples
+            trace_memory: Also sample Python memory (with tracemalloc)
+            clock: Wall clock in seconds used for timing
+
+        Raises:
+            ValueError: If heap_interval is not positive
+        """
+        if heap_interval < 1:
+            raise ValueError(f"heap_interval must be positive, got {heap_interval}")
+        self.heap_interval = heap_interval
+        self.trace_memory = trace_memory
+        self.clock = clock
+        self.events = 0
+        self.scheduled = 0
+        self.wall_time = 0.0
+        self.heap: list[HeapSample] = []
+        self._queue: list | None = None
+        self._started_at: float | None = None
+        self._started_tracing = False
+        self._profiles: dict[tuple[str, str | None], ProcessProfile] = {}
+        self._process_profiles: WeakKeyDictionary[Process, ProcessProfile] = (
+            WeakKeyDictionary()
+        )
+        self._entities: dict[str, SimulationEntity] = {}
+
+    def stop(self) -> None:
+        """Stop memory tracing if this profiler started it."""
+        if self._started_tracing:
+            self._started_tracing = False
+            tracemalloc.stop()
+
+    def _attach(self, env: "RecordingEnvironment") -> None:
+        """Called once by the environment; subclasses instrument more of it here."""
+        self._queue = env._queue
+
+    def _start(self) -> None:
+        self._started_at = self.clock()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _scheduled(self, active_process: Process | None) -> None:
+        """Count an event scheduled while active_process was running."""
+        self.scheduled += 1
+        if active_process is not None:
+            profile = self._process_profiles.get(active_process)
+            if profile is not None:
+                profile.scheduled += 1
+
+    def _resumed_processes(self, event: Event) -> list[ProcessProfile]:
+        """Profiles of the processes the event is about to resume."""
+        profiles = []
+        for callback in event.callbacks or ():
+            process = getattr(callback, "__self__", None)
+            if isinstance(process, Process):
+                profile = self._process_profiles.get(process)
+                if profile is None:
+                    profile = self._profile_of(process)
+                    self._process_profiles[process] = profile
+                profiles.append(profile)
+        return profiles
+
+    def _profile_of(self, process: Process) -> ProcessProfile:
+        """Profile shared by the processes with the same generator and entity."""
+        generator = process._generator
+        entity = None
+        frame = getattr(generator, "gi_frame", None)
+        if frame is not None:
+            owner = frame.f_locals.get("self")
+            if isinstance(owner, SimulationEntity):
+                entity = owner
+        name = getattr(generator, "__qualname__", process.name)
+        key = (name, entity.id if entity is not None else None)
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = ProcessProfile(name=name, entity_id=key[1])
+            if entity is not None:
+                self._entities[entity.id] = entity
+        profile.instances += 1
+        return profile
+
+    def _processed(
+        self,
+        profiles: list[ProcessProfile],
+        started: float,
+        finished: float,
+        sim_time: float,
+    ) -> None:
+        """Account an event processed from started to finished (clock time)."""
+        wall_time = finished - started
+        self.events += 1
+        self.wall_time += wall_time
+        if profiles:
+            share = wall_time / len(profiles)
+            for profile in profiles:
+                profile.processed += 1
+                profile.wall_time += share
+        if (self.events - 1) % self.heap_interval == 0:
+            self._sample_heap(sim_time)
+
+    def _sample_heap(self, sim_time: float) -> None:
+        memory_bytes = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            memory_bytes = tracemalloc.get_traced_memory()[0]
+        self.heap.append(
+            HeapSample(
+                wall_time=self.clock() - self._started_at,
+                sim_time=sim_time,
+                events=self.events,
+                queue_length=len(self._queue),
+                memory_bytes=memory_bytes,
+            )
+        )
+
+    def report(self) -> EventLoopProfile:
+        """Return what was collected so far."""
+        processes = sorted(
+            (profile.model_copy() for profile in self._profiles.values()),
+            key=lambda profile: profile.wall_time,
+            reverse=True,
+        )
+        entities: dict[str, EntityProfile] = {}
+        for profile in processes:
+            if profile.entity_id is None:
+                continue
+            entity_profile = entities.get(profile.entity_id)
+            if entity_profile is None:
+                info = self._entities[profile.entity_id].get_rendering_info()
+                entity_profile = entities[profile.entity_id] = EntityProfile(
+                    entity_id=profile.entity_id,
+                    entity_type=info.entity_type,
+                    name=info.name,
+                )
+            entity_profile.scheduled += profile.scheduled
+            entity_profile.processed += profile.processed
+            entity_profile.wall_time += profile.wall_time
+
+        return EventLoopProfile(
+            events=self.events,
+            scheduled=self.scheduled,
+            wall_time=self.wall_time,
+            processes=processes,
+            entities=sorted(
+                entities.values(), key=lambda profile: profile.wall_time, reverse=True
+            ),
+            heap=list(self.heap),
+        )
@@ -0,0 +1,45 @@
+"""
+Independent, reproducible random number streams.
+
+Every consumer of randomness (an entity, a task provider, ...) draws from its
+own numpy Generator, identified by a stable key such as the entity name. The
+stream of a key is derived from the root seed and the key only, so it does
+not depend on how many other streams exist or in which order they are
+created: adding an entity to a model leaves the draws of the others intact.
+"""
+
+import hashlib
+
+import numpy as np
+
+
+def _key_to_int(key: str) -> int:
+    """Stable (process-independent) integer of a stream key."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStreams:
+    """
+    Named numpy Generator streams derived from one root seed.
+
+    Streams are spawned from a SeedSequence with the hashed key as spawn key,
+    which makes them statistically independent. Without a seed, fresh entropy
+    is drawn; it is available as `seed` to reproduce the run.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        Args:
+            seed: Root seed of all streams, or None for fresh entropy
+        """
+        self.seed: int = np.random.SeedSequence(seed).entropy  # type: ignore[assignment]
+        self._streams: dict[str, np.random.Generator] = {}
+
+    def get(self, key: str) -> np.random.Generator:
+        """Return the stream of a key, creating it on first use."""
+        stream = self._streams.get(key)
+        if stream is None:
+            sequence = np.random.SeedSequence(self.seed, spawn_key=(_key_to_int(key),))
+            stream = self._streams[key] = np.random.Generator(np.random.PCG64(sequence))
+        return stream
@@ -0,0 +1,305 @@
+"""
+Time-indexed queries over a simulation recording.
+
+RecordingIndex answers "where is every entity at time t?" without scanning
+segment lists. Each entity's segments are kept sorted by start time next to a
+plain list of start times, so that the active segment is found by bisection.
+
+Queries follow the playback rules of the recording (see
+destiny_sim.core.timeline.SimulationRecording):
+- a new record invalidates the previous one: the active segment at t is the
+  last segment that starts at or before t
+- the active segment is only visible while t is within [start_time, end_time];
+  an end_time of None extends the segment by the recording duration
+- coordinates of a segment with a parent are relative to the parent; world
+  coordinates are only resolved while the parent is visible, otherwise the
+  entity is placed at its own coordinates
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from destiny_sim.core.rendering import SimulationEntityType
+from destiny_sim.core.timeline import (
+    MotionSegment,
+    NormalizedSimulationRecording,
+    ProgressSegment,
+    SimulationRecording,
+)
+
+
+@dataclass(frozen=True)
+class ProgressState:
+    """Interpolated progress of an entity at a point in time."""
+
+    value: float
+    min_value: float
+    max_value: float
+
+
+@dataclass(frozen=True)
+class EntityState:
+    """Interpolated state of an entity at a point in time."""
+
+    entity_id: str
+    entity_type: SimulationEntityType
+    name: str | None
+    parent_id: str | None
+    x: float
+    y: float
+    angle: float
+    progress: ProgressState | None = None
+
+
+def _lerp(start: float, end: float, t: float) -> float:
+    return start + (end - start) * t
+
+
+class _SegmentTimeline:
+    """Segments of one entity sorted by start time, with bisectable bounds."""
+
+    def __init__(self, segments: list, duration: float):
+        # Stable sort keeps the recording order of segments that start at the
+        # same time, so the last recorded one wins.
+        self.segments = sorted(segments, key=lambda segment: segment.start_time)
+        self.starts = [segment.start_time for segment in self.segments]
+        self.ends = [
+            segment.end_time
+            if segment.end_time is not None
+            else segment.start_time + duration
+            for segment in self.segments
+        ]
+        # Time until which each segment can be visible: its own end, or the
+        # start of the next segment that invalidates it. Non-decreasing.
+        next_starts = self.starts[1:] + [math.inf]
+        self.visible_until = [
+            min(end, next_start)
+            for end, next_start in zip(self.ends, next_starts, strict=True)
+        ]
+
+    def active_index(self, time: float) -> int | None:
+        """Index of the segment visible at the given time, if any."""
+        index = bisect_right(self.starts, time) - 1
+        if index < 0 or time > self.ends[index]:
+            return None
+        return index
+
+    def window(self, start: float, end: float) -> list:
+        """Segments visible at some point of the interval [start, end]."""
+        first = bisect_left(self.visible_until, start)
+        last = bisect_right(self.starts, end)
+        return [
+            self.segments[index]
+            for index in range(first, last)
+            # Skip segments that are invalidated exactly at the window start
+            if self.visible_until[index] > start
+            or not self._invalidated_at(index, start)
+        ]
+
+    def _invalidated_at(self, index: int, time: float) -> bool:
+        return index + 1 < len(self.starts) and self.starts[index + 1] <= time
+
+    def fraction(self, index: int, time: float) -> float:
+        """Interpolation parameter of a time within the given segment."""
+        start = self.starts[index]
+        length = self.ends[index] - start
+        return (time - start) / length if length > 0 else 0
+
+
+class RecordingIndex:
+    """
+    Index over a recording for point-in-time, time-window and per-entity queries.
+
+    Building the index sorts each entity's segments once. Every query for a
+    single entity then costs O(log n) in the number of that entity's segments.
+    """
+
+    def __init__(self, recording: SimulationRecording | NormalizedSimulationRecording):
+        """
+        Args:
+            recording: Recording to index, in either form
+        """
+        if isinstance(recording, NormalizedSimulationRecording):
+            recording = recording.to_recording()
+
+        self.duration = recording.duration
+        self._motion = {
+            entity_id: _SegmentTimeline(segments, recording.duration)
+            for entity_id, segments in recording.motion_segments_by_entity.items()
+            if segments
+        }
+        self._progress = {
+            entity_id: _SegmentTimeline(segments, recording.duration)
+            for entity_id, segments in recording.progress_segments_by_entity.items()
+            if segments
+        }
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Ids of all entities with motion segments."""
+        return list(self._motion)
+
+    def motion_segment_at(self, entity_id: str, time: float) -> MotionSegment | None:
+        """Return the motion segment of an entity visible at the given time."""
+        timeline = self._motion.get(entity_id)
+        if timeline is None:
+            return None
+        index = timeline.active_index(time)
+        return timeline.segments[index] if index is not None else None
+
+    def progress_segment_at(
+        self, entity_id: str, time: float
+    ) -> ProgressSegment | None:
+        """Return the progress segment of an entity active at the given time."""
+        timeline = self._progress.get(entity_id)
+        if timeline is None:
+            return None
+        index = timeline.active_index(time)
+        return timeline.segments[index] if index is not None else None
+
+    def progress_at(self, entity_id: str, time: float) -> ProgressState | None:
+        """Return the interpolated progress of an entity at the given time."""
+        timeline = self._progress.get(entity_id)
+        if timeline is None:
+            return None
+        index = timeline.active_index(time)
+        if index is None:
+            return None
+
+        segment = timeline.segments[index]
+        return ProgressState(
+            value=_lerp(
+                segment.start_value, segment.end_value, timeline.fraction(index, time)
+            ),
+            min_value=segment.min_value,
+            max_value=segment.max_value,
+        )
+
+    def entity_state(
+        self, entity_id: str, time: float, world: bool = True
+    ) -> EntityState | None:
+        """
+        Return the interpolated state of an entity at the given time.
+
+        Args:
+            entity_id: Entity to look up
+            time: Simulation time
+            world: Resolve parent-relative coordinates to world coordinates
+
+        Returns:
+            The entity state, or None if the entity is not visible at that time
+        """
+        state = self._local_state(entity_id, time)
+        if state is None or not world:
+            return state
+        return self._to_world(state, time, {})
+
+    def snapshot(self, time: float, world: bool = True) -> dict[str, EntityState]:
+        """
+        Return the state of every entity visible at the given time.
+
+        Args:
+            time: Simulation time
+            world: Resolve parent-relative coordinates to world coordinates
+
+        Returns:
+            Dictionary mapping entity id to its state
+        """
+        local_states = {}
+        for entity_id in self._motion:
+            state = self._local_state(entity_id, time)
+            if state is not None:
+                local_states[entity_id] = state
+
+        if not world:
+            return local_states
+
+        resolved: dict[str, EntityState] = {}
+        for state in local_states.values():
+            self._to_world(state, time, resolved, local_states)
+        return resolved
+
+    def segments_in_window(
+        self, entity_id: str, start: float, end: float
+    ) -> list[MotionSegment]:
+        """Return the motion segments of an entity visible within [start, end]."""
+        timeline = self._motion.get(entity_id)
+        if timeline is None:
+            return []
+        return timeline.window(start, end)
+
+    def window(self, start: float, end: float) -> dict[str, list[MotionSegment]]:
+        """
+        Return the motion segments visible within [start, end], by entity.
+
+        Entities without a visible segment in the window are left out.
+        """
+        segments_by_entity = {}
+        for entity_id, timeline in self._motion.items():
+            segments = timeline.window(start, end)
+            if segments:
+                segments_by_entity[entity_id] = segments
+        return segments_by_entity
+
+    def _local_state(self, entity_id: str, time: float) -> EntityState | None:
+        timeline = self._motion.get(entity_id)
+        if timeline is None:
+            return None
+        index = timeline.active_index(time)
+        if index is None:
+            return None
+
+        segment = timeline.segments[index]
+        t = timeline.fraction(index, time)
+        return EntityState(
+            entity_id=entity_id,
+            entity_type=segment.entity_type,
+            name=segment.name,
+            parent_id=segment.parent_id,
+            x=_lerp(segment.start_x, segment.end_x, t),
+            y=_lerp(segment.start_y, segment.end_y, t),
+            angle=_lerp(segment.start_angle, segment.end_angle, t),
+            progress=self.progress_at(entity_id, time),
+        )
+
+    def _to_world(
+        self,
+        state: EntityState,
+        time: float,
+        resolved: dict[str, EntityState],
+        local_states: dict[str, EntityState] | None = None,
+    ) -> EntityState:
+        """Compose the state with its visible ancestors' transforms."""
+        cached = resolved.get(state.entity_id)
+        if cached is not None:
+            return cached
+
+        # Mark as in progress to break parent cycles
+        resolved[state.entity_id] = state
+
+        parent = None
+        if state.parent_id is not None and state.parent_id != state.entity_id:
+            if local_states is not None:
+                parent = local_states.get(state.parent_id)
+            else:
+                parent = self._local_state(state.parent_id, time)
+
+        world_state = state
+        if parent is not None:
+            parent = self._to_world(parent, time, resolved, local_states)
+            cos = math.cos(parent.angle)
+            sin = math.sin(parent.angle)
+            world_state = EntityState(
+                entity_id=state.entity_id,
+                entity_type=state.entity_type,
+                name=state.name,
+                parent_id=state.parent_id,
+                x=parent.x + state.x * cos - state.y * sin,
+                y=parent.y + state.x * sin + state.y * cos,
+                angle=parent.angle + state.angle,
+                progress=state.progress,
+            )
+
+        resolved[state.entity_id] = world_state
+        return world_state
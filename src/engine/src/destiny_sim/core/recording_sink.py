@@ -0,0 +1,146 @@
+"""
+Recording sinks that receive recording chunks while the simulation runs.
+
+A RecordingEnvironment created with a sink keeps at most one chunk of segments
+and metric points in memory. Whenever the chunk is full it is handed over to
+the sink and released.
+
+StreamingRecordingWriter appends chunks to a file:
+
+    magic "DSTS", u16 version, u16 reserved (0)
+    then per chunk: f64 start_time, u32 first entity handle, u64 byte length,
+    chunk bytes
+
+Each chunk is stored in the binary recording format (see
+destiny_sim.core.timeline.encode_recording) with duration set to the chunk's
+end time and the entity table holding only entities first seen in the chunk.
+"""
+
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from destiny_sim.core.timeline import (
+    NormalizedSimulationRecording,
+    RecordingChunk,
+    decode_recording,
+    encode_recording,
+    merge_chunks,
+)
+
+RECORDING_STREAM_MAGIC = b"DSTS"
+RECORDING_STREAM_VERSION = 1
+
+_STREAM_HEADER = struct.Struct("<4sHH")
+_CHUNK_HEADER = struct.Struct("<dIQ")
+
+
+class RecordingSink(ABC):
+    """
+    Destination for recording chunks produced during a simulation run.
+
+    Subclasses implement write_chunk() and read_recording(); close() is an
+    optional hook for sinks that hold resources such as open files.
+    """
+
+    @abstractmethod
+    def write_chunk(self, chunk: RecordingChunk) -> None:
+        """Persist a chunk. Chunks arrive in the order they were recorded."""
+        pass
+
+    @abstractmethod
+    def read_recording(self) -> NormalizedSimulationRecording:
+        """Return everything written so far as a single recording."""
+        pass
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources held by the sink."""
+
+
+class StreamingRecordingWriter(RecordingSink):
+    """
+    Sink that appends chunks to a recording stream file.
+
+    The file is truncated when the writer is created. Use
+    read_recording_stream() to read it back.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: Path to the stream file (parent directories are created)
+        """
+        self.path = Path(file_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO | None = open(self.path, "wb")
+        self._file.write(
+            _STREAM_HEADER.pack(RECORDING_STREAM_MAGIC, RECORDING_STREAM_VERSION, 0)
+        )
+        self._file.flush()
+
+    def write_chunk(self, chunk: RecordingChunk) -> None:
+        if self._file is None:
+            raise ValueError(f"Recording stream {self.path} is closed")
+
+        data = encode_recording(
+            NormalizedSimulationRecording(
+                duration=chunk.end_time,
+                entities=chunk.entities,
+                motion_segments=chunk.motion_segments,
+                progress_segments=chunk.progress_segments,
+                metrics=chunk.metrics,
+            )
+        )
+        first_handle = chunk.entities[0].handle if chunk.entities else 0
+        self._file.write(
+            _CHUNK_HEADER.pack(chunk.start_time, first_handle, len(data))
+        )
+        self._file.write(data)
+        self._file.flush()
+
+    def read_recording(self) -> NormalizedSimulationRecording:
+        return merge_chunks(read_recording_stream(self.path))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_recording_stream(file_path: str | Path) -> Iterator[RecordingChunk]:
+    """
+    Read the chunks of a recording stream file one by one.
+
+    Raises:
+        ValueError: If the file is not a recording stream or has an
+            unsupported version
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(_STREAM_HEADER.size)
+        if len(header) < _STREAM_HEADER.size:
+            raise ValueError(f"{file_path} is not a recording stream")
+        magic, version, _ = _STREAM_HEADER.unpack(header)
+        if magic != RECORDING_STREAM_MAGIC:
+            raise ValueError(f"{file_path} is not a recording stream")
+        if version != RECORDING_STREAM_VERSION:
+            raise ValueError(
+                f"Unsupported recording stream version {version}, "
+                f"expected {RECORDING_STREAM_VERSION}"
+            )
+
+        while chunk_header := f.read(_CHUNK_HEADER.size):
+            start_time, first_handle, size = _CHUNK_HEADER.unpack(chunk_header)
+            part = decode_recording(f.read(size))
+            # Descriptors of a chunk continue the handles of previous chunks
+            yield RecordingChunk(
+                start_time=start_time,
+                end_time=part.duration,
+                entities=[
+                    entity.model_copy(update={"handle": entity.handle + first_handle})
+                    for entity in part.entities
+                ],
+                motion_segments=part.motion_segments,
+                progress_segments=part.progress_segments,
+                metrics=part.metrics,
+            )
@@ -0,0 +1,223 @@
+"""
+Fixed-bucket rollups of step-valued metrics (counters and gauges).
+
+Instead of one point per update, a rollup keeps one row per sim-time bucket
+that received updates: the last, min and max level, the mean of the updates
+and the time-weighted mean level. Memory grows with the number of buckets,
+not with the number of updates.
+
+The level of the metric is held between updates, so a bucket's min/max and
+time-weighted mean include the level carried over from the previous bucket.
+Buckets without updates have no row; their level is the last value of the
+previous row. Coarser resolutions are computed from the rows on export.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# Initial number of rows per rollup; the arrays double when full
+_INITIAL_CAPACITY = 16
+
+
+@dataclass(frozen=True)
+class RollupConfig:
+    """
+    Rollup mode of a MetricsContainer.
+
+    Args:
+        bucket_size: Length of the finest bucket in simulation time
+        resolutions: Exported bucket sizes, as multiples of bucket_size
+    """
+
+    bucket_size: float
+    resolutions: tuple[int, ...] = (1,)
+
+    def __post_init__(self) -> None:
+        if self.bucket_size <= 0:
+            raise ValueError(f"bucket_size must be positive, got {self.bucket_size}")
+        if not self.resolutions or any(
+            not isinstance(factor, int) or factor < 1 for factor in self.resolutions
+        ):
+            raise ValueError(
+                "resolutions must be positive integer multiples, "
+                f"got {self.resolutions}"
+            )
+
+
+@dataclass
+class RollupColumns:
+    """Exported rollup at one resolution. Row i describes bucket start_time[i]."""
+
+    bucket_size: float
+    start_time: list[float]
+    last: list[float]
+    min: list[float]
+    max: list[float]
+    mean: list[float]
+    time_weighted_mean: list[float | None]
+
+
+class BucketRollup:
+    """Aggregates updates of a step-valued metric into fixed sim-time buckets."""
+
+    _COLUMNS = ("last", "min", "max", "sum", "integral", "covered")
+
+    def __init__(self, bucket_size: float) -> None:
+        self.bucket_size = bucket_size
+        self._size = 0
+        self._capacity = _INITIAL_CAPACITY
+        self._bucket = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._count = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        for column in self._COLUMNS:
+            setattr(self, f"_{column}", np.empty(_INITIAL_CAPACITY, dtype=np.float64))
+        # Number of updates added so far
+        self.updates = 0
+        self.last_time = 0.0
+        self._last_value = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        for column in ("bucket", "count") + self._COLUMNS:
+            old = getattr(self, f"_{column}")
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, f"_{column}", new)
+        self._capacity = capacity
+
+    def add(self, time: float, value: float) -> None:
+        """Add an update of the metric's level at the given time."""
+        bucket = math.floor(time / self.bucket_size)
+        row = self._size - 1
+
+        if row >= 0 and self._bucket[row] == bucket:
+            held = time - self.last_time
+            self._integral[row] += self._last_value * held
+            self._covered[row] += held
+        else:
+            if row >= 0:
+                # Close the previous bucket with the level held until its end
+                end = (self._bucket[row] + 1) * self.bucket_size
+                held = end - self.last_time
+                self._integral[row] += self._last_value * held
+                self._covered[row] += held
+
+            if self._size == self._capacity:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._bucket[row] = bucket
+            self._count[row] = 0
+            self._sum[row] = 0.0
+            if row == 0:
+                # The level is unknown before the first update
+                self._integral[row] = 0.0
+                self._covered[row] = 0.0
+                self._min[row] = value
+                self._max[row] = value
+            else:
+                carried = time - bucket * self.bucket_size
+                self._integral[row] = self._last_value * carried
+                self._covered[row] = carried
+                self._min[row] = self._last_value
+                self._max[row] = self._last_value
+
+        self._count[row] += 1
+        self._sum[row] += value
+        self._last[row] = value
+        if value < self._min[row]:
+            self._min[row] = value
+        if value > self._max[row]:
+            self._max[row] = value
+        self.updates += 1
+        self.last_time = time
+        self._last_value = value
+
+    def export(self, factor: int, end_time: float) -> RollupColumns:
+        """
+        Export the rollup with buckets of factor * bucket_size.
+
+        Args:
+            factor: Number of finest buckets per exported bucket
+            end_time: Time until which the last level is held (export time)
+        """
+        bucket_size = self.bucket_size * factor
+        columns = RollupColumns(
+            bucket_size=bucket_size,
+            start_time=[],
+            last=[],
+            min=[],
+            max=[],
+            mean=[],
+            time_weighted_mean=[],
+        )
+        size = self._size
+        if not size:
+            return columns
+
+        finest = self.bucket_size
+        buckets = self._bucket[:size].tolist()
+        counts = self._count[:size].tolist()
+        lasts = self._last[:size].tolist()
+        mins = self._min[:size].tolist()
+        maxs = self._max[:size].tolist()
+        sums = self._sum[:size].tolist()
+        integrals = self._integral[:size].tolist()
+        covered = self._covered[:size].tolist()
+        # The open last row holds its level until the export time
+        held = max(min(end_time, (buckets[-1] + 1) * finest) - self.last_time, 0.0)
+        integrals[-1] += self._last_value * held
+        covered[-1] += held
+
+        row = 0
+        while row < size:
+            group = buckets[row] // factor
+            group_start = group * bucket_size
+            group_end = group_start + bucket_size
+            count = 0
+            total = 0.0
+            low = math.inf
+            high = -math.inf
+            integral = 0.0
+            duration = 0.0
+            if row > 0:
+                # Level carried into the group before its first update
+                head = buckets[row] * finest - group_start
+                integral += lasts[row - 1] * head
+                duration += head
+
+            first = row
+            while row < size and buckets[row] // factor == group:
+                if row > first:
+                    # Finest buckets without updates inside the group
+                    gap = (buckets[row] - buckets[row - 1] - 1) * finest
+                    integral += lasts[row - 1] * gap
+                    duration += gap
+                count += counts[row]
+                total += sums[row]
+                low = min(low, mins[row])
+                high = max(high, maxs[row])
+                integral += integrals[row]
+                duration += covered[row]
+                row += 1
+
+            # Level held after the group's last update until the group ends
+            last_end = (buckets[row - 1] + 1) * finest
+            tail = max(min(group_end, end_time) - last_end, 0.0)
+            integral += lasts[row - 1] * tail
+            duration += tail
+
+            columns.start_time.append(group_start)
+            columns.last.append(lasts[row - 1])
+            columns.min.append(low)
+            columns.max.append(high)
+            columns.mean.append(total / count)
+            columns.time_weighted_mean.append(
+                integral / duration if duration > 0 else None
+            )
+
+        return columns
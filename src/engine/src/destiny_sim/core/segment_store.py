@@ -0,0 +1,426 @@
+"""
+Columnar storage for recorded motion and progress segments.
+
+Recording a segment only appends plain numbers to typed arrays (one array per
+segment field). Entities are described once in an entity table and each
+segment references its entity (and parent) by a compact integer handle.
+Pydantic segment models are materialized only when a recording or query
+actually needs them.
+"""
+
+import math
+from array import array
+from typing import TYPE_CHECKING
+
+from destiny_sim.core.rendering import SimulationEntityType
+from destiny_sim.core.timeline import (
+    EntityDescriptor,
+    MotionSegment,
+    MotionSegmentTable,
+    ProgressSegment,
+    ProgressSegmentTable,
+)
+
+if TYPE_CHECKING:
+    from destiny_sim.core.simulation_entity import SimulationEntity
+
+NO_HANDLE = -1
+
+
+def _to_optional_time(value: float) -> float | None:
+    """Convert a stored time back to its optional form (NaN means None)."""
+    return None if math.isnan(value) else value
+
+
+def _to_optional_times(values: array) -> list[float | None]:
+    return [None if math.isnan(value) else value for value in values]
+
+
+def _close(a: float, b: float) -> bool:
+    """Compare recorded floats, allowing for rounding in computed times."""
+    return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+
+
+class EntityTable:
+    """
+    Per-recording table of entity descriptors keyed by compact integer handles.
+
+    Handles are assigned in order of first appearance and are stable for the
+    lifetime of the table. Type and name are captured from the entity's
+    rendering info once, when the entity is registered.
+    """
+
+    def __init__(self) -> None:
+        self._handles: dict[str, int] = {}
+        self.ids: list[str] = []
+        self.types: list[SimulationEntityType] = []
+        self.names: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def register(self, entity: "SimulationEntity") -> int:
+        """Return the handle for an entity, registering it if needed."""
+        handle = self._handles.get(entity.id)
+        if handle is None:
+            rendering_info = entity.get_rendering_info()
+            handle = self.add(
+                entity.id, rendering_info.entity_type, rendering_info.name
+            )
+        return handle
+
+    def add(
+        self,
+        entity_id: str,
+        entity_type: SimulationEntityType = SimulationEntityType.EMPTY,
+        name: str | None = None,
+    ) -> int:
+        """Add a descriptor for an entity id that is not in the table yet."""
+        handle = len(self.ids)
+        self._handles[entity_id] = handle
+        self.ids.append(entity_id)
+        self.types.append(entity_type)
+        self.names.append(name)
+        return handle
+
+    def get(self, entity_id: str) -> int | None:
+        """Return the handle for an entity id, or None if it is unknown."""
+        return self._handles.get(entity_id)
+
+    def descriptors(self, start: int = 0) -> list[EntityDescriptor]:
+        """
+        Return the table as a list of EntityDescriptor models.
+
+        Args:
+            start: First handle to include (earlier entities are skipped)
+        """
+        return [
+            EntityDescriptor(
+                handle=handle,
+                entity_id=self.ids[handle],
+                entity_type=self.types[handle],
+                name=self.names[handle],
+            )
+            for handle in range(start, len(self.ids))
+        ]
+
+
+class MotionSegmentStore:
+    """
+    Columnar store of motion segments.
+
+    Each field of MotionSegment is kept in its own typed array; row i of every
+    array describes the i-th recorded segment. Rows of each entity are
+    additionally indexed so that per-entity queries do not scan the whole store.
+
+    With coalesce enabled, segments are merged into the entity's previous
+    segment on append whenever playback stays the same:
+    - a segment starting at the same time as the previous one replaces it
+      (a new record invalidates the previous one)
+    - a motion continuing the previous one without a gap, from its end
+      position and with the same velocity, extends it
+    - a stay repeating the previous stay at the same place extends it
+    """
+
+    def __init__(self, entities: EntityTable, coalesce: bool = False) -> None:
+        self.entities = entities
+        self.coalesce = coalesce
+        self.entity = array("i")
+        self.parent = array("i")
+        self.start_time = array("d")
+        self.end_time = array("d")
+        self.start_x = array("d")
+        self.start_y = array("d")
+        self.end_x = array("d")
+        self.end_y = array("d")
+        self.start_angle = array("d")
+        self.end_angle = array("d")
+        self._rows_by_entity: dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.entity)
+
+    def clear(self) -> None:
+        """Release all stored segments. The entity table is kept."""
+        self.__init__(self.entities, self.coalesce)
+
+    def append(
+        self,
+        handle: int,
+        parent: int,
+        start_time: float,
+        end_time: float | None,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        start_angle: float,
+        end_angle: float,
+    ) -> None:
+        """
+        Append a single segment to the store.
+
+        handle and parent are entity handles from the shared entity table
+        (parent is NO_HANDLE for world coordinates).
+        """
+        if self.coalesce and self._coalesce(
+            handle,
+            parent,
+            start_time,
+            end_time,
+            start_x,
+            start_y,
+            end_x,
+            end_y,
+            start_angle,
+            end_angle,
+        ):
+            return
+
+        rows = self._rows_by_entity.get(handle)
+        if rows is None:
+            rows = self._rows_by_entity[handle] = array("I")
+        rows.append(len(self.entity))
+
+        self.entity.append(handle)
+        self.parent.append(parent)
+        self.start_time.append(start_time)
+        self.end_time.append(math.nan if end_time is None else end_time)
+        self.start_x.append(start_x)
+        self.start_y.append(start_y)
+        self.end_x.append(end_x)
+        self.end_y.append(end_y)
+        self.start_angle.append(start_angle)
+        self.end_angle.append(end_angle)
+
+    def _coalesce(
+        self,
+        handle: int,
+        parent: int,
+        start_time: float,
+        end_time: float | None,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        start_angle: float,
+        end_angle: float,
+    ) -> bool:
+        """Merge a new segment into the entity's last one. Returns True if merged."""
+        rows = self._rows_by_entity.get(handle)
+        if not rows:
+            return False
+        row = rows[-1]
+
+        # The last segment is never visible if the new one starts at the same
+        # time. Only the most recent row of the store can be dropped cheaply.
+        if start_time == self.start_time[row] and row == len(self.entity) - 1:
+            self._pop_last_row()
+            rows = self._rows_by_entity.get(handle)
+            if not rows:
+                return False
+            row = rows[-1]
+
+        if self.parent[row] != parent:
+            return False
+
+        last_end_time = self.end_time[row]
+        if math.isnan(last_end_time):
+            # Repeated infinite stay at the same place
+            return (
+                end_time is None
+                and start_x == end_x == self.start_x[row] == self.end_x[row]
+                and start_y == end_y == self.start_y[row] == self.end_y[row]
+                and start_angle == end_angle
+                == self.start_angle[row] == self.end_angle[row]
+            )
+
+        if end_time is None or not _close(start_time, last_end_time):
+            return False
+        last_duration = last_end_time - self.start_time[row]
+        duration = end_time - start_time
+        if last_duration <= 0 or duration <= 0:
+            # Zero-length segments hide the entity and are never merged
+            return False
+
+        if not (
+            _close(start_x, self.end_x[row])
+            and _close(start_y, self.end_y[row])
+            and _close(start_angle, self.end_angle[row])
+            and _close(
+                (end_x - start_x) / duration,
+                (self.end_x[row] - self.start_x[row]) / last_duration,
+            )
+            and _close(
+                (end_y - start_y) / duration,
+                (self.end_y[row] - self.start_y[row]) / last_duration,
+            )
+            and _close(
+                (end_angle - start_angle) / duration,
+                (self.end_angle[row] - self.start_angle[row]) / last_duration,
+            )
+        ):
+            return False
+
+        self.end_time[row] = end_time
+        self.end_x[row] = end_x
+        self.end_y[row] = end_y
+        self.end_angle[row] = end_angle
+        return True
+
+    def _pop_last_row(self) -> None:
+        handle = self.entity.pop()
+        rows = self._rows_by_entity[handle]
+        rows.pop()
+        if not rows:
+            del self._rows_by_entity[handle]
+        for column in (
+            self.parent,
+            self.start_time,
+            self.end_time,
+            self.start_x,
+            self.start_y,
+            self.end_x,
+            self.end_y,
+            self.start_angle,
+            self.end_angle,
+        ):
+            column.pop()
+
+    def segment_at(self, row: int) -> MotionSegment:
+        """Materialize the segment stored in the given row."""
+        entities = self.entities
+        handle = self.entity[row]
+        parent = self.parent[row]
+        return MotionSegment(
+            entity_id=entities.ids[handle],
+            entity_type=entities.types[handle],
+            name=entities.names[handle],
+            parent_id=entities.ids[parent] if parent != NO_HANDLE else None,
+            start_time=self.start_time[row],
+            end_time=_to_optional_time(self.end_time[row]),
+            start_x=self.start_x[row],
+            start_y=self.start_y[row],
+            end_x=self.end_x[row],
+            end_y=self.end_y[row],
+            start_angle=self.start_angle[row],
+            end_angle=self.end_angle[row],
+        )
+
+    def segments_for(self, entity_id: str) -> list[MotionSegment]:
+        """Materialize all segments recorded for a single entity."""
+        handle = self.entities.get(entity_id)
+        if handle is None:
+            return []
+        return [self.segment_at(row) for row in self._rows_by_entity.get(handle, ())]
+
+    def segments_by_entity(self) -> dict[str, list[MotionSegment]]:
+        """Materialize all segments grouped by entity id."""
+        return {
+            self.entities.ids[handle]: [self.segment_at(row) for row in rows]
+            for handle, rows in self._rows_by_entity.items()
+        }
+
+    def to_table(self) -> MotionSegmentTable:
+        """Export the store as a columnar MotionSegmentTable."""
+        return MotionSegmentTable(
+            entity=self.entity.tolist(),
+            parent=self.parent.tolist(),
+            start_time=self.start_time.tolist(),
+            end_time=_to_optional_times(self.end_time),
+            start_x=self.start_x.tolist(),
+            start_y=self.start_y.tolist(),
+            end_x=self.end_x.tolist(),
+            end_y=self.end_y.tolist(),
+            start_angle=self.start_angle.tolist(),
+            end_angle=self.end_angle.tolist(),
+        )
+
+
+class ProgressSegmentStore:
+    """
+    Columnar store of progress segments.
+
+    Shares the entity table with the motion store so that handles are
+    consistent across both kinds of segments.
+    """
+
+    def __init__(self, entities: EntityTable) -> None:
+        self.entities = entities
+        self.entity = array("i")
+        self.start_time = array("d")
+        self.end_time = array("d")
+        self.start_value = array("d")
+        self.end_value = array("d")
+        self.min_value = array("d")
+        self.max_value = array("d")
+        self._rows_by_entity: dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.entity)
+
+    def clear(self) -> None:
+        """Release all stored segments. The entity table is kept."""
+        self.__init__(self.entities)
+
+    def append(
+        self,
+        handle: int,
+        start_time: float,
+        end_time: float | None,
+        start_value: float,
+        end_value: float,
+        min_value: float,
+        max_value: float,
+    ) -> None:
+        """Append a single segment to the store."""
+        rows = self._rows_by_entity.get(handle)
+        if rows is None:
+            rows = self._rows_by_entity[handle] = array("I")
+        rows.append(len(self.entity))
+
+        self.entity.append(handle)
+        self.start_time.append(start_time)
+        self.end_time.append(math.nan if end_time is None else end_time)
+        self.start_value.append(start_value)
+        self.end_value.append(end_value)
+        self.min_value.append(min_value)
+        self.max_value.append(max_value)
+
+    def segment_at(self, row: int) -> ProgressSegment:
+        """Materialize the segment stored in the given row."""
+        return ProgressSegment(
+            entity_id=self.entities.ids[self.entity[row]],
+            start_time=self.start_time[row],
+            end_time=_to_optional_time(self.end_time[row]),
+            start_value=self.start_value[row],
+            end_value=self.end_value[row],
+            min_value=self.min_value[row],
+            max_value=self.max_value[row],
+        )
+
+    def segments_for(self, entity_id: str) -> list[ProgressSegment]:
+        """Materialize all segments recorded for a single entity."""
+        handle = self.entities.get(entity_id)
+        if handle is None:
+            return []
+        return [self.segment_at(row) for row in self._rows_by_entity.get(handle, ())]
+
+    def segments_by_entity(self) -> dict[str, list[ProgressSegment]]:
+        """Materialize all segments grouped by entity id."""
+        return {
+            self.entities.ids[handle]: [self.segment_at(row) for row in rows]
+            for handle, rows in self._rows_by_entity.items()
+        }
+
+    def to_table(self) -> ProgressSegmentTable:
+        """Export the store as a columnar ProgressSegmentTable."""
+        return ProgressSegmentTable(
+            entity=self.entity.tolist(),
+            start_time=self.start_time.tolist(),
+            end_time=_to_optional_times(self.end_time),
+            start_value=self.start_value.tolist(),
+            end_value=self.end_value.tolist(),
+            min_value=self.min_value.tolist(),
+            max_value=self.max_value.tolist(),
+        )
@@ -0,0 +1,138 @@
+"""
+Streaming statistics that summarize observations in constant memory.
+
+- RunningStatistics: count, mean and variance (Welford's algorithm), min, max
+- P2Quantile: approximate quantile estimate from five markers (the P-square
+  algorithm by Jain and Chlamtac)
+- SampleStatistics: both of the above for a set of quantiles
+"""
+
+import math
+
+
+class RunningStatistics:
+    """Count, mean, variance, min and max updated one observation at a time."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two observations)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """
+    Approximate quantile of a stream using the P-square algorithm.
+
+    Keeps five markers whose heights track the minimum, the p/2, p and (1+p)/2
+    quantiles and the maximum. Memory does not depend on the number of
+    observations. Until five observations are seen the exact quantile is used.
+    """
+
+    def __init__(self, p: float) -> None:
+        if not 0 < p < 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self._heights: list[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Find the cell of the new observation and update the extreme markers
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        # Adjust the heights of the middle markers
+        for i in range(1, 4):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    @property
+    def value(self) -> float | None:
+        """Current estimate, or None before the first observation."""
+        heights = self._heights
+        if not heights:
+            return None
+        if len(heights) < 5:
+            # Exact quantile with linear interpolation
+            rank = self.p * (len(heights) - 1)
+            lower = math.floor(rank)
+            upper = min(lower + 1, len(heights) - 1)
+            return heights[lower] + (heights[upper] - heights[lower]) * (rank - lower)
+        return heights[2]
+
+
+class SampleStatistics:
+    """Running statistics and quantile estimates of a sample metric."""
+
+    def __init__(self, quantiles: tuple[float, ...] = ()) -> None:
+        self.running = RunningStatistics()
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, value: float) -> None:
+        self.running.add(value)
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    @property
+    def count(self) -> int:
+        return self.running.count
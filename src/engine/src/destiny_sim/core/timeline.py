@@ -6,13 +6,43 @@ where an entity is (or moves to) during a time interval, and optionally
 its parent for hierarchical rendering.
 
 To record segments use env helper methods.
+
+A recording is available in two equivalent shapes:
+- SimulationRecording: denormalized, every segment repeats its entity's
+  id, type and name (the original JSON format)
+- NormalizedSimulationRecording: an entity table plus columnar segment
+  tables that reference entities by integer handle
+
+Both shapes can be exported as JSON. For large recordings there is also a
+versioned binary format (see encode_recording() / decode_recording()).
 """
 
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Iterable
+
 from pydantic import BaseModel, ConfigDict, Field
 
-from destiny_sim.core.metrics import MetricsSchema
+from destiny_sim.core.budget import TruncationReason
+from destiny_sim.core.metrics import (
+    Metric,
+    MetricsSchema,
+    MetricType,
+    StateMetricData,
+    TimeSeriesMetricData,
+)
+from destiny_sim.core.profiling import EventLoopProfile
 from destiny_sim.core.rendering import SimulationEntityType
 
+BINARY_RECORDING_MAGIC = b"DSTR"
+BINARY_RECORDING_VERSION = 1
+BINARY_RECORDING_MEDIA_TYPE = "application/vnd.destiny.recording"
+NORMALIZED_RECORDING_MEDIA_TYPE = "application/vnd.destiny.recording+json"
+BINARY_RECORDING_SUFFIX = ".dstr"
+
 
 class MotionSegment(BaseModel):
     """
@@ -63,6 +93,18 @@ class ProgressSegment(BaseModel):
     max_value: float
 
 
+class RunTruncation(BaseModel):
+    """
+    Marks a recording whose run was stopped early by a budget.
+
+    The recording covers the run up to sim_time instead of until.
+    """
+
+    reason: TruncationReason
+    sim_time: float
+    until: float
+
+
 class SimulationRecording(BaseModel):
     """
     Complete recording of a simulation run.
@@ -77,9 +119,562 @@ class SimulationRecording(BaseModel):
     - to stay indefinitely, use None for end time
     - to stop rendering of an entity use same start and end time
 
+    truncation is set if a run budget stopped the run before its end time,
+    profile if the run was profiled (see destiny_sim.core.profiling).
     """
 
     duration: float
     motion_segments_by_entity: dict[str, list[MotionSegment]] = {}
     progress_segments_by_entity: dict[str, list[ProgressSegment]] = {}
     metrics: MetricsSchema = MetricsSchema()
+    truncation: RunTruncation | None = None
+    profile: EventLoopProfile | None = None
+
+    def normalize(self) -> "NormalizedSimulationRecording":
+        """Convert into the normalized form with a per-recording entity table."""
+        entities: list[EntityDescriptor] = []
+        handles: dict[str, int] = {}
+
+        def handle_for(
+            entity_id: str,
+            entity_type: SimulationEntityType = SimulationEntityType.EMPTY,
+            name: str | None = None,
+        ) -> int:
+            handle = handles.get(entity_id)
+            if handle is None:
+                handle = handles[entity_id] = len(entities)
+                entities.append(
+                    EntityDescriptor(
+                        handle=handle,
+                        entity_id=entity_id,
+                        entity_type=entity_type,
+                        name=name,
+                    )
+                )
+            return handle
+
+        # Register every recorded entity before resolving parents, so that
+        # descriptors carry the entity's own type and name.
+        for entity_id, segments in self.motion_segments_by_entity.items():
+            if segments:
+                handle_for(entity_id, segments[0].entity_type, segments[0].name)
+
+        motion = MotionSegmentTable()
+        for entity_id, segments in self.motion_segments_by_entity.items():
+            for segment in segments:
+                motion.entity.append(handle_for(entity_id))
+                motion.parent.append(
+                    handle_for(segment.parent_id) if segment.parent_id else -1
+                )
+                motion.start_time.append(segment.start_time)
+                motion.end_time.append(segment.end_time)
+                motion.start_x.append(segment.start_x)
+                motion.start_y.append(segment.start_y)
+                motion.end_x.append(segment.end_x)
+                motion.end_y.append(segment.end_y)
+                motion.start_angle.append(segment.start_angle)
+                motion.end_angle.append(segment.end_angle)
+
+        progress = ProgressSegmentTable()
+        for entity_id, segments in self.progress_segments_by_entity.items():
+            for segment in segments:
+                progress.entity.append(handle_for(entity_id))
+                progress.start_time.append(segment.start_time)
+                progress.end_time.append(segment.end_time)
+                progress.start_value.append(segment.start_value)
+                progress.end_value.append(segment.end_value)
+                progress.min_value.append(segment.min_value)
+                progress.max_value.append(segment.max_value)
+
+        return NormalizedSimulationRecording(
+            duration=self.duration,
+            entities=entities,
+            motion_segments=motion,
+            progress_segments=progress,
+            metrics=self.metrics,
+            truncation=self.truncation,
+            profile=self.profile,
+        )
+
+
+class EntityDescriptor(BaseModel):
+    """
+    Describes an entity once per recording.
+
+    Segments in a normalized recording reference entities by handle, which is
+    the index of the descriptor in the entity table.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    handle: int
+    entity_id: str = Field(alias="entityId")
+    entity_type: SimulationEntityType = Field(
+        default=SimulationEntityType.EMPTY, alias="entityType"
+    )
+    name: str | None = None
+
+
+class MotionSegmentTable(BaseModel):
+    """
+    Columnar motion segments. Row i of every column describes one segment.
+
+    entity and parent hold entity handles (parent is -1 when there is none).
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    entity: list[int] = []
+    parent: list[int] = []
+    start_time: list[float] = Field(default=[], alias="startTime")
+    end_time: list[float | None] = Field(default=[], alias="endTime")
+    start_x: list[float] = Field(default=[], alias="startX")
+    start_y: list[float] = Field(default=[], alias="startY")
+    end_x: list[float] = Field(default=[], alias="endX")
+    end_y: list[float] = Field(default=[], alias="endY")
+    start_angle: list[float] = Field(default=[], alias="startAngle")
+    end_angle: list[float] = Field(default=[], alias="endAngle")
+
+
+class ProgressSegmentTable(BaseModel):
+    """
+    Columnar progress segments. Row i of every column describes one segment.
+    """
+
+    entity: list[int] = []
+    start_time: list[float] = []
+    end_time: list[float | None] = []
+    start_value: list[float] = []
+    end_value: list[float] = []
+    min_value: list[float] = []
+    max_value: list[float] = []
+
+
+class NormalizedSimulationRecording(BaseModel):
+    """
+    Normalized form of SimulationRecording.
+
+    Entity id, type and name are stored once in the entity table and
+    segments reference them by handle. Segment order within an entity is
+    the same as in the denormalized recording.
+    """
+
+    duration: float
+    entities: list[EntityDescriptor] = []
+    motion_segments: MotionSegmentTable = MotionSegmentTable()
+    progress_segments: ProgressSegmentTable = ProgressSegmentTable()
+    metrics: MetricsSchema = MetricsSchema()
+    truncation: RunTruncation | None = None
+    profile: EventLoopProfile | None = None
+
+    def to_recording(self) -> "SimulationRecording":
+        """Expand into the denormalized SimulationRecording."""
+        entities = self.entities
+        motion = self.motion_segments
+        motion_by_entity: dict[str, list[MotionSegment]] = {}
+        for row, handle in enumerate(motion.entity):
+            descriptor = entities[handle]
+            parent = motion.parent[row]
+            motion_by_entity.setdefault(descriptor.entity_id, []).append(
+                MotionSegment(
+                    entity_id=descriptor.entity_id,
+                    entity_type=descriptor.entity_type,
+                    name=descriptor.name,
+                    parent_id=entities[parent].entity_id if parent >= 0 else None,
+                    start_time=motion.start_time[row],
+                    end_time=motion.end_time[row],
+                    start_x=motion.start_x[row],
+                    start_y=motion.start_y[row],
+                    end_x=motion.end_x[row],
+                    end_y=motion.end_y[row],
+                    start_angle=motion.start_angle[row],
+                    end_angle=motion.end_angle[row],
+                )
+            )
+
+        progress = self.progress_segments
+        progress_by_entity: dict[str, list[ProgressSegment]] = {}
+        for row, handle in enumerate(progress.entity):
+            entity_id = entities[handle].entity_id
+            progress_by_entity.setdefault(entity_id, []).append(
+                ProgressSegment(
+                    entity_id=entity_id,
+                    start_time=progress.start_time[row],
+                    end_time=progress.end_time[row],
+                    start_value=progress.start_value[row],
+                    end_value=progress.end_value[row],
+                    min_value=progress.min_value[row],
+                    max_value=progress.max_value[row],
+                )
+            )
+
+        return SimulationRecording(
+            duration=self.duration,
+            motion_segments_by_entity=motion_by_entity,
+            progress_segments_by_entity=progress_by_entity,
+            metrics=self.metrics,
+            truncation=self.truncation,
+            profile=self.profile,
+        )
+
+
+class RecordingChunk(BaseModel):
+    """
+    Part of a recording produced while the simulation runs.
+
+    Contains everything recorded while the simulation time advanced from
+    start_time to end_time: descriptors of entities first seen in this
+    chunk (handles are global to the recording), segments, and metric points.
+    Merge consecutive chunks with merge_chunks().
+    """
+
+    start_time: float
+    end_time: float
+    entities: list[EntityDescriptor] = []
+    motion_segments: MotionSegmentTable = MotionSegmentTable()
+    progress_segments: ProgressSegmentTable = ProgressSegmentTable()
+    metrics: MetricsSchema = MetricsSchema()
+
+
+def merge_chunks(chunks: Iterable[RecordingChunk]) -> NormalizedSimulationRecording:
+    """
+    Merge consecutive recording chunks into a single normalized recording.
+
+    Chunks must be given in the order they were produced.
+    """
+    merged = NormalizedSimulationRecording(duration=0.0)
+    motion = merged.motion_segments
+    progress = merged.progress_segments
+
+    for chunk in chunks:
+        merged.duration = max(merged.duration, chunk.end_time)
+        merged.entities.extend(chunk.entities)
+        for name in MotionSegmentTable.model_fields:
+            getattr(motion, name).extend(getattr(chunk.motion_segments, name))
+        for name in ProgressSegmentTable.model_fields:
+            getattr(progress, name).extend(getattr(chunk.progress_segments, name))
+        merged.metrics.merge(chunk.metrics)
+
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Binary recording format
+#
+# All numbers are little-endian. Layout (version 1):
+#
+#   magic "DSTR", u16 version, u16 reserved (0)
+#   f64 duration
+#   string table:   u32 count, then per string u32 byte length + UTF-8 bytes
+#   entity table:   u32 count, u32[count] id, u32[count] type, i32[count] name
+#   motion table:   u32 rows, i32[rows] entity, i32[rows] parent,
+#                   f64[rows] x 8 (start_time, end_time, start_x, start_y,
+#                   end_x, end_y, start_angle, end_angle)
+#   progress table: u32 rows, i32[rows] entity,
+#                   f64[rows] x 6 (start_time, end_time, start_value,
+#                   end_value, min_value, max_value)
+#   metrics:        u32 count, then per metric
+#                   u8 type, u32 name, u32 label count, u32[2 * labels],
+#                   u32 points, f64[points] timestamp, then
+#                   f64[points] value (counter/gauge/sample) or
+#                   u32 possible states, u32[...] states, u32[points] codes
+#                   (state), then u32 byte length + JSON of any other fields
+#   extras:         u32 byte length + JSON of the recording's other fields
+#                   (truncation, profile); may be absent
+#
+# Strings (entity ids, types, names, metric names, labels and states) are
+# stored once in the string table and referenced by index; -1 means None.
+# Missing end times are stored as NaN.
+# ---------------------------------------------------------------------------
+
+_METRIC_TYPE_CODES = {metric_type: code for code, metric_type in enumerate(MetricType)}
+_METRIC_TYPES_BY_CODE = list(MetricType)
+_METRIC_BASE_FIELDS = {"name", "type", "labels", "data"}
+
+
+class _BinaryWriter:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._string_codes: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def string(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def pack(self, fmt: str, *values) -> None:
+        self._buffer += struct.pack("<" + fmt, *values)
+
+    def column(self, typecode: str, values) -> None:
+        packed = array(typecode, values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        self._buffer += packed.tobytes()
+
+    def blob(self, data: bytes) -> None:
+        self.pack("I", len(data))
+        self._buffer += data
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+
+class _BinaryReader:
+    def __init__(self, data: bytes) -> None:
+        self._data = memoryview(data)
+        self._offset = 0
+        self.strings: list[str] = []
+
+    def unpack(self, fmt: str) -> tuple:
+        fmt = "<" + fmt
+        values = struct.unpack_from(fmt, self._data, self._offset)
+        self._offset += struct.calcsize(fmt)
+        return values
+
+    def column(self, typecode: str, count: int) -> array:
+        values = array(typecode)
+        size = values.itemsize * count
+        values.frombytes(self._data[self._offset : self._offset + size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        self._offset += size
+        return values
+
+    def blob(self) -> bytes:
+        (size,) = self.unpack("I")
+        data = bytes(self._data[self._offset : self._offset + size])
+        self._offset += size
+        return data
+
+    def string(self, code: int) -> str | None:
+        return None if code < 0 else self.strings[code]
+
+    def at_end(self) -> bool:
+        return self._offset >= len(self._data)
+
+
+def _optional_times(values: list[float | None]):
+    return (math.nan if value is None else value for value in values)
+
+
+def _times_from_column(values: array) -> list[float | None]:
+    return [None if math.isnan(value) else value for value in values]
+
+
+def encode_recording(
+    recording: "SimulationRecording | NormalizedSimulationRecording",
+) -> bytes:
+    """
+    Encode a recording into the compact binary format.
+
+    Args:
+        recording: Recording in either shape (denormalized recordings are
+            normalized first)
+
+    Returns:
+        Encoded bytes, starting with BINARY_RECORDING_MAGIC
+    """
+    if isinstance(recording, SimulationRecording):
+        recording = recording.normalize()
+
+    # The string table must precede the sections referencing it, so the
+    # sections are written to a separate body first.
+    body = _BinaryWriter()
+    entities = recording.entities
+    body.pack("I", len(entities))
+    body.column("I", [body.string(e.entity_id) for e in entities])
+    body.column("I", [body.string(e.entity_type.value) for e in entities])
+    body.column("i", [body.string(e.name) for e in entities])
+
+    motion = recording.motion_segments
+    body.pack("I", len(motion.entity))
+    body.column("i", motion.entity)
+    body.column("i", motion.parent)
+    body.column("d", motion.start_time)
+    body.column("d", _optional_times(motion.end_time))
+    for column in (
+        motion.start_x,
+        motion.start_y,
+        motion.end_x,
+        motion.end_y,
+        motion.start_angle,
+        motion.end_angle,
+    ):
+        body.column("d", column)
+
+    progress = recording.progress_segments
+    body.pack("I", len(progress.entity))
+    body.column("i", progress.entity)
+    body.column("d", progress.start_time)
+    body.column("d", _optional_times(progress.end_time))
+    for column in (
+        progress.start_value,
+        progress.end_value,
+        progress.min_value,
+        progress.max_value,
+    ):
+        body.column("d", column)
+
+    metrics = [
+        metric
+        for group in (
+            recording.metrics.counter,
+            recording.metrics.gauge,
+            recording.metrics.sample,
+            recording.metrics.state,
+        )
+        for metric in group
+    ]
+    body.pack("I", len(metrics))
+    for metric in metrics:
+        body.pack("BI", _METRIC_TYPE_CODES[metric.type], body.string(metric.name))
+        body.pack("I", len(metric.labels))
+        body.column(
+            "I",
+            [body.string(item) for pair in metric.labels.items() for item in pair],
+        )
+        data = metric.data
+        body.pack("I", len(data.timestamp))
+        body.column("d", data.timestamp)
+        if isinstance(data, StateMetricData):
+            body.pack("I", len(data.possible_states))
+            body.column("I", [body.string(state) for state in data.possible_states])
+            body.column("I", [body.string(state) for state in data.state])
+        else:
+            body.column("d", data.value)
+        extras = metric.model_dump(mode="json", exclude=_METRIC_BASE_FIELDS)
+        body.blob(json.dumps(extras, separators=(",", ":")).encode())
+
+    extras = recording.model_dump(
+        mode="json", include={"truncation", "profile"}, exclude_none=True
+    )
+    if extras:
+        body.blob(json.dumps(extras, separators=(",", ":")).encode())
+
+    header = _BinaryWriter()
+    header.pack("4sHH", BINARY_RECORDING_MAGIC, BINARY_RECORDING_VERSION, 0)
+    header.pack("d", recording.duration)
+    header.pack("I", len(body.strings))
+    for value in body.strings:
+        header.blob(value.encode())
+
+    return header.getvalue() + body.getvalue()
+
+
+def decode_recording(data: bytes) -> NormalizedSimulationRecording:
+    """
+    Decode a recording produced by encode_recording().
+
+    Call to_recording() on the result to get the denormalized form.
+
+    Raises:
+        ValueError: If data is not a binary recording or has an
+            unsupported version
+    """
+    reader = _BinaryReader(data)
+    magic, version, _ = reader.unpack("4sHH")
+    if magic != BINARY_RECORDING_MAGIC:
+        raise ValueError("Data is not a binary simulation recording")
+    if version != BINARY_RECORDING_VERSION:
+        raise ValueError(
+            f"Unsupported binary recording version {version}, "
+            f"expected {BINARY_RECORDING_VERSION}"
+        )
+
+    (duration,) = reader.unpack("d")
+    (string_count,) = reader.unpack("I")
+    reader.strings = [reader.blob().decode() for _ in range(string_count)]
+
+    (entity_count,) = reader.unpack("I")
+    ids = reader.column("I", entity_count)
+    types = reader.column("I", entity_count)
+    names = reader.column("i", entity_count)
+    entities = [
+        EntityDescriptor(
+            handle=handle,
+            entity_id=reader.string(ids[handle]),
+            entity_type=SimulationEntityType(reader.string(types[handle])),
+            name=reader.string(names[handle]),
+        )
+        for handle in range(entity_count)
+    ]
+
+    (rows,) = reader.unpack("I")
+    motion = MotionSegmentTable(
+        entity=reader.column("i", rows).tolist(),
+        parent=reader.column("i", rows).tolist(),
+        start_time=reader.column("d", rows).tolist(),
+        end_time=_times_from_column(reader.column("d", rows)),
+        start_x=reader.column("d", rows).tolist(),
+        start_y=reader.column("d", rows).tolist(),
+        end_x=reader.column("d", rows).tolist(),
+        end_y=reader.column("d", rows).tolist(),
+        start_angle=reader.column("d", rows).tolist(),
+        end_angle=reader.column("d", rows).tolist(),
+    )
+
+    (rows,) = reader.unpack("I")
+    progress = ProgressSegmentTable(
+        entity=reader.column("i", rows).tolist(),
+        start_time=reader.column("d", rows).tolist(),
+        end_time=_times_from_column(reader.column("d", rows)),
+        start_value=reader.column("d", rows).tolist(),
+        end_value=reader.column("d", rows).tolist(),
+        min_value=reader.column("d", rows).tolist(),
+        max_value=reader.column("d", rows).tolist(),
+    )
+
+    metrics = MetricsSchema()
+    (metric_count,) = reader.unpack("I")
+    for _ in range(metric_count):
+        type_code, name = reader.unpack("BI")
+        metric_type = _METRIC_TYPES_BY_CODE[type_code]
+        (label_count,) = reader.unpack("I")
+        label_codes = reader.column("I", 2 * label_count)
+        labels = {
+            reader.string(label_codes[i]): reader.string(label_codes[i + 1])
+            for i in range(0, len(label_codes), 2)
+        }
+        (points,) = reader.unpack("I")
+        timestamp = reader.column("d", points).tolist()
+        if metric_type == MetricType.STATE:
+            (state_count,) = reader.unpack("I")
+            possible_states = [
+                reader.string(code) for code in reader.column("I", state_count)
+            ]
+            state = [reader.string(code) for code in reader.column("I", points)]
+            data = StateMetricData(
+                timestamp=timestamp, state=state, possible_states=possible_states
+            )
+            metric_class = Metric[StateMetricData]
+        else:
+            value = reader.column("d", points).tolist()
+            data = TimeSeriesMetricData(timestamp=timestamp, value=value)
+            metric_class = Metric[TimeSeriesMetricData]
+        extras = json.loads(reader.blob())
+        metric = metric_class.model_validate(
+            {
+                **extras,
+                "name": reader.string(name),
+                "type": metric_type,
+                "labels": labels,
+                "data": data,
+            }
+        )
+        getattr(metrics, metric_type.value).append(metric)
+
+    extras = {} if reader.at_end() else json.loads(reader.blob())
+
+    return NormalizedSimulationRecording(
+        **extras,
+        duration=duration,
+        entities=entities,
+        motion_segments=motion,
+        progress_segments=progress,
+        metrics=metrics,
+    )
@@ -0,0 +1,221 @@
+"""
+Execution traces of a simulation run in Chrome Trace Event format.
+
+ExecutionTracer is an EventLoopProfiler that, besides the aggregate report,
+keeps a timeline of the run that can be opened in Perfetto
+(https://ui.perfetto.dev) or chrome://tracing:
+- one track per process group (generator function and entity, as in the
+  profile), with a slice for every event that resumed one of its processes,
+  on the wall-clock axis; events that resumed no process are on the
+  "event loop" track
+- a "sim_time" counter track, so wall time can be compared to simulation
+  time (long slices at a flat sim_time are stalls)
+- instant markers for record_* and metric calls on the track of the process
+  that made them
+- an "event_queue" counter track with the event heap samples (and a
+  "memory_bytes" track with trace_memory)
+
+Like the profiler, the tracer only instruments an environment it is passed
+to; record_* methods and metric handles are wrapped per instance, so
+untraced environments run unchanged.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.metrics import MetricHandle, MetricType
+from destiny_sim.core.profiling import EventLoopProfiler, ProcessProfile
+
+# Trace process id of the simulation (one simulation per trace)
+TRACE_PID = 1
+# Track of events that resumed no process, and of calls made outside processes
+EVENT_LOOP_TID = 0
+
+# Recording methods marked in the trace; record_progress_value() calls
+# record_progress() and is marked by it
+_TRACED_RECORDING_METHODS = (
+    "record_motion",
+    "record_motion_nowait",
+    "record_stay",
+    "record_stay_nowait",
+    "record_progress",
+    "record_disappearance",
+)
+
+
+class ExecutionTracer(EventLoopProfiler):
+    """
+    Records a Chrome Trace Event timeline of a RecordingEnvironment.
+
+    Pass it as RecordingEnvironment(profiler=...) or
+    run_blueprint(..., profiler=...), then call save() or trace_events().
+    The trace grows with every processed event, so trace short runs or set a
+    budget.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Same arguments as EventLoopProfiler."""
+        super().__init__(*args, **kwargs)
+        self._events: list[dict[str, Any]] = []
+        self._tids: dict[int, int] = {}
+        self._env: RecordingEnvironment | None = None
+        self._last_sim_time: float | None = None
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """Return the trace events, preceded by the track names."""
+        metadata = [
+            _metadata("process_name", {"name": "simulation"}),
+            _metadata("thread_name", {"name": "event loop"}, EVENT_LOOP_TID),
+        ]
+        entity_names = {
+            entity_id: entity.get_rendering_info().name
+            for entity_id, entity in self._entities.items()
+        }
+        for profile in self._profiles.values():
+            tid = self._tids.get(id(profile))
+            if tid is None:
+                continue
+            name = profile.name
+            entity_name = entity_names.get(profile.entity_id)
+            if entity_name is not None:
+                name = f"{name} ({entity_name})"
+            metadata.append(_metadata("thread_name", {"name": name}, tid))
+            metadata.append(_metadata("thread_sort_index", {"sort_index": tid}, tid))
+        return metadata + self._events
+
+    def save(self, file_path: str) -> None:
+        """Write the trace as Chrome Trace Event JSON."""
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+    def _attach(self, env: RecordingEnvironment) -> None:
+        super()._attach(env)
+        self._env = env
+        for name in _TRACED_RECORDING_METHODS:
+            setattr(env, name, self._traced_recording(name, getattr(env, name)))
+        container = env._metrics_container
+        container.on_register = self._trace_handle
+        for handle in container.handles():
+            self._trace_handle(handle)
+
+    def _traced_recording(
+        self, name: str, method: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            self._instant(name, "recording")
+            return method(*args, **kwargs)
+
+        return traced
+
+    def _trace_handle(self, handle: MetricHandle) -> None:
+        """Mark every value recorded through the handle."""
+        # Samples are observed through _observe(), the others through _record()
+        attribute = "_observe" if handle.metric_type == MetricType.SAMPLE else "_record"
+        method = getattr(handle, attribute)
+        name = handle.name
+
+        def traced(time: float, value: Any) -> None:
+            self._instant(name, "metric", {"value": float(value)})
+            method(time, value)
+
+        setattr(handle, attribute, traced)
+
+    def _timestamp(self, clock_time: float) -> float:
+        """Trace timestamp (microseconds since the start) of a clock time."""
+        return (clock_time - self._started_at) * 1e6
+
+    def _tid(self, profile: ProcessProfile) -> int:
+        tid = self._tids.get(id(profile))
+        if tid is None:
+            tid = self._tids[id(profile)] = len(self._tids) + 1
+        return tid
+
+    def _instant(
+        self, name: str, category: str, args: dict[str, Any] | None = None
+    ) -> None:
+        if self._started_at is None:
+            self._start()
+        env = self._env
+        tid = EVENT_LOOP_TID
+        profile = None
+        if env._active_proc is not None:
+            profile = self._process_profiles.get(env._active_proc)
+        if profile is not None:
+            tid = self._tid(profile)
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "i",
+                "s": "t",
+                "ts": self._timestamp(self.clock()),
+                "pid": TRACE_PID,
+                "tid": tid,
+                "args": {"sim_time": env.now, **(args or {})},
+            }
+        )
+
+    def _processed(
+        self,
+        profiles: list[ProcessProfile],
+        started: float,
+        finished: float,
+        sim_time: float,
+    ) -> None:
+        super()._processed(profiles, started, finished, sim_time)
+        events = self._events
+        ts = self._timestamp(started)
+        if sim_time != self._last_sim_time:
+            self._last_sim_time = sim_time
+            events.append(_counter("sim_time", ts, sim_time))
+        duration = (finished - started) * 1e6
+        args = {"sim_time": sim_time}
+        if not profiles:
+            events.append(_slice("event", "event", ts, duration, EVENT_LOOP_TID, args))
+            return
+        # Callbacks run one after another; split the time evenly
+        share = duration / len(profiles)
+        for profile in profiles:
+            events.append(
+                _slice(profile.name, "process", ts, share, self._tid(profile), args)
+            )
+            ts += share
+
+    def _sample_heap(self, sim_time: float) -> None:
+        samples = len(self.heap)
+        super()._sample_heap(sim_time)
+        if len(self.heap) > samples:
+            sample = self.heap[-1]
+            ts = sample.wall_time * 1e6
+            self._events.append(_counter("event_queue", ts, sample.queue_length))
+            if sample.memory_bytes is not None:
+                self._events.append(_counter("memory_bytes", ts, sample.memory_bytes))
+
+
+def _slice(
+    name: str, category: str, ts: float, duration: float, tid: int, args: dict[str, Any]
+) -> dict[str, Any]:
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": ts,
+        "dur": duration,
+        "pid": TRACE_PID,
+        "tid": tid,
+        "args": args,
+    }
+
+
+def _counter(name: str, ts: float, value: float) -> dict[str, Any]:
+    return {"name": name, "ph": "C", "ts": ts, "pid": TRACE_PID, "args": {name: value}}
+
+
+def _metadata(
+    name: str, args: dict[str, Any], tid: int = EVENT_LOOP_TID
+) -> dict[str, Any]:
+    return {"name": name, "ph": "M", "pid": TRACE_PID, "tid": tid, "args": args}
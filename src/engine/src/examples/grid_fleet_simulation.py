@@ -49,9 +49,9 @@ def main():
 
     # Initialize Fleet Manager
     task_provider = TaskProvider(
-        sources=sources, sinks=sinks, expected_task_interval=15.0
+        sources=sources, sinks=sinks, name="task_provider", expected_task_interval=15.0
     )
-    fleet_manager = FleetManager(task_provider, grid)
+    fleet_manager = FleetManager(task_provider, grid, name="fleet_manager")
 
     # Add 3 AGVs in the middle
     agv_start_coords = [(4, 10), (5, 10), (6, 10)]
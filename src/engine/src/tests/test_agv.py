@@ -8,6 +8,7 @@ from destiny_sim.agv.location import Location
 from destiny_sim.agv.planning import TripPlan, Waypoint, WaypointType
 from destiny_sim.agv.store_location import StoreLocation
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.recording_index import RecordingIndex
 
 
 @pytest.fixture
@@ -121,3 +122,47 @@ def test_agv_availability(env):
 
     env.run(until=15)
     assert agv.is_available() is True
+
+
+def test_agv_coalesced_straight_run_plays_back_the_same():
+    def run(coalesce_segments):
+        env = RecordingEnvironment(coalesce_segments=coalesce_segments)
+        agv = AGV(env, start_location=Location(0, 0), speed=10.0)
+        source = StoreLocation(env, x=0, y=0, initial_items=[Box()])
+        sink = StoreLocation(env, x=100, y=0)
+        plan = TripPlan(
+            [Waypoint(source, WaypointType.SOURCE)]
+            + [Waypoint(Location(x, 0), WaypointType.PASS) for x in range(10, 100, 10)]
+            + [Waypoint(sink, WaypointType.SINK)]
+        )
+        agv.schedule_plan(env, plan)
+        env.run(until=20)
+        return agv, env.get_recording()
+
+    _, plain = run(False)
+    agv, coalesced = run(True)
+
+    plain_count = sum(len(s) for s in plain.motion_segments_by_entity.values())
+    coalesced_count = sum(len(s) for s in coalesced.motion_segments_by_entity.values())
+    assert coalesced_count < plain_count
+    moving = [
+        s for s in coalesced.motion_segments_by_entity[agv.id] if s.start_x != s.end_x
+    ]
+    assert len(moving) == 1
+
+    plain_index = RecordingIndex(plain)
+    coalesced_index = RecordingIndex(coalesced)
+    for step in range(0, 201):
+        time = step / 10
+        plain_states = sorted(
+            (s.entity_type, s.x, s.y, s.angle)
+            for s in plain_index.snapshot(time).values()
+        )
+        coalesced_states = sorted(
+            (s.entity_type, s.x, s.y, s.angle)
+            for s in coalesced_index.snapshot(time).values()
+        )
+        assert [s[0] for s in coalesced_states] == [s[0] for s in plain_states]
+        assert [s[1:] for s in coalesced_states] == [
+            pytest.approx(s[1:]) for s in plain_states
+        ]
@@ -0,0 +1,119 @@
+"""Tests for run budgets and truncated recordings."""
+
+import pytest
+
+from destiny_sim.core.budget import RunBudget, TruncationReason
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.timeline import decode_recording, encode_recording
+
+
+class DummyEntity(SimulationEntity):
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name="dummy")
+
+
+def _moving(env: RecordingEnvironment, entity: DummyEntity):
+    while True:
+        yield env.record_motion(
+            entity, start_x=0, start_y=0, end_x=1, end_y=0, duration=1
+        )
+        env.incr_counter("moves")
+
+
+def _busy(env: RecordingEnvironment):
+    # Many events per unit of simulation time
+    while True:
+        yield env.timeout(1e-9)
+
+
+def test_run_without_exhausting_budget_reaches_until():
+    env = RecordingEnvironment(budget=RunBudget(max_events=1000))
+    env.process(_moving(env, DummyEntity()))
+    env.run(until=10)
+
+    assert env.now == 10
+    assert env.truncation is None
+    assert env.get_recording().truncation is None
+
+
+def test_event_budget_truncates_recording():
+    env = RecordingEnvironment(budget=RunBudget(max_events=10))
+    env.process(_moving(env, DummyEntity()))
+    env.run(until=100)
+
+    recording = env.get_recording()
+    assert recording.truncation.reason == TruncationReason.EVENTS
+    assert recording.truncation.sim_time == env.now == recording.duration
+    assert recording.truncation.until == 100
+    assert env.now < 100
+
+    # The budget is spent: further runs do not advance
+    env.run(until=200)
+    assert recording.truncation.sim_time == env.now
+
+
+def test_segment_budget_truncates_recording():
+    env = RecordingEnvironment(budget=RunBudget(max_segments=5))
+    env.process(_moving(env, DummyEntity()))
+    env.run(until=100)
+
+    assert env.truncation.reason == TruncationReason.SEGMENTS
+    assert env.segment_count == 5
+    assert len(env.get_normalized_recording().motion_segments.entity) == 5
+
+
+def test_wall_time_budget_stops_endless_run():
+    env = RecordingEnvironment(budget=RunBudget(max_wall_seconds=0.05))
+    env.process(_busy(env))
+    env.run(until=1)
+
+    assert env.truncation.reason == TruncationReason.WALL_TIME
+    assert 0 < env.now < 1
+
+
+def test_truncation_survives_binary_round_trip():
+    env = RecordingEnvironment(budget=RunBudget(max_events=3))
+    env.process(_moving(env, DummyEntity()))
+    env.run(until=100)
+
+    recording = env.get_recording()
+    decoded = decode_recording(encode_recording(recording))
+    assert decoded.truncation == recording.truncation
+    assert decoded.to_recording() == recording
+
+
+def test_run_budget_rejects_non_positive_limits():
+    with pytest.raises(ValueError):
+        RunBudget(max_events=0)
+    with pytest.raises(ValueError):
+        RunBudget(max_wall_seconds=-1)
+
+
+def test_budget_applies_when_running_until_an_event():
+    env = RecordingEnvironment(budget=RunBudget(max_events=10))
+    process = env.process(_moving(env, DummyEntity()))
+
+    assert env.run(until=process) is None
+    assert env.truncation.reason == TruncationReason.EVENTS
+    assert process.is_alive
+
+    def finite(env: RecordingEnvironment):
+        yield env.timeout(3)
+        return "done"
+
+    env = RecordingEnvironment(budget=RunBudget(max_events=10))
+    assert env.run(until=env.process(finite(env))) == "done"
+    assert env.now == 3
+    assert env.truncation is None
+
+
+def test_budgeted_run_rejects_until_in_the_past():
+    env = RecordingEnvironment(budget=RunBudget(max_events=10))
+    env.run(until=5)
+
+    with pytest.raises(ValueError):
+        env.run(until=5)
+    with pytest.raises(ValueError):
+        env.run(until=1)
@@ -2,12 +2,16 @@
 
 import pytest
 
+from destiny_sim.builder.cache import RecordingCache
 from destiny_sim.builder.entities.human import Human
 from destiny_sim.builder.entity import BuilderEntity
 from destiny_sim.builder.runner import (
+    DEFAULT_METRICS_ONLY_DURATION,
     get_registered_entities,
+    iter_blueprint,
     register_entity,
     run_blueprint,
+    run_replications,
 )
 from destiny_sim.builder.schema import (
     Blueprint,
@@ -15,9 +19,13 @@ from destiny_sim.builder.schema import (
     BlueprintEntityParameter,
     BlueprintParameterType,
     SimParams,
+    SteadyStateParams,
 )
+from destiny_sim.core.budget import RunBudget, TruncationReason
 from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.profiling import EventLoopProfiler
 from destiny_sim.core.rendering import SimulationEntityType
+from destiny_sim.core.timeline import merge_chunks
 
 
 def _primitive(name: str, value: float | int | str | bool) -> BlueprintEntityParameter:
@@ -478,3 +486,220 @@ def test_entity_reference_multiple_levels():
     
     recording = run_blueprint(blueprint)
     assert recording is not None
+
+
+def test_run_blueprint_metrics_only(register_human):
+    """Metrics-only runs skip segments and default to a longer horizon."""
+    blueprint = Blueprint(
+        simParams=SimParams(initialTime=0),
+        entities=[
+            BlueprintEntity(
+                entityType=SimulationEntityType.HUMAN,
+                name="person-1",
+                parameters={
+                    "x": _primitive("x", 100.0),
+                    "y": _primitive("y", 100.0),
+                    "targetX": _primitive("targetX", 200.0),
+                    "targetY": _primitive("targetY", 200.0),
+                },
+            ),
+        ],
+    )
+
+    recording = run_blueprint(blueprint, metrics_only=True)
+
+    assert recording.motion_segments_by_entity == {}
+    assert recording.progress_segments_by_entity == {}
+    assert recording.duration == DEFAULT_METRICS_ONLY_DURATION
+
+
+def _production_line_blueprint(duration: float) -> Blueprint:
+    """Source -> manufacturing cell (random duration) -> sink."""
+    return Blueprint(
+        simParams=SimParams(duration=duration),
+        entities=[
+            BlueprintEntity(
+                entityType=SimulationEntityType.SOURCE,
+                name="source",
+                parameters={"x": _primitive("x", 0.0), "y": _primitive("y", 0.0)},
+            ),
+            BlueprintEntity(
+                entityType=SimulationEntityType.SINK,
+                name="sink",
+                parameters={"x": _primitive("x", 100.0), "y": _primitive("y", 0.0)},
+            ),
+            BlueprintEntity(
+                entityType=SimulationEntityType.MANUFACTURING_CELL,
+                name="cell",
+                parameters={
+                    "x": _primitive("x", 50.0),
+                    "y": _primitive("y", 0.0),
+                    "input": _entity("input", "source"),
+                    "output": _entity("output", "sink"),
+                    "mean": _primitive("mean", 2.0),
+                    "std_dev": _primitive("std_dev", 1.0),
+                },
+            ),
+        ],
+    )
+
+
+def test_run_replications_aggregates_kpis():
+    """Test that replications are reproducible per seed and aggregated with CIs."""
+    blueprint = _production_line_blueprint(duration=200)
+
+    pooled = run_replications(blueprint, n=4, workers=2)
+    serial = run_replications(blueprint, seeds=[0, 1, 2, 3], workers=1)
+
+    assert [r.seed for r in pooled.replications] == [0, 1, 2, 3]
+    serial_kpis = [r.kpis for r in serial.replications]
+    assert [r.kpis for r in pooled.replications] == serial_kpis
+    assert all(r.recording is None for r in pooled.replications)
+
+    delivered_key = "Items delivered to sink sink{entity=sink,entity_type=sink}"
+    delivered = pooled.kpis[delivered_key]
+    values = [r.kpis[delivered_key] for r in pooled.replications]
+    assert delivered.n == 4
+    assert delivered.mean == pytest.approx(sum(values) / 4)
+    assert delivered.lower <= delivered.mean <= delivered.upper
+    assert delivered.std > 0
+    # Time-weighted fraction of time per cell state
+    processing_key = (
+        "Manufacturing Cell State "
+        "cell{entity=cell,entity_type=manufacturing_cell}[Processing]"
+    )
+    assert pooled.kpis[processing_key].mean > 0.9
+
+
+def test_run_blueprint_is_reproducible_with_seed():
+    blueprint = _production_line_blueprint(duration=100)
+    blueprint.simParams.seed = 7
+
+    first = run_blueprint(blueprint, metrics_only=True)
+    second = run_blueprint(blueprint, metrics_only=True)
+    assert first.metrics == second.metrics
+
+    blueprint.simParams.seed = 8
+    assert run_blueprint(blueprint, metrics_only=True).metrics != first.metrics
+
+
+def test_run_replications_keeps_recordings():
+    summary = run_replications(
+        _production_line_blueprint(duration=20), n=2, workers=1, keep_recordings=True
+    )
+
+    assert all(r.recording is not None for r in summary.replications)
+    assert summary.replications[0].recording.motion_segments_by_entity
+
+    with pytest.raises(ValueError):
+        run_replications(_production_line_blueprint(duration=20), n=3, seeds=[1, 2])
+
+
+def test_iter_blueprint_yields_chunks_of_the_full_run():
+    blueprint = _production_line_blueprint(duration=100)
+    blueprint.simParams.seed = 3
+
+    chunks = list(iter_blueprint(blueprint, step=25))
+    assert [chunk.end_time for chunk in chunks] == [25, 50, 75, 100]
+
+    merged = merge_chunks(chunks).to_recording()
+    expected = run_blueprint(blueprint)
+    assert merged.metrics == expected.metrics
+
+    def segments(recording):
+        # Entity ids differ between runs
+        return [
+            segment.model_dump(exclude={"entity_id", "parent_id"})
+            for entity_segments in recording.motion_segments_by_entity.values()
+            for segment in entity_segments
+        ]
+
+    assert segments(merged) == segments(expected)
+
+
+def test_run_blueprint_drops_metrics_before_warmup():
+    blueprint = _production_line_blueprint(duration=200)
+    blueprint.simParams.seed = 5
+    full = run_blueprint(blueprint, metrics_only=True)
+    blueprint.simParams.warmupTime = 50
+    warmed_up = run_blueprint(blueprint, metrics_only=True)
+
+    for metric in warmed_up.metrics.counter + warmed_up.metrics.state:
+        assert metric.data.timestamp[0] == 50
+    for metric in warmed_up.metrics.state:
+        assert metric.summary.start_time == 50
+    def delivered(recording):
+        [count] = [
+            m.data.value[-1]
+            for m in recording.metrics.counter
+            if m.name == "Items delivered to sink sink"
+        ]
+        return count
+
+    full_count, warm_count = delivered(full), delivered(warmed_up)
+    assert 0 < warm_count < full_count
+
+    blueprint.simParams.warmupTime = 200
+    with pytest.raises(ValueError):
+        run_blueprint(blueprint, metrics_only=True)
+
+
+def test_run_blueprint_stops_at_steady_state():
+    blueprint = _production_line_blueprint(duration=100_000)
+    blueprint.simParams.seed = 1
+    blueprint.simParams.steadyState = SteadyStateParams(interval=20)
+
+    recording = run_blueprint(blueprint, metrics_only=True)
+
+    assert recording.duration < 100_000
+    # Metrics restart where the warm-up was detected
+    [state] = recording.metrics.state
+    assert 0 < state.summary.start_time < recording.duration
+
+
+def test_run_blueprint_returns_partial_recording_within_budget():
+    blueprint = _production_line_blueprint(duration=1000)
+    blueprint.simParams.seed = 2
+    cache = RecordingCache()
+
+    recording = run_blueprint(blueprint, cache=cache, budget=RunBudget(max_events=50))
+
+    assert recording.truncation.reason == TruncationReason.EVENTS
+    assert recording.duration == recording.truncation.sim_time < 1000
+    assert recording.motion_segments_by_entity
+    # Truncated runs are not cached
+    assert cache.get(cache.key(blueprint)) is None
+    assert run_blueprint(blueprint, cache=cache).truncation is None
+
+
+def test_run_blueprint_reports_profile_of_entities():
+    blueprint = _production_line_blueprint(duration=1000)
+    blueprint.simParams.seed = 2
+    cache = RecordingCache()
+    cache.put(cache.key(blueprint), run_blueprint(blueprint))
+
+    recording = run_blueprint(blueprint, cache=cache, profiler=EventLoopProfiler())
+
+    # Profiled runs bypass the cache
+    assert recording.profile is not None
+    hottest = recording.profile.entities[0]
+    assert (hottest.entity_type, hottest.name) == ("manufacturing_cell", "cell")
+    entity_names = {entity.name for entity in recording.profile.entities}
+    assert entity_names == {"source", "cell", "sink"}
+
+
+def test_compact_metrics_is_opt_in():
+    blueprint = _production_line_blueprint(duration=200)
+    blueprint.simParams.seed = 4
+    full = run_blueprint(blueprint)
+    blueprint.simParams.compactMetrics = True
+    compact = run_blueprint(blueprint)
+
+    def points(recording):
+        metrics = recording.metrics
+        return sum(
+            len(metric.data.timestamp)
+            for metric in metrics.counter + metrics.gauge + metrics.state
+        )
+
+    assert points(compact) < points(full)
@@ -0,0 +1,146 @@
+"""Tests for the blueprint result cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from destiny_sim.builder.cache import RecordingCache
+from destiny_sim.builder.runner import run_blueprint
+from destiny_sim.builder.schema import (
+    Blueprint,
+    BlueprintEntity,
+    BlueprintEntityParameter,
+    BlueprintParameterType,
+    CanvasSize,
+    SimParams,
+)
+from destiny_sim.core.rendering import SimulationEntityType
+
+
+def _blueprint(
+    seed: int | None = 1, duration: float = 50, canvas_size: CanvasSize | None = None
+) -> Blueprint:
+    def primitive(name, value):
+        return BlueprintEntityParameter(
+            name=name, parameterType=BlueprintParameterType.PRIMITIVE, value=value
+        )
+
+    def entity(name, value):
+        return BlueprintEntityParameter(
+            name=name, parameterType=BlueprintParameterType.ENTITY, value=value
+        )
+
+    return Blueprint(
+        simParams=SimParams(duration=duration, seed=seed, canvasSize=canvas_size),
+        entities=[
+            BlueprintEntity(
+                entityType=SimulationEntityType.SOURCE,
+                name="source",
+                parameters={"x": primitive("x", 0.0), "y": primitive("y", 0.0)},
+            ),
+            BlueprintEntity(
+                entityType=SimulationEntityType.SINK,
+                name="sink",
+                parameters={"x": primitive("x", 100.0), "y": primitive("y", 0.0)},
+            ),
+            BlueprintEntity(
+                entityType=SimulationEntityType.MANUFACTURING_CELL,
+                name="cell",
+                parameters={
+                    "x": primitive("x", 50.0),
+                    "y": primitive("y", 0.0),
+                    "input": entity("input", "source"),
+                    "output": entity("output", "sink"),
+                    "mean": primitive("mean", 2.0),
+                    "std_dev": primitive("std_dev", 1.0),
+                },
+            ),
+        ],
+    )
+
+
+def test_key_is_canonical_and_requires_seed():
+    blueprint = _blueprint()
+    assert RecordingCache.key(blueprint) == RecordingCache.key(_blueprint())
+    assert RecordingCache.key(blueprint) != RecordingCache.key(_blueprint(seed=2))
+    assert RecordingCache.key(blueprint) != RecordingCache.key(
+        blueprint, metrics_only=True
+    )
+    assert RecordingCache.key(_blueprint(seed=None)) is None
+
+
+def test_key_ignores_presentation_fields():
+    key = RecordingCache.key(_blueprint())
+    resized = _blueprint(canvas_size=CanvasSize(width=800, height=600))
+
+    assert RecordingCache.key(resized) == key
+    assert RecordingCache.key(_blueprint(duration=60)) != key
+
+
+def test_run_blueprint_returns_cached_recording(monkeypatch):
+    cache = RecordingCache()
+    blueprint = _blueprint()
+    recording = run_blueprint(blueprint, cache=cache)
+
+    def fail(*args):
+        raise AssertionError("simulation was run")
+
+    # A hit does not run the simulation again
+    monkeypatch.setattr("destiny_sim.builder.runner._instantiate_entities", fail)
+    cached = run_blueprint(blueprint, cache=cache)
+    assert cached.model_dump() == recording.model_dump()
+
+
+def test_disk_tier_survives_new_cache_instances(tmp_path):
+    blueprint = _blueprint()
+    recording = run_blueprint(blueprint, cache=RecordingCache(tmp_path))
+
+    cache = RecordingCache(tmp_path)
+    cached = cache.get(RecordingCache.key(blueprint))
+    assert cached.model_dump() == recording.model_dump()
+
+
+def test_tiers_evict_under_size_budget(tmp_path):
+    recordings = {}
+    for seed in range(3):
+        blueprint = _blueprint(seed=seed)
+        recordings[RecordingCache.key(blueprint)] = run_blueprint(blueprint)
+
+    first_key, *other_keys = recordings
+    probe = RecordingCache()
+    probe.put(first_key, recordings[first_key])
+    budget = int(probe._memory_bytes * 2.5)
+
+    cache = RecordingCache(tmp_path, max_memory_bytes=budget, max_disk_bytes=budget)
+    for key, recording in recordings.items():
+        cache.put(key, recording)
+
+    assert list(cache._memory) == other_keys
+    assert not (tmp_path / f"{first_key}.dstr").exists()
+    # The evicted entry is gone from both tiers
+    assert cache.get(first_key) is None
+    assert cache.get(other_keys[0]) is not None
+
+
+def test_concurrent_access_keeps_tiers_consistent(tmp_path):
+    recordings = {}
+    for seed in range(4):
+        blueprint = _blueprint(seed=seed, duration=20)
+        recordings[RecordingCache.key(blueprint)] = run_blueprint(blueprint)
+
+    probe = RecordingCache()
+    probe.put(*next(iter(recordings.items())))
+    budget = int(probe._memory_bytes * 2.5)
+    cache = RecordingCache(tmp_path, max_memory_bytes=budget, max_disk_bytes=budget)
+
+    def worker(index):
+        for key, recording in list(recordings.items())[index % 2 :]:
+            cache.put(key, recording)
+            cached = cache.get(key)
+            # Either evicted by another thread or complete
+            assert cached is None or cached.model_dump() == recording.model_dump()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(worker, range(32)))
+
+    assert cache._memory_bytes == sum(len(data) for data in cache._memory.values())
+    assert cache._memory_bytes <= budget
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,117 @@
+"""Tests for block-sampled distributions."""
+
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from destiny_sim.core.distributions import (
+    Empirical,
+    Exponential,
+    LogNormal,
+    Normal,
+    Triangular,
+    TruncatedNormal,
+    _standard_normal_inv_cdf,
+)
+
+
+def _samples(distribution, n=20_000):
+    return np.array([distribution.sample() for _ in range(n)])
+
+
+def test_lognormal_matches_mean_and_std_dev():
+    samples = _samples(LogNormal(np.random.default_rng(0), mean=2.0, std_dev=0.5))
+    assert samples.mean() == pytest.approx(2.0, rel=0.02)
+    assert samples.std() == pytest.approx(0.5, rel=0.05)
+
+
+def test_exponential_and_triangular_moments():
+    exponential = _samples(Exponential(np.random.default_rng(1), mean=3.0))
+    assert exponential.mean() == pytest.approx(3.0, rel=0.03)
+
+    triangular = _samples(
+        Triangular(np.random.default_rng(2), low=0.0, mode=1.0, high=5.0)
+    )
+    assert triangular.min() >= 0.0 and triangular.max() <= 5.0
+    assert triangular.mean() == pytest.approx(2.0, rel=0.02)
+
+
+def test_truncated_normal_respects_bounds():
+    samples = _samples(
+        TruncatedNormal(
+            np.random.default_rng(3), mean=0.0, std_dev=1.0, low=-0.5, high=2.0
+        )
+    )
+    assert samples.min() >= -0.5
+    assert samples.max() <= 2.0
+
+
+def test_truncated_normal_samples_far_tail_by_inverse_cdf():
+    samples = _samples(
+        TruncatedNormal(np.random.default_rng(6), mean=0.05, std_dev=0.01, low=0.1)
+    )
+    assert samples.min() >= 0.1
+    # Most of the mass of a tail beyond 5 std devs lies right at its bound
+    assert np.median(samples) < 0.102
+
+    lower_tail = _samples(
+        TruncatedNormal(np.random.default_rng(7), mean=0.0, std_dev=1.0, high=-4.0)
+    )
+    assert lower_tail.max() <= -4.0
+    assert lower_tail.mean() == pytest.approx(-4.22, abs=0.02)
+
+
+def test_vectorized_inverse_cdf_matches_normal_dist():
+    p = np.concatenate(
+        [
+            np.logspace(-300, -1, 500),
+            np.linspace(0.01, 0.99, 99),
+            1 - np.logspace(-15, -1, 50),
+        ]
+    )
+    expected = [NormalDist().inv_cdf(value) for value in p.tolist()]
+    assert _standard_normal_inv_cdf(p) == pytest.approx(expected, rel=1e-14, abs=1e-14)
+
+
+def test_normal_clamps_to_bounds():
+    samples = _samples(Normal(np.random.default_rng(8), mean=1.0, std_dev=1.0, low=0.1))
+    assert samples.min() == 0.1
+    assert (samples == 0.1).mean() == pytest.approx(0.18, abs=0.01)
+
+    constant = Normal(np.random.default_rng(9), mean=0.0, std_dev=0.0, low=0.1)
+    assert constant.sample() == 0.1
+
+
+def test_empirical_returns_given_values_with_weights():
+    values = ["a", "b", "c"]
+    distribution = Empirical(np.random.default_rng(4), values, weights=[0, 1, 3])
+    samples = [distribution.sample() for _ in range(8000)]
+    assert "a" not in samples
+    assert samples.count("c") / len(samples) == pytest.approx(0.75, abs=0.02)
+
+
+def test_blocks_refill_and_are_reproducible():
+    first = LogNormal(np.random.default_rng(5), mean=1.0, std_dev=0.2, block_size=7)
+    second = LogNormal(np.random.default_rng(5), mean=1.0, std_dev=0.2, block_size=7)
+    draws = [first.sample() for _ in range(20)]
+    assert draws == [second.sample() for _ in range(20)]
+    assert len(set(draws)) == 20
+    assert all(isinstance(draw, float) for draw in draws)
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda rng: LogNormal(rng, mean=0.0, std_dev=1.0),
+        lambda rng: Exponential(rng, mean=-1.0),
+        lambda rng: TruncatedNormal(rng, mean=0.0, std_dev=1.0, low=2.0, high=1.0),
+        lambda rng: TruncatedNormal(rng, mean=0.0, std_dev=1.0, low=100.0),
+        lambda rng: Normal(rng, mean=0.0, std_dev=-1.0),
+        lambda rng: Triangular(rng, low=1.0, mode=0.0, high=2.0),
+        lambda rng: Empirical(rng, []),
+    ],
+)
+def test_invalid_parameters_raise(factory):
+    with pytest.raises(ValueError):
+        factory(np.random.default_rng())
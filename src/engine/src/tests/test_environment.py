@@ -245,3 +245,120 @@ def test_record_stay_with_duration():
     # Should complete at time 3.0
     assert len(completion_times) == 1
     assert completion_times[0] == 3.0
+
+
+def test_get_motion_segments_for_entity():
+    """Test that segments of a single entity can be queried without the recording."""
+    env = RecordingEnvironment()
+    entity = DummyEntity()
+    other = DummyEntity()
+
+    env.record_stay(entity=entity, x=1.0, y=2.0)
+    env.record_stay(entity=other, x=3.0, y=4.0)
+    env.record_motion(entity=entity, duration=2.0, end_x=5.0)
+
+    segments = env.get_motion_segments(entity)
+    assert len(segments) == 2
+    assert all(seg.entity_id == entity.id for seg in segments)
+    assert segments[1].end_time == 2.0
+
+
+def test_rendering_info_requested_once_per_entity():
+    """Test that entity type and name are captured once, not per segment."""
+
+    class CountingEntity(DummyEntity):
+        calls = 0
+
+        def get_rendering_info(self) -> RenderingInfo:
+            CountingEntity.calls += 1
+            return super().get_rendering_info()
+
+    env = RecordingEnvironment()
+    entity = CountingEntity()
+
+    for i in range(5):
+        env.record_stay(entity=entity, start_time=float(i), x=float(i))
+
+    assert CountingEntity.calls == 1
+    assert len(env.get_motion_segments(entity)) == 5
+
+
+def test_normalized_recording():
+    """Test that the normalized recording references entities by handle."""
+    env = RecordingEnvironment()
+    parent = DummyEntity()
+    child = DummyEntity()
+
+    env.record_stay(entity=parent, x=10.0, y=20.0)
+    env.record_stay(entity=child, parent=parent, end_time=5.0)
+    env.record_progress(entity=child, duration=5.0)
+
+    normalized = env.get_normalized_recording()
+
+    assert [e.entity_id for e in normalized.entities] == [parent.id, child.id]
+    assert normalized.motion_segments.entity == [0, 1]
+    assert normalized.motion_segments.parent == [-1, 0]
+    assert normalized.motion_segments.end_time == [None, 5.0]
+    assert normalized.progress_segments.entity == [1]
+
+
+def test_normalized_recording_round_trip():
+    """Test that both recording shapes convert into each other losslessly."""
+    env = RecordingEnvironment()
+    parent = DummyEntity()
+    child = DummyEntity()
+
+    env.record_motion(entity=parent, duration=2.0, end_x=10.0)
+    env.record_stay(entity=child, parent=parent, x=1.0, y=1.0)
+    env.record_progress(entity=parent, duration=4.0)
+    env.run(until=3.0)
+
+    recording = env.get_recording()
+
+    assert env.get_normalized_recording().to_recording() == recording
+    assert recording.normalize().to_recording() == recording
+
+
+def test_nowait_recording_does_not_schedule_events():
+    """Test that non-waiting recording calls leave the event queue empty."""
+    env = RecordingEnvironment()
+    entity = DummyEntity()
+
+    env.record_stay_nowait(entity=entity, x=1.0, y=2.0)
+    env.record_motion_nowait(entity=entity, duration=5.0, end_x=10.0)
+    env.record_stay_nowait(entity=None)
+    env.record_disappearance(entity=entity, time=5.0)
+    env.record_progress(entity=entity, duration=5.0)
+
+    assert env.peek() == float("inf")
+
+    segments = env.get_motion_segments(entity)
+    assert len(segments) == 3
+    assert segments[1].end_time == 5.0
+    assert segments[2].start_time == segments[2].end_time == 5.0
+
+
+def test_metrics_only_mode_skips_segments():
+    """Test that metrics-only mode keeps timing and metrics but stores no segments."""
+    env = RecordingEnvironment(metrics_only=True)
+    entity = DummyEntity()
+    finished = []
+
+    def process(env):
+        yield env.record_motion(entity=entity, speed=2.0, end_x=6.0, end_y=8.0)
+        env.record_stay_nowait(entity=entity, x=6.0, y=8.0)
+        env.record_progress(entity=entity, duration=1.0)
+        env.incr_counter("moves")
+        yield env.record_stay(entity=entity, duration=2.0)
+        finished.append(env.now)
+
+    env.process(process(env))
+    env.run()
+
+    assert finished == [7.0]
+    assert env.get_motion_segments(entity) == []
+    assert env.get_progress_segments(entity) == []
+
+    recording = env.get_recording()
+    assert recording.motion_segments_by_entity == {}
+    assert recording.metrics.counter[0].data.value == [1]
@@ -17,7 +17,7 @@ class DeterministicTaskProvider(TaskProvider):
     """A test helper that returns specific tasks immediately."""
 
     def __init__(self, tasks: list[AGVTask]):
-        super().__init__([], [])
+        super().__init__([], [], name="deterministic_task_provider")
         self.tasks = tasks
         self.task_index = 0
 
@@ -52,7 +52,7 @@ def test_fleet_manager_full_integration():
     task = AGVTask(source=l2, sink=l3)
     task_provider = DeterministicTaskProvider([task])
 
-    fleet_manager = FleetManager(task_provider, graph)
+    fleet_manager = FleetManager(task_provider, graph, name="fleet_manager")
 
     agv = AGV(env, start_location=l1, speed=1.0)
     fleet_manager.add_agv(agv)
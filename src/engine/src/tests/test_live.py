@@ -0,0 +1,184 @@
+"""Tests for the real-time paced live runner."""
+
+import threading
+import time
+
+import pytest
+
+from destiny_sim.core.budget import RunBudget, TruncationReason
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.live import LiveRunner
+from destiny_sim.core.recording_sink import StreamingRecordingWriter
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.timeline import merge_chunks
+
+
+class DummyEntity(SimulationEntity):
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name="dummy")
+
+
+def _moving(env: RecordingEnvironment, entity: DummyEntity):
+    x = 0
+    while True:
+        yield env.record_motion(
+            entity, start_x=x, start_y=0, end_x=x + 1, end_y=0, duration=1
+        )
+        x += 1
+        env.incr_counter("moves")
+
+
+def _waiting(env: RecordingEnvironment, entity: DummyEntity, interval: float):
+    while True:
+        env.record_stay_nowait(entity, x=0, y=0, duration=interval)
+        yield env.timeout(interval)
+        env.incr_counter("wakeups")
+
+
+def _run_in_thread(runner: LiveRunner, until: float) -> threading.Thread:
+    thread = threading.Thread(target=runner.run, args=(until,))
+    thread.start()
+    return thread
+
+
+def test_live_chunks_merge_to_full_recording():
+    entity = DummyEntity()
+    expected_env = RecordingEnvironment()
+    expected_env.process(_moving(expected_env, entity))
+    expected_env.run(until=20)
+
+    env = RecordingEnvironment()
+    env.process(_moving(env, entity))
+    runner = LiveRunner(env, speed=200)
+    subscription = runner.subscribe()
+
+    started = time.monotonic()
+    thread = _run_in_thread(runner, until=20)
+    chunks = list(subscription)
+    thread.join()
+
+    # 20 time units at 200 per second are paced over at least 0.1 s
+    assert time.monotonic() - started >= 0.1
+    assert len(chunks) == 21
+    assert chunks[-1].end_time == 20
+    expected = expected_env.get_normalized_recording()
+    assert merge_chunks(chunks).model_dump() == expected.model_dump()
+
+
+def test_idle_periods_are_skipped():
+    env = RecordingEnvironment()
+    env.process(_waiting(env, DummyEntity(), interval=100))
+    runner = LiveRunner(env, speed=10)
+    subscription = runner.subscribe()
+
+    started = time.monotonic()
+    thread = _run_in_thread(runner, until=1000)
+    chunks = list(subscription)
+    thread.join()
+
+    # Waiting out the stays would take 100 s
+    assert time.monotonic() - started < 2
+    assert env.now == 1000
+    assert len(chunks) == 11
+
+
+def test_idle_periods_are_paced_without_skipping():
+    env = RecordingEnvironment()
+    env.process(_waiting(env, DummyEntity(), interval=1))
+    runner = LiveRunner(env, speed=20, skip_idle=False)
+
+    started = time.monotonic()
+    runner.run(until=4)
+
+    assert time.monotonic() - started >= 0.2
+
+
+def test_pause_resume_and_speed_change():
+    env = RecordingEnvironment()
+    env.process(_moving(env, DummyEntity()))
+    runner = LiveRunner(env, speed=10)
+    subscription = runner.subscribe()
+    thread = _run_in_thread(runner, until=100)
+
+    runner.pause()
+    time.sleep(0.2)
+    held_at = env.now
+    time.sleep(0.1)
+    assert runner.paused
+    assert env.now == held_at < 5
+    assert thread.is_alive()
+
+    runner.resume()
+    # 100 time units at 10 per second would take 10 s
+    runner.set_speed(1000)
+    assert runner.speed == 1000
+    chunks = list(subscription)
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert env.now == 100
+    assert merge_chunks(chunks).metrics.counter[0].data.value[-1] == 99
+
+
+def test_slow_subscriber_applies_backpressure():
+    env = RecordingEnvironment()
+    env.process(_moving(env, DummyEntity()))
+    runner = LiveRunner(env, speed=10_000)
+    subscription = runner.subscribe(max_pending=2)
+    thread = _run_in_thread(runner, until=50)
+
+    time.sleep(0.2)
+    # The runner waits for the subscriber instead of running ahead
+    assert thread.is_alive()
+    assert env.now < 5
+
+    chunks = list(subscription)
+    thread.join()
+    assert len(chunks) == 51
+
+
+def test_stop_ends_the_run_early():
+    env = RecordingEnvironment()
+    env.process(_moving(env, DummyEntity()))
+    runner = LiveRunner(env, speed=10)
+    subscription = runner.subscribe()
+    thread = _run_in_thread(runner, until=1000)
+
+    time.sleep(0.1)
+    runner.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert env.now < 1000
+    assert list(subscription)
+
+
+def test_live_run_stops_at_budget():
+    env = RecordingEnvironment(budget=RunBudget(max_events=10))
+    env.process(_moving(env, DummyEntity()))
+    runner = LiveRunner(env, speed=10_000)
+    subscription = runner.subscribe()
+    thread = _run_in_thread(runner, until=100)
+    chunks = list(subscription)
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert env.truncation.reason == TruncationReason.EVENTS
+    assert env.now == env.truncation.sim_time < 100
+    assert chunks[-1].end_time == env.now
+
+
+def test_live_runner_rejects_invalid_use(tmp_path):
+    env = RecordingEnvironment()
+    with pytest.raises(ValueError):
+        LiveRunner(env, speed=0)
+    with pytest.raises(ValueError):
+        LiveRunner(env).set_speed(-1)
+    with pytest.raises(ValueError):
+        LiveRunner(env).subscribe(max_pending=0)
+
+    writer = StreamingRecordingWriter(str(tmp_path / "run.dsts"))
+    with pytest.raises(ValueError):
+        LiveRunner(RecordingEnvironment(sink=writer))
+    writer.close()
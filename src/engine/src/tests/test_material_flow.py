@@ -10,6 +10,7 @@ from destiny_sim.builder.entities.material_flow.control import (
     Control,
 )
 from destiny_sim.builder.entities.material_flow.manufacturing_cell import (
+    MANUFACTURING_CELL_STATE_METRIC,
     ManufacturingCell,
 )
 from destiny_sim.builder.entities.material_flow.sink import (
@@ -197,6 +198,15 @@ def test_manufacturing_cell_processes_items():
     assert len(items_processed) == 3
     assert all(item[1] in ["item_1", "item_2", "item_3"] for item in items_processed)
 
+    # Per-entity metrics are labeled with the entity name and type
+    cell_metrics = env.query_metrics(labels={"entity": cell.name})
+    assert [m.name for m in cell_metrics.state] == [
+        f"{MANUFACTURING_CELL_STATE_METRIC} {cell.name}"
+    ]
+    buffer_metrics = env.query_metrics(labels={"entity_type": "buffer"})
+    buffer_names = {m.labels["entity"] for m in buffer_metrics.gauge}
+    assert buffer_names == {buffer_in.name, buffer_out.name}
+
 @pytest.mark.parametrize("nok_probability", [0.0, 1.0])
 def test_control_routes_items(nok_probability):
     """Test Control routes items to ok_output or nok_output based on probability."""
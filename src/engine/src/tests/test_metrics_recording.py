@@ -1,8 +1,11 @@
 
 from enum import StrEnum
 
+import pytest
+
 from destiny_sim.core.environment import RecordingEnvironment
 from destiny_sim.core.metrics import MetricType
+from destiny_sim.core.rollup import RollupConfig
 
 def test_counter_metric():
     env = RecordingEnvironment()
@@ -210,3 +213,321 @@ def test_state_metric_invalid_state():
         assert False, "Should have raised TypeError"
     except ValueError:
         pass  # Expected
+
+
+def test_metric_handles():
+    """Test recording through pre-resolved metric handles."""
+    class MachineState(StrEnum):
+        IDLE = "idle"
+        PROCESSING = "processing"
+
+    env = RecordingEnvironment()
+    served = env.counter_metric("served", {"type": "regular"})
+    queue = env.gauge_metric("queue_length")
+    wait = env.sample_metric("wait_time")
+    machine = env.state_metric("machine_state", MachineState)
+    unused = env.counter_metric("unused")
+
+    served.incr()
+    queue.set(2)
+    machine.set(MachineState.IDLE)
+    env.run(until=5.0)
+    served.incr(2)
+    queue.adjust(-1)
+    wait.record(4.5)
+    machine.set(MachineState.PROCESSING)
+
+    metrics = env.get_recording().metrics
+    assert unused.value == 0
+    assert [m.name for m in metrics.counter] == ["served"]
+    assert metrics.counter[0].labels == {"type": "regular"}
+    assert metrics.counter[0].data.timestamp == [0.0, 5.0]
+    assert metrics.counter[0].data.value == [1, 3]
+    assert metrics.gauge[0].data.value == [2, 1]
+    assert metrics.sample[0].data.value == [4.5]
+    assert metrics.state[0].data.state == ["idle", "processing"]
+
+
+def test_metric_handles_share_storage_with_string_methods():
+    """Test that handles and the string-based methods record into the same metric."""
+    env = RecordingEnvironment()
+    served = env.counter_metric("served", {"type": "regular"})
+
+    served.incr()
+    env.incr_counter("served", 1, {"type": "regular"})
+    served.incr()
+
+    metrics = env.get_recording().metrics
+    assert len(metrics.counter) == 1
+    assert metrics.counter[0].data.value == [1, 2, 3]
+    assert env.counter_metric("served", {"type": "regular"}) is served
+
+
+def test_metric_buffers_grow_and_store_state_codes():
+    """Test that points survive buffer growth and states are stored as codes."""
+    class MachineState(StrEnum):
+        IDLE = "idle"
+        PROCESSING = "processing"
+
+    env = RecordingEnvironment()
+    level = env.gauge_metric("buffer_level")
+    machine = env.state_metric("machine_state", MachineState)
+
+    for i in range(1000):
+        level.set(i)
+        machine.set(MachineState.PROCESSING if i % 2 else MachineState.IDLE)
+
+    assert len(level) == 1000
+    assert machine.values[:3].tolist() == [0, 1, 0]
+
+    metrics = env.get_recording().metrics
+    assert metrics.gauge[0].data.value == list(range(1000))
+    assert metrics.state[0].data.state[:3] == ["idle", "processing", "idle"]
+
+
+def test_sample_metric_summary_without_points():
+    """Test that a summarized sample metric exports statistics instead of raw points."""
+    env = RecordingEnvironment()
+    delivery = env.sample_metric(
+        "delivery_time", summary=True, keep_points=False, quantiles=(0.5,)
+    )
+
+    for value in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]:
+        delivery.record(value)
+    env.record_sample("delivery_time", 7.0)
+
+    metrics = env.get_recording().metrics
+    metric = metrics.sample[0]
+    assert metric.data.value == []
+    assert metric.summary.count == 7
+    assert metric.summary.mean == 4.0
+    assert metric.summary.variance == pytest.approx(28 / 6)
+    assert metric.summary.min == 1.0
+    assert metric.summary.max == 7.0
+    assert metric.summary.quantiles["0.5"] == pytest.approx(4.0, abs=1.0)
+
+
+def test_sample_metric_summary_next_to_points():
+    """Test that summaries can be kept next to the raw points."""
+    env = RecordingEnvironment()
+    delivery = env.sample_metric("delivery_time", summary=True)
+    delivery.record(2.0)
+
+    metric = env.get_recording().metrics.sample[0]
+    assert metric.data.value == [2.0]
+    assert metric.summary.count == 1
+
+
+def test_gauge_time_weighted_summary():
+    """Test that gauges export a time-weighted mean up to the current time."""
+    env = RecordingEnvironment()
+    level = env.gauge_metric("buffer_level")
+
+    env.run(until=2.0)
+    level.set(4)
+    env.run(until=4.0)
+    level.adjust(-2)
+    env.run(until=10.0)
+
+    summary = env.get_recording().metrics.gauge[0].summary
+    assert summary.kind == "gauge"
+    assert summary.start_time == 2.0
+    assert summary.end_time == 10.0
+    assert summary.integral == 4 * 2 + 2 * 6
+    assert summary.time_weighted_mean == pytest.approx(20 / 8)
+    assert summary.min == 2
+    assert summary.max == 4
+
+
+def test_state_time_in_state_summary():
+    """Test that state metrics export the cumulative time spent in each state."""
+    class MachineState(StrEnum):
+        IDLE = "idle"
+        PROCESSING = "processing"
+        ERROR = "error"
+
+    env = RecordingEnvironment()
+    env.set_state("machine_state", MachineState.IDLE)
+    env.run(until=3.0)
+    env.set_state("machine_state", MachineState.PROCESSING)
+    env.run(until=4.0)
+    env.set_state("machine_state", MachineState.IDLE)
+    env.run(until=6.0)
+    env.set_state("machine_state", MachineState.PROCESSING)
+    env.run(until=10.0)
+
+    summary = env.get_recording().metrics.state[0].summary
+    assert summary.kind == "state"
+    assert summary.end_time == 10.0
+    assert summary.time_in_state == {"idle": 5.0, "processing": 5.0, "error": 0.0}
+
+
+def test_gauge_rollup_buckets():
+    """Test that rollup mode aggregates gauge updates into fixed buckets."""
+    env = RecordingEnvironment(
+        metrics_rollup=RollupConfig(bucket_size=10.0, resolutions=(1, 3))
+    )
+    level = env.gauge_metric("buffer_level")
+
+    level.set(2)
+    env.run(until=5.0)
+    level.set(6)
+    env.run(until=25.0)
+    level.set(0)
+    env.run(until=40.0)
+
+    metric = env.get_recording().metrics.gauge[0]
+    fine, coarse = metric.rollups
+    assert fine.bucket_size == 10.0
+    # No update in [10, 20): that bucket has no row
+    assert fine.start_time == [0.0, 20.0]
+    assert fine.last == [6, 0]
+    assert fine.min == [2, 0]
+    assert fine.max == [6, 6]
+    assert fine.mean == [4, 0]
+    assert fine.time_weighted_mean == pytest.approx([4.0, 3.0])
+    # Data holds the level at the end of each finest bucket
+    assert metric.data.timestamp == [10.0, 30.0]
+    assert metric.data.value == [6, 0]
+
+    assert coarse.bucket_size == 30.0
+    assert coarse.start_time == [0.0]
+    assert coarse.last == [0]
+    assert coarse.min == [0]
+    assert coarse.max == [6]
+    assert coarse.time_weighted_mean == pytest.approx([(2 * 5 + 6 * 20) / 30])
+
+    # The time-weighted summary is unaffected by rollup mode
+    assert metric.summary.time_weighted_mean == pytest.approx((10 + 120) / 40)
+
+
+def test_counter_rollup_bounds_memory():
+    """Test that the number of rollup rows follows the buckets, not the updates."""
+    env = RecordingEnvironment(metrics_rollup=RollupConfig(bucket_size=100.0))
+    served = env.counter_metric("served")
+
+    def process(env):
+        while True:
+            served.incr()
+            yield env.timeout(1)
+
+    env.process(process(env))
+    env.run(until=1000)
+
+    assert len(served) == 0
+    assert len(served.rollup) == 10
+    rollup = env.get_recording().metrics.counter[0].rollups[0]
+    assert rollup.last[-1] == 1000
+    assert rollup.time_weighted_mean[0] == pytest.approx(50.5)
+
+
+def test_rollup_resolutions_must_be_multiples():
+    with pytest.raises(ValueError):
+        RollupConfig(bucket_size=10.0, resolutions=(1, 2.5))
+    with pytest.raises(ValueError):
+        RollupConfig(bucket_size=0)
+
+
+def test_compact_metrics_collapse_same_timestamp_updates():
+    """Test that compact mode keeps one point per timestamp and value change."""
+    class MachineState(StrEnum):
+        IDLE = "idle"
+        PROCESSING = "processing"
+
+    env = RecordingEnvironment(compact_metrics=True)
+    env.set_gauge("queue", 1)
+    env.run(until=1.0)
+    # Paired +1/-1 at the same time restores the previous value
+    env.adjust_gauge("queue", 1)
+    env.adjust_gauge("queue", -1)
+    env.run(until=2.0)
+    env.adjust_gauge("queue", 1)
+    env.adjust_gauge("queue", 1)
+    env.set_gauge("queue", 3)
+    env.set_state("machine", MachineState.IDLE)
+    env.set_state("machine", MachineState.IDLE)
+    env.run(until=3.0)
+    env.set_state("machine", MachineState.IDLE)
+    env.set_state("machine", MachineState.PROCESSING)
+    # Samples are independent observations and are never collapsed
+    env.record_sample("duration", 1.0)
+    env.record_sample("duration", 1.0)
+    # Dropped points are not counted towards the next chunk
+    assert env._metrics_container.pending_points == 6
+
+    metrics = env.get_recording().metrics
+    assert metrics.gauge[0].data.timestamp == [0.0, 2.0]
+    assert metrics.gauge[0].data.value == [1, 3]
+    assert metrics.state[0].data.timestamp == [2.0, 3.0]
+    assert metrics.state[0].data.state == ["idle", "processing"]
+    assert metrics.sample[0].data.value == [1.0, 1.0]
+    assert metrics.gauge[0].summary.time_weighted_mean == pytest.approx(5 / 3)
+
+
+def test_query_metrics_by_name_and_labels():
+    """Test that query() matches the name exactly and all given label pairs."""
+    env = RecordingEnvironment()
+    env.set_gauge("items", 1, {"entity": "Buffer 1", "entity_type": "buffer"})
+    env.set_gauge("items", 2, {"entity": "Buffer 2", "entity_type": "buffer"})
+    env.incr_counter("delivered", labels={"entity": "Sink 1", "entity_type": "sink"})
+    env.incr_counter(
+        "delivered", labels={"entity": "Buffer 1", "entity_type": "buffer"}
+    )
+    # Registered but never recorded: omitted from query results
+    env.counter_metric("unused", {"entity": "Buffer 1"})
+
+    buffer_1 = env.query_metrics(labels={"entity": "Buffer 1"})
+    assert [m.name for m in buffer_1.gauge] == ["items"]
+    assert [m.name for m in buffer_1.counter] == ["delivered"]
+
+    buffers = env.query_metrics(name="items", labels={"entity_type": "buffer"})
+    assert [m.data.value for m in buffers.gauge] == [[1], [2]]
+    assert env.query_metrics(name="items", labels={"entity_type": "sink"}).gauge == []
+    assert env.query_metrics(name="missing").counter == []
+
+    # The exported schema filters the same way
+    recording = env.get_recording()
+    assert recording.metrics.filter(labels={"entity": "Buffer 1"}) == buffer_1
+    assert len(env.query_metrics().counter) == 2
+
+
+def test_reset_metrics_restarts_at_warmup_boundary():
+    """Test that reset_metrics() drops earlier points and restarts summaries."""
+    class MachineState(StrEnum):
+        IDLE = "idle"
+        PROCESSING = "processing"
+
+    env = RecordingEnvironment(compact_metrics=True)
+    env.incr_counter("delivered", 3)
+    env.set_gauge("queue", 4)
+    env.set_state("machine", MachineState.PROCESSING)
+    env.sample_metric("lead_time", summary=True).record(10.0)
+    env.run(until=5.0)
+
+    env.reset_metrics()
+    env.run(until=7.0)
+    env.incr_counter("delivered")
+    env.set_gauge("queue", 2)
+    env.sample_metric("lead_time").record(1.0)
+    env.run(until=9.0)
+
+    metrics = env.get_recording().metrics
+    counter = metrics.counter[0]
+    assert counter.data.timestamp == [5.0, 7.0]
+    assert counter.data.value == [0, 1]
+
+    gauge = metrics.gauge[0]
+    assert gauge.data.timestamp == [5.0, 7.0]
+    assert gauge.data.value == [4, 2]
+    assert gauge.summary.start_time == 5.0
+    assert gauge.summary.time_weighted_mean == pytest.approx(3.0)
+    assert gauge.summary.max == 4
+
+    state = metrics.state[0]
+    assert state.data.timestamp == [5.0]
+    assert state.summary.time_in_state == {"idle": 0.0, "processing": 4.0}
+
+    sample = metrics.sample[0]
+    assert sample.data.value == [1.0]
+    assert sample.summary.count == 1
+    assert sample.summary.mean == 1.0
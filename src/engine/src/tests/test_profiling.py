@@ -0,0 +1,131 @@
+"""Tests for event-loop instrumentation."""
+
+import tracemalloc
+
+import pytest
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.profiling import EventLoopProfiler
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.timeline import decode_recording, encode_recording
+
+
+class TickingEntity(SimulationEntity):
+    def __init__(self, name: str, interval: float):
+        super().__init__()
+        self.name = name
+        self.interval = interval
+
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name=self.name)
+
+    def process(self, env: RecordingEnvironment):
+        while True:
+            yield env.timeout(self.interval)
+
+
+class SpawningEntity(TickingEntity):
+    def process(self, env: RecordingEnvironment):
+        while True:
+            yield env.timeout(self.interval)
+            env.process(_short_lived(env))
+
+
+def _short_lived(env: RecordingEnvironment):
+    yield env.timeout(1)
+
+
+def _profiled_env(**profiler_kwargs) -> tuple[RecordingEnvironment, EventLoopProfiler]:
+    profiler = EventLoopProfiler(**profiler_kwargs)
+    return RecordingEnvironment(profiler=profiler), profiler
+
+
+def test_events_are_counted_per_process_and_entity():
+    env, profiler = _profiled_env()
+    chatty = TickingEntity("chatty", interval=1)
+    quiet = TickingEntity("quiet", interval=10)
+    env.process(chatty.process(env))
+    env.process(quiet.process(env))
+    env.run(until=100)
+
+    report = profiler.report()
+    by_name = {entity.name: entity for entity in report.entities}
+    # Initialize plus one resume per tick before until
+    assert by_name["chatty"].processed == 100
+    assert by_name["quiet"].processed == 10
+    # One timeout per resume
+    assert by_name["chatty"].scheduled == 100
+    assert report.entities[0].name == "chatty"
+    assert report.entities[0].entity_type == SimulationEntityType.AGV
+    assert report.events >= 110
+    assert report.wall_time >= sum(entity.wall_time for entity in report.entities)
+
+
+def test_spawned_processes_are_grouped_by_generator():
+    env, profiler = _profiled_env()
+    spawner = SpawningEntity("spawner", interval=2)
+    env.process(spawner.process(env))
+    env.run(until=22)
+
+    report = profiler.report()
+    processes = {process.name: process for process in report.processes}
+    short_lived = processes["_short_lived"]
+    assert short_lived.entity_id is None
+    assert short_lived.instances == 10
+    # Initialize and the timeout's resume of every instance
+    assert short_lived.processed == 20
+    # Its timeout and its own termination event
+    assert short_lived.scheduled == 20
+    # The spawner schedules its own timeouts and the children's Initialize
+    assert processes["SpawningEntity.process"].scheduled == 21
+    assert [entity.name for entity in report.entities] == ["spawner"]
+
+
+def test_event_heap_is_sampled():
+    env, profiler = _profiled_env(heap_interval=10)
+    env.process(TickingEntity("ticker", interval=1).process(env))
+    env.run(until=50)
+
+    heap = profiler.report().heap
+    assert [sample.events for sample in heap] == [1, 11, 21, 31, 41, 51]
+    # The ticker's next timeout and the stop event of run(until)
+    assert [sample.queue_length for sample in heap[:-1]] == [2] * 5
+    assert all(sample.memory_bytes is None for sample in heap)
+    sim_times = [sample.sim_time for sample in heap]
+    assert sim_times == sorted(sim_times)
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_is_traced_on_request_and_tracing_stopped():
+    assert not tracemalloc.is_tracing()
+    env, profiler = _profiled_env(heap_interval=10, trace_memory=True)
+    env.process(TickingEntity("ticker", interval=1).process(env))
+    env.run(until=20)
+    assert tracemalloc.is_tracing()
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    assert all(sample.memory_bytes > 0 for sample in profiler.report().heap)
+
+
+def test_profile_is_attached_to_recordings():
+    env, profiler = _profiled_env()
+    env.process(TickingEntity("ticker", interval=1).process(env))
+    env.run(until=10)
+
+    recording = env.get_recording()
+    assert recording.profile == profiler.report()
+    decoded = decode_recording(encode_recording(env.get_normalized_recording()))
+    assert decoded.profile == recording.profile
+
+    assert RecordingEnvironment().get_recording().profile is None
+
+
+def test_unprofiled_environment_uses_simpy_event_loop():
+    env = RecordingEnvironment()
+    assert "step" not in vars(env)
+    assert "schedule" not in vars(env)
+
+    with pytest.raises(ValueError):
+        EventLoopProfiler(heap_interval=0)
@@ -0,0 +1,103 @@
+"""Tests for time-indexed queries over recordings."""
+
+import math
+
+import pytest
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.recording_index import RecordingIndex
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+
+
+class DummyEntity(SimulationEntity):
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV)
+
+
+def test_entity_state_interpolates_active_segment():
+    env = RecordingEnvironment()
+    entity = DummyEntity()
+    env.record_motion_nowait(entity, start_time=0, end_time=10, end_x=100.0)
+    env.record_progress(entity, start_time=0, end_time=10, end_value=1.0)
+    index = RecordingIndex(env.get_recording())
+
+    state = index.entity_state(entity.id, 2.5)
+    assert state.x == 25.0
+    assert state.entity_type == SimulationEntityType.AGV
+    assert state.progress.value == 0.25
+
+    assert index.entity_state(entity.id, 11.0) is None
+    assert index.entity_state(entity.id, -1.0) is None
+    assert index.entity_state("missing", 1.0) is None
+
+
+def test_new_record_invalidates_previous():
+    env = RecordingEnvironment()
+    entity = DummyEntity()
+    env.record_stay_nowait(entity, start_time=0, x=1.0)
+    env.record_motion_nowait(
+        entity, start_time=5, end_time=15, start_x=10.0, end_x=20.0
+    )
+    env.record_disappearance(entity, time=20)
+    env.run(until=30)
+    index = RecordingIndex(env.get_recording())
+
+    assert index.entity_state(entity.id, 4.0).x == 1.0
+    assert index.entity_state(entity.id, 5.0).x == 10.0
+    assert index.entity_state(entity.id, 15.0).x == 20.0
+    # Between the end of the motion and the disappearance nothing is visible
+    assert index.entity_state(entity.id, 17.0) is None
+    assert index.entity_state(entity.id, 25.0) is None
+
+
+def test_none_end_time_extends_by_duration():
+    env = RecordingEnvironment()
+    entity = DummyEntity()
+    env.record_stay_nowait(entity, start_time=0, x=3.0)
+    env.run(until=10)
+    index = RecordingIndex(env.get_recording())
+
+    assert index.entity_state(entity.id, 10.0).x == 3.0
+    assert index.entity_state(entity.id, 10.5) is None
+
+
+def test_snapshot_resolves_parent_coordinates():
+    env = RecordingEnvironment()
+    agv = DummyEntity()
+    box = DummyEntity()
+    env.record_stay_nowait(
+        agv, start_time=0, end_time=5, x=10.0, y=20.0, angle=math.pi / 2
+    )
+    env.record_stay_nowait(box, start_time=0, end_time=10, x=1.0, y=0.0, parent=agv)
+    index = RecordingIndex(env.get_recording())
+
+    snapshot = index.snapshot(2.0)
+    assert set(snapshot) == {agv.id, box.id}
+    assert snapshot[box.id].x == pytest.approx(10.0)
+    assert snapshot[box.id].y == pytest.approx(21.0)
+    assert snapshot[box.id].angle == pytest.approx(math.pi / 2)
+    assert index.entity_state(box.id, 2.0) == snapshot[box.id]
+    assert index.snapshot(2.0, world=False)[box.id].x == 1.0
+
+    # Parent not visible: the child is placed at its own coordinates
+    assert index.snapshot(7.0)[box.id].x == 1.0
+
+
+def test_window_returns_visible_segments():
+    env = RecordingEnvironment()
+    a = DummyEntity()
+    b = DummyEntity()
+    for start in range(0, 100, 10):
+        env.record_motion_nowait(a, start_time=start, end_time=start + 10, end_x=1.0)
+    env.record_stay_nowait(b, start_time=50, end_time=55)
+    index = RecordingIndex(env.get_recording().normalize())
+
+    segments = index.segments_in_window(a.id, 25.0, 40.0)
+    assert [s.start_time for s in segments] == [20.0, 30.0, 40.0]
+    # The segment ending at 20 is invalidated by the one starting at 20
+    assert [s.start_time for s in index.segments_in_window(a.id, 20.0, 20.0)] == [20.0]
+
+    window = index.window(56.0, 60.0)
+    assert list(window) == [a.id]
+    assert set(index.window(0.0, 100.0)) == {a.id, b.id}
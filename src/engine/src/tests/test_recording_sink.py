@@ -0,0 +1,133 @@
+"""Tests for streaming recordings to a sink during the run."""
+
+import pytest
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.recording_sink import (
+    StreamingRecordingWriter,
+    read_recording_stream,
+)
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.rollup import RollupConfig
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.timeline import merge_chunks
+
+
+class DummyEntity(SimulationEntity):
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name="dummy")
+
+
+def _start_processes(env: RecordingEnvironment, entities: list[DummyEntity]) -> None:
+    def process(env, entity, offset):
+        x = offset
+        while True:
+            yield env.record_motion(
+                entity, start_x=x, start_y=0, end_x=x + 1, end_y=0, duration=1
+            )
+            x += 1
+            env.record_progress(entity, start_value=0, end_value=100, duration=1)
+            env.incr_counter("moves")
+            env.set_gauge("position", x, labels={"entity": entity.id})
+
+    for offset, entity in enumerate(entities):
+        env.process(process(env, entity, offset * 10))
+
+
+def _simulate(env: RecordingEnvironment, entities: list[DummyEntity]) -> None:
+    _start_processes(env, entities)
+    env.run(until=50)
+
+
+def test_streamed_recording_matches_in_memory_recording(tmp_path):
+    entities = [DummyEntity() for _ in range(3)]
+    expected_env = RecordingEnvironment()
+    _simulate(expected_env, entities)
+    expected = expected_env.get_normalized_recording()
+
+    writer = StreamingRecordingWriter(str(tmp_path / "run.dsts"))
+    env = RecordingEnvironment(sink=writer, chunk_size=20)
+    _simulate(env, entities)
+    streamed = env.get_normalized_recording()
+    writer.close()
+
+    assert len(list(read_recording_stream(tmp_path / "run.dsts"))) > 1
+    assert streamed.model_dump() == expected.model_dump()
+    assert env.get_recording().model_dump() == expected_env.get_recording().model_dump()
+
+
+def test_chunk_size_bounds_memory(tmp_path):
+    writer = StreamingRecordingWriter(str(tmp_path / "run.dsts"))
+    env = RecordingEnvironment(sink=writer, chunk_size=10)
+    entity = DummyEntity()
+    max_pending = 0
+
+    def process(env):
+        nonlocal max_pending
+        while True:
+            yield env.record_stay(entity, x=0, y=0, duration=1)
+            env.incr_counter("stays")
+            pending = len(env._motion_store) + env._metrics_container.pending_points
+            max_pending = max(max_pending, pending)
+
+    env.process(process(env))
+    env.run(until=100)
+
+    assert max_pending < 10
+    assert len(env.get_normalized_recording().motion_segments.entity) == 100
+    writer.close()
+
+
+def test_read_recording_stream_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_stream.dsts"
+    path.write_bytes(b"DSTR\x01\x00\x00\x00")
+
+    with pytest.raises(ValueError):
+        list(read_recording_stream(path))
+
+
+def test_streamed_rollups_match_in_memory_rollups(tmp_path):
+    rollup = RollupConfig(bucket_size=5.0, resolutions=(1, 4))
+    entities = [DummyEntity() for _ in range(2)]
+    expected_env = RecordingEnvironment(metrics_rollup=rollup)
+    _simulate(expected_env, entities)
+
+    writer = StreamingRecordingWriter(str(tmp_path / "run.dsts"))
+    env = RecordingEnvironment(sink=writer, chunk_size=20, metrics_rollup=rollup)
+    _simulate(env, entities)
+
+    expected = expected_env.get_recording().metrics
+    assert env.get_recording().metrics.model_dump() == expected.model_dump()
+    writer.close()
+
+
+def test_run_chunks_merge_to_full_recording():
+    entities = [DummyEntity() for _ in range(3)]
+    expected_env = RecordingEnvironment()
+    _simulate(expected_env, entities)
+
+    env = RecordingEnvironment()
+    _start_processes(env, entities)
+    chunks = list(env.run_chunks(until=50, step=7.5))
+
+    assert [chunk.end_time for chunk in chunks] == [7.5, 15, 22.5, 30, 37.5, 45, 50]
+    assert all(
+        chunk.start_time == previous.end_time
+        for previous, chunk in zip(chunks[:-1], chunks[1:], strict=True)
+    )
+    expected = expected_env.get_normalized_recording()
+    assert merge_chunks(chunks).model_dump() == expected.model_dump()
+
+
+def test_run_chunks_rejects_invalid_use(tmp_path):
+    env = RecordingEnvironment()
+    with pytest.raises(ValueError):
+        next(env.run_chunks(until=10, step=0))
+
+    writer = StreamingRecordingWriter(str(tmp_path / "run.dsts"))
+    env = RecordingEnvironment(sink=writer)
+    with pytest.raises(ValueError):
+        next(env.run_chunks(until=10, step=1))
+    with pytest.raises(ValueError):
+        env.drain_chunk()
+    writer.close()
@@ -0,0 +1,56 @@
+"""Tests for KPI extraction and aggregation of replications."""
+
+import pytest
+
+from destiny_sim.builder.replications import (
+    ReplicationResult,
+    aggregate,
+    estimate,
+    summarize_metrics,
+    t_quantile,
+)
+from destiny_sim.core.environment import RecordingEnvironment
+
+
+@pytest.mark.parametrize(
+    "df, expected", [(1, 12.706), (2, 4.303), (3, 3.182), (10, 2.228), (30, 2.042)]
+)
+def test_t_quantile_matches_table(df, expected):
+    assert t_quantile(0.975, df) == pytest.approx(expected, abs=5e-3)
+
+
+def test_estimate_confidence_interval():
+    result = estimate([1.0, 2.0, 3.0, 4.0], confidence=0.95)
+    assert result.mean == 2.5
+    assert result.std == pytest.approx(1.2910, abs=1e-4)
+    # t(0.975, 3) * std / sqrt(4)
+    assert result.upper - result.mean == pytest.approx(3.182 * 1.2910 / 2, abs=1e-2)
+
+    single = estimate([5.0])
+    assert single.lower == single.upper == 5.0
+
+
+def test_summarize_metrics_reduces_each_metric_type():
+    env = RecordingEnvironment()
+    env.incr_counter("served", 3)
+    env.set_gauge("queue", 2, {"station": "a"})
+    env.record_sample("wait", 1.0)
+    env.record_sample("wait", 3.0)
+    env.run(until=4.0)
+    env.set_gauge("queue", 0, {"station": "a"})
+    env.run(until=8.0)
+
+    kpis = summarize_metrics(env.get_recording().metrics)
+    assert kpis == {"served": 3, "queue{station=a}": 1.0, "wait": 2.0}
+
+
+def test_aggregate_skips_missing_kpis():
+    summary = aggregate(
+        [
+            ReplicationResult(seed=0, kpis={"a": 1.0, "b": 2.0}),
+            ReplicationResult(seed=1, kpis={"a": 3.0}),
+        ]
+    )
+    assert summary.kpis["a"].n == 2
+    assert summary.kpis["a"].mean == 2.0
+    assert summary.kpis["b"].n == 1
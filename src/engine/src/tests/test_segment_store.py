@@ -0,0 +1,155 @@
+"""Tests for the columnar segment stores."""
+
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.segment_store import (
+    NO_HANDLE,
+    EntityTable,
+    MotionSegmentStore,
+    ProgressSegmentStore,
+)
+from destiny_sim.core.simulation_entity import SimulationEntity
+
+
+class NamedEntity(SimulationEntity):
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+        self.rendering_info_calls = 0
+
+    def get_rendering_info(self) -> RenderingInfo:
+        self.rendering_info_calls += 1
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name=self.name)
+
+
+def _append_motion(store: MotionSegmentStore, handle: int, **overrides):
+    fields = dict(
+        handle=handle,
+        parent=NO_HANDLE,
+        start_time=0.0,
+        end_time=None,
+        start_x=0.0,
+        start_y=0.0,
+        end_x=0.0,
+        end_y=0.0,
+        start_angle=0.0,
+        end_angle=0.0,
+    )
+    fields.update(overrides)
+    store.append(**fields)
+
+
+def test_entity_table_registers_each_entity_once():
+    table = EntityTable()
+    a = NamedEntity("A")
+    b = NamedEntity("B")
+
+    assert table.register(a) == 0
+    assert table.register(b) == 1
+    assert table.register(a) == 0
+    assert a.rendering_info_calls == 1
+    assert table.get("missing") is None
+
+    descriptors = table.descriptors()
+    assert [d.entity_id for d in descriptors] == [a.id, b.id]
+    assert descriptors[0].name == "A"
+    assert descriptors[1].entity_type == SimulationEntityType.AGV
+
+
+def test_motion_store_round_trips_segments():
+    table = EntityTable()
+    store = MotionSegmentStore(table)
+    a = table.register(NamedEntity("A"))
+    b = table.register(NamedEntity("B"))
+
+    _append_motion(store, a, start_time=1.0, end_time=3.0, end_x=10.0)
+    _append_motion(store, b, parent=a, start_x=2.0, end_x=2.0)
+    _append_motion(store, a, start_time=3.0)
+
+    assert len(store) == 3
+
+    segments = store.segments_by_entity()
+    a_id, b_id = table.ids
+    assert list(segments) == [a_id, b_id]
+    assert [s.start_time for s in segments[a_id]] == [1.0, 3.0]
+    assert segments[a_id][0].end_time == 3.0
+    assert segments[a_id][0].name == "A"
+    assert segments[a_id][1].end_time is None
+    assert segments[b_id][0].parent_id == a_id
+    assert segments[b_id][0].entity_type == SimulationEntityType.AGV
+
+
+def test_motion_store_segments_for_unknown_entity():
+    store = MotionSegmentStore(EntityTable())
+
+    assert store.segments_for("missing") == []
+
+
+def test_motion_store_to_table():
+    table = EntityTable()
+    store = MotionSegmentStore(table)
+    a = table.register(NamedEntity("A"))
+
+    _append_motion(store, a, start_time=1.0, end_time=2.0)
+    _append_motion(store, a, start_time=2.0)
+
+    columns = store.to_table()
+    assert columns.entity == [a, a]
+    assert columns.parent == [NO_HANDLE, NO_HANDLE]
+    assert columns.end_time == [2.0, None]
+
+
+def test_progress_store_shares_entity_table():
+    table = EntityTable()
+    motion_store = MotionSegmentStore(table)
+    progress_store = ProgressSegmentStore(table)
+    a = table.register(NamedEntity("A"))
+    b = table.register(NamedEntity("B"))
+
+    _append_motion(motion_store, a)
+    progress_store.append(b, 0.0, None, 0.0, 1.0, 0.0, 1.0)
+    progress_store.append(a, 0.0, 5.0, 0.0, 1.0, 0.0, 1.0)
+
+    a_id, b_id = table.ids
+    assert progress_store.segments_for(a_id)[0].end_time == 5.0
+    assert progress_store.segments_for(b_id)[0].end_time is None
+
+
+def test_motion_store_coalesces_segments():
+    table = EntityTable()
+    store = MotionSegmentStore(table, coalesce=True)
+    a = table.register(NamedEntity("A"))
+
+    # Collinear motion with equal velocity is merged
+    _append_motion(store, a, start_time=0.0, end_time=1.0, end_x=10.0)
+    _append_motion(store, a, start_time=1.0, end_time=2.0, start_x=10.0, end_x=20.0)
+    # Different velocity starts a new segment
+    _append_motion(store, a, start_time=2.0, end_time=3.0, start_x=20.0, end_x=40.0)
+    # Repeated infinite stay at the same place is dropped
+    _append_motion(store, a, start_time=3.0, start_x=40.0, end_x=40.0)
+    _append_motion(store, a, start_time=4.0, start_x=40.0, end_x=40.0)
+
+    columns = store.to_table()
+    assert columns.start_time == [0.0, 2.0, 3.0]
+    assert columns.end_time == [2.0, 3.0, None]
+    assert columns.end_x == [20.0, 40.0, 40.0]
+
+    # A segment starting at the same time replaces the previous one
+    _append_motion(store, a, start_time=5.0, end_time=5.0)
+    _append_motion(store, a, start_time=5.0, end_time=6.0, end_x=1.0)
+    assert store.to_table().start_time == [0.0, 2.0, 3.0, 5.0]
+    assert store.to_table().end_time[-1] == 6.0
+
+
+def test_motion_store_does_not_coalesce_across_gaps():
+    table = EntityTable()
+    store = MotionSegmentStore(table, coalesce=True)
+    a = table.register(NamedEntity("A"))
+
+    _append_motion(store, a, start_time=0.0, end_time=1.0, end_x=10.0)
+    _append_motion(store, a, start_time=2.0, end_time=3.0, start_x=10.0, end_x=20.0)
+    _append_motion(store, a, start_time=3.0, end_time=3.0, start_x=20.0, end_x=20.0)
+    _append_motion(
+        store, a, start_time=3.0, end_time=4.0, start_x=20.0, end_x=30.0, parent=a
+    )
+
+    assert len(store) == 3
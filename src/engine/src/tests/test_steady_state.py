@@ -0,0 +1,67 @@
+"""Tests for MSER-5 warm-up detection and the steady-state detector."""
+
+import numpy as np
+
+from destiny_sim.builder.schema import SteadyStateParams
+from destiny_sim.builder.steady_state import SteadyStateDetector, mser5
+
+
+def _transient_series(warmup: int, steady: int, seed: int = 0) -> list[float]:
+    """Ramp from 0 to 10 over warmup observations, then noise around 10."""
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(0, 10, warmup, endpoint=False)
+    noise = rng.normal(0, 0.5, warmup + steady)
+    return (np.concatenate([ramp, np.full(steady, 10.0)]) + noise).tolist()
+
+
+def test_mser5_truncates_the_transient():
+    truncation = mser5(_transient_series(warmup=50, steady=450))
+
+    assert truncation is not None
+    assert truncation % 5 == 0
+    assert 30 <= truncation <= 80
+
+
+def test_mser5_keeps_stationary_series():
+    series = np.random.default_rng(1).normal(10, 1, 200).tolist()
+
+    assert mser5(series) is not None
+    assert mser5(series) < 100
+
+
+def test_mser5_without_steady_state():
+    # Still rising: the minimum lies at the end of the series
+    assert mser5(np.linspace(0, 10, 100).tolist()) is None
+    assert mser5([1.0] * 9) is None
+
+
+def test_detector_detects_warmup_then_precision():
+    detector = SteadyStateDetector(SteadyStateParams(relativePrecision=0.05, batches=5))
+    series = _transient_series(warmup=30, steady=1000)
+
+    detected_at = None
+    for index, throughput in enumerate(series):
+        detector.observe({"delivered": throughput})
+        if detected_at is None:
+            if detector.detect_warmup():
+                detected_at = index
+            assert not detector.is_precise()
+        elif detector.is_precise():
+            break
+
+    assert detected_at is not None and detected_at >= 30
+    # Precision is judged on the observations after the warm-up only
+    assert index - detected_at >= 5
+
+
+def test_detector_fills_late_counters_with_zeros():
+    detector = SteadyStateDetector(SteadyStateParams(batches=5), warmed_up=True)
+    detector.observe({"produced": 1.0})
+    detector.observe({"produced": 1.0, "delivered": 1.0})
+
+    # delivered counts as 0 in the first interval: its mean is imprecise
+    assert not detector.is_precise()
+
+    for _ in range(20):
+        detector.observe({"produced": 1.0, "delivered": 1.0})
+    assert detector.is_precise()
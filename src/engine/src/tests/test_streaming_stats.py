@@ -0,0 +1,65 @@
+"""Tests for streaming statistics."""
+
+import numpy as np
+import pytest
+
+from destiny_sim.core.streaming_stats import (
+    P2Quantile,
+    RunningStatistics,
+    SampleStatistics,
+)
+
+
+def test_running_statistics_match_numpy():
+    values = np.random.default_rng(1).normal(10.0, 3.0, size=5000)
+    stats = RunningStatistics()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == 5000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert stats.min == values.min()
+    assert stats.max == values.max()
+
+
+def test_running_statistics_single_observation():
+    stats = RunningStatistics()
+    stats.add(4.0)
+
+    assert stats.mean == 4.0
+    assert stats.variance == 0.0
+
+
+@pytest.mark.parametrize("p", [0.5, 0.9, 0.99])
+def test_p2_quantile_approximates_quantile(p):
+    values = np.random.default_rng(2).lognormal(0.0, 0.5, size=20000)
+    quantile = P2Quantile(p)
+    for value in values:
+        quantile.add(value)
+
+    assert quantile.value == pytest.approx(np.quantile(values, p), rel=0.02)
+
+
+def test_p2_quantile_exact_for_few_observations():
+    quantile = P2Quantile(0.5)
+    assert quantile.value is None
+
+    for value in [3.0, 1.0, 2.0]:
+        quantile.add(value)
+    assert quantile.value == 2.0
+
+
+def test_p2_quantile_rejects_invalid_p():
+    with pytest.raises(ValueError):
+        P2Quantile(1.0)
+
+
+def test_sample_statistics_tracks_all_quantiles():
+    stats = SampleStatistics((0.5, 0.9))
+    for value in range(100):
+        stats.add(float(value))
+
+    assert stats.count == 100
+    assert [q.p for q in stats.quantiles] == [0.5, 0.9]
+    assert stats.quantiles[0].value == pytest.approx(49.5, abs=1.0)
@@ -0,0 +1,103 @@
+"""Tests for recording shapes and the binary recording format."""
+
+import json
+import struct
+from enum import StrEnum
+
+import pytest
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.timeline import (
+    BINARY_RECORDING_MAGIC,
+    decode_recording,
+    encode_recording,
+)
+
+
+class NamedEntity(SimulationEntity):
+    def __init__(self, name: str | None = None):
+        super().__init__()
+        self.name = name
+
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name=self.name)
+
+
+class MachineState(StrEnum):
+    IDLE = "idle"
+    BUSY = "busy"
+
+
+def _make_env() -> RecordingEnvironment:
+    env = RecordingEnvironment()
+    agv = NamedEntity("agv-1")
+    box = NamedEntity()
+
+    def process():
+        env.set_state("machine", MachineState.IDLE, labels={"cell": "a"})
+        env.record_stay_nowait(box, parent=agv, x=1.0)
+        yield env.record_motion(agv, duration=2.0, end_x=10.0, end_angle=1.5)
+        env.incr_counter("delivered", 2)
+        env.record_sample("delivery_time", 2.5)
+        env.sample_metric("wait_time", summary=True, keep_points=False).record(1.5)
+        env.set_state("machine", MachineState.BUSY, labels={"cell": "a"})
+        env.record_progress(agv, duration=3.0)
+        env.record_disappearance(box)
+
+    env.process(process())
+    env.run(until=5.0)
+    return env
+
+
+def test_binary_round_trip():
+    env = _make_env()
+    recording = env.get_recording()
+
+    data = encode_recording(env.get_normalized_recording())
+    decoded = decode_recording(data)
+
+    assert data.startswith(BINARY_RECORDING_MAGIC)
+    assert decoded == env.get_normalized_recording()
+    assert decoded.to_recording() == recording
+
+
+def test_binary_encodes_denormalized_recording():
+    recording = _make_env().get_recording()
+
+    assert decode_recording(encode_recording(recording)).to_recording() == recording
+
+
+def test_binary_is_smaller_than_json():
+    env = RecordingEnvironment()
+    for _ in range(20):
+        entity = NamedEntity("entity")
+        for i in range(20):
+            env.record_stay_nowait(entity, start_time=float(i), x=float(i))
+
+    json_size = len(json.dumps(env.get_recording().model_dump(by_alias=True)))
+
+    assert len(encode_recording(env.get_normalized_recording())) < json_size / 2
+
+
+def test_decode_rejects_invalid_data():
+    with pytest.raises(ValueError, match="not a binary"):
+        decode_recording(b"{}" + bytes(10))
+
+    future_version = struct.pack("<4sHH", BINARY_RECORDING_MAGIC, 99, 0)
+    with pytest.raises(ValueError, match="version 99"):
+        decode_recording(future_version + bytes(8))
+
+
+def test_save_recording_binary(tmp_path):
+    env = _make_env()
+
+    env.save_recording(str(tmp_path / "recording.dstr"))
+    env.save_recording(str(tmp_path / "recording.json"))
+
+    binary = (tmp_path / "recording.dstr").read_bytes()
+    assert decode_recording(binary).to_recording() == env.get_recording()
+
+    data = json.loads((tmp_path / "recording.json").read_text())
+    assert data["duration"] == 5.0
@@ -0,0 +1,85 @@
+"""Tests for Chrome trace export of simulation execution."""
+
+import json
+
+from destiny_sim.core.environment import RecordingEnvironment
+from destiny_sim.core.rendering import RenderingInfo, SimulationEntityType
+from destiny_sim.core.simulation_entity import SimulationEntity
+from destiny_sim.core.tracing import EVENT_LOOP_TID, ExecutionTracer
+
+
+class Mover(SimulationEntity):
+    def get_rendering_info(self) -> RenderingInfo:
+        return RenderingInfo(entity_type=SimulationEntityType.AGV, name="mover")
+
+    def process(self, env: RecordingEnvironment):
+        moves = env.counter_metric("moves")
+        while True:
+            yield env.record_motion(
+                self, start_x=0, start_y=0, end_x=1, end_y=0, duration=1
+            )
+            moves.incr()
+
+
+def _traced_run(until: float) -> tuple[ExecutionTracer, list[dict]]:
+    tracer = ExecutionTracer()
+    env = RecordingEnvironment(profiler=tracer)
+    env.process(Mover().process(env))
+    env.run(until=until)
+    return tracer, tracer.trace_events()
+
+
+def test_trace_has_process_slices_sim_time_and_markers():
+    tracer, events = _traced_run(until=5)
+
+    tracks = {
+        event["tid"]: event["args"]["name"]
+        for event in events
+        if event["ph"] == "M" and event["name"] == "thread_name"
+    }
+    assert tracks[EVENT_LOOP_TID] == "event loop"
+    mover_tid = next(
+        tid for tid, name in tracks.items() if name == "Mover.process (mover)"
+    )
+
+    slices = [
+        event for event in events if event["ph"] == "X" and event["tid"] == mover_tid
+    ]
+    # Initialize plus the resumes at 1..4
+    assert len(slices) == 5
+    assert all(event["dur"] >= 0 for event in slices)
+    assert [event["ts"] for event in slices] == sorted(event["ts"] for event in slices)
+
+    sim_times = [
+        event["args"]["sim_time"] for event in events if event["name"] == "sim_time"
+    ]
+    assert sim_times == [0, 1, 2, 3, 4, 5]
+
+    markers = [event for event in events if event["ph"] == "i"]
+    assert {event["tid"] for event in markers} == {mover_tid}
+    recording_markers = [event for event in markers if event["cat"] == "recording"]
+    metric_markers = [event for event in markers if event["cat"] == "metric"]
+    assert [event["name"] for event in recording_markers] == ["record_motion"] * 5
+    assert [event["args"]["value"] for event in metric_markers] == [1, 2, 3, 4]
+
+    # The aggregate profile is collected as well
+    assert tracer.report().entities[0].processed == 5
+
+
+def test_trace_is_saved_as_chrome_trace_json(tmp_path):
+    tracer, events = _traced_run(until=3)
+    path = tmp_path / "traces" / "run.json"
+    tracer.save(str(path))
+
+    trace = json.loads(path.read_text())
+    assert trace["traceEvents"] == events
+    assert trace["displayTimeUnit"] == "ms"
+
+
+def test_untraced_environment_is_not_instrumented():
+    env = RecordingEnvironment()
+    handle = env.counter_metric("moves")
+
+    assert "record_motion" not in vars(env)
+    assert "_record" not in vars(handle)
+    assert env._metrics_container.on_register is None
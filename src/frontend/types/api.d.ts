@@ -185,6 +185,97 @@ export interface components {
       | "manufacturing_cell"
       | "control"
       | "";
+    /**
+     * EntityProfile
+     * @description Event-loop cost of all processes of one entity.
+     */
+    EntityProfile: {
+      /** Entity Id */
+      entity_id: string;
+      /** Entity Type */
+      entity_type: string;
+      /** Name */
+      name?: string | null;
+      /**
+       * Scheduled
+       * @default 0
+       */
+      scheduled: number;
+      /**
+       * Processed
+       * @default 0
+       */
+      processed: number;
+      /**
+       * Wall Time
+       * @default 0
+       */
+      wall_time: number;
+    };
+    /**
+     * EventLoopProfile
+     * @description Report of an EventLoopProfiler.
+     *
+     *     Processes and entities are sorted by wall time, most expensive first.
+     *     Events that resumed no process (e.g. the stop event of run(until)) count
+     *     in the totals only.
+     */
+    EventLoopProfile: {
+      /**
+       * Events
+       * @default 0
+       */
+      events: number;
+      /**
+       * Scheduled
+       * @default 0
+       */
+      scheduled: number;
+      /**
+       * Wall Time
+       * @default 0
+       */
+      wall_time: number;
+      /**
+       * Processes
+       * @default []
+       */
+      processes: components["schemas"]["ProcessProfile"][];
+      /**
+       * Entities
+       * @default []
+       */
+      entities: components["schemas"]["EntityProfile"][];
+      /**
+       * Heap
+       * @default []
+       */
+      heap: components["schemas"]["HeapSample"][];
+    };
+    /**
+     * HeapSample
+     * @description Size of the event heap at a point of the run.
+     *
+     *     Attributes:
+     *         wall_time: Wall-clock seconds since the first processed event
+     *         sim_time: Simulation time
+     *         events: Events processed so far
+     *         queue_length: Events scheduled and not yet processed
+     *         memory_bytes: Size of the memory blocks traced by tracemalloc (only
+     *             with trace_memory)
+     */
+    HeapSample: {
+      /** Wall Time */
+      wall_time: number;
+      /** Sim Time */
+      sim_time: number;
+      /** Events */
+      events: number;
+      /** Queue Length */
+      queue_length: number;
+      /** Memory Bytes */
+      memory_bytes?: number | null;
+    };
     /**
      * MetricType
      * @description Enumeration of metric types.
@@ -291,6 +382,45 @@ export interface components {
        */
       endAngle: number;
     };
+    /**
+     * ProcessProfile
+     * @description Event-loop cost of the processes of one generator function and entity.
+     *
+     *     Attributes:
+     *         name: Qualified name of the generator function (e.g.
+     *             "ManufacturingCell.process")
+     *         entity_id: Id of the entity the generator is a method of, if any
+     *         instances: Number of SimPy processes started
+     *         scheduled: Events scheduled while one of the processes was running
+     *         processed: Events processed that resumed one of the processes
+     *         wall_time: Wall-clock seconds spent processing those events
+     */
+    ProcessProfile: {
+      /** Name */
+      name: string;
+      /** Entity Id */
+      entity_id?: string | null;
+      /**
+       * Instances
+       * @default 0
+       */
+      instances: number;
+      /**
+       * Scheduled
+       * @default 0
+       */
+      scheduled: number;
+      /**
+       * Processed
+       * @default 0
+       */
+      processed: number;
+      /**
+       * Wall Time
+       * @default 0
+       */
+      wall_time: number;
+    };
     /**
      * ProgressSegment
      * @description Describes an entity's progress/value during a time interval.
@@ -315,6 +445,19 @@ export interface components {
       /** Max Value */
       max_value: number;
     };
+    /**
+     * RunTruncation
+     * @description Marks a recording whose run was stopped early by a budget.
+     *
+     *     The recording covers the run up to sim_time instead of until.
+     */
+    RunTruncation: {
+      reason: components["schemas"]["TruncationReason"];
+      /** Sim Time */
+      sim_time: number;
+      /** Until */
+      until: number;
+    };
     /**
      * SimulationRecording
      * @description Complete recording of a simulation run.
@@ -328,6 +471,9 @@ export interface components {
      *     - to record stay in location, use the same start and end time and coordinates
      *     - to stay indefinitely, use None for end time
      *     - to stop rendering of an entity use same start and end time
+     *
+     *     truncation is set if a run budget stopped the run before its end time,
+     *     profile if the run was profiled (see destiny_sim.core.profiling).
      */
     SimulationRecording: {
       /** Duration */
@@ -355,6 +501,8 @@ export interface components {
        *     }
        */
       metrics: components["schemas"]["MetricsSchema"];
+      truncation?: components["schemas"]["RunTruncation"] | null;
+      profile?: components["schemas"]["EventLoopProfile"] | null;
     };
     /**
      * StateMetricData
@@ -381,6 +529,12 @@ export interface components {
       /** Value */
       value: number[];
     };
+    /**
+     * TruncationReason
+     * @description Budget that ended a run early.
+     * @enum {string}
+     */
+    TruncationReason: "wall_time" | "events" | "segments";
     /**
      * Blueprint
      * @description Simulation blueprint used by the engine.
@@ -471,8 +625,53 @@ export interface components {
       initialTime: number;
       /** Duration */
       duration?: number | null;
+      /** Seed */
+      seed?: number | null;
+      /** Warmuptime */
+      warmupTime?: number | null;
+      steadyState?: components["schemas"]["SteadyStateParams"] | null;
+      /**
+       * Compactmetrics
+       * @default false
+       */
+      compactMetrics: boolean;
       canvasSize?: components["schemas"]["CanvasSize"] | null;
     };
+    /**
+     * SteadyStateParams
+     * @description Automatic warm-up detection and early stopping.
+     *
+     *     The throughput of every counter is observed per interval of simulation
+     *     time. The warm-up ends where MSER-5 truncates the observations, and the
+     *     run stops once each throughput's confidence interval is within
+     *     relativePrecision of its mean (see destiny_sim.builder.steady_state).
+     */
+    SteadyStateParams: {
+      /**
+       * Interval
+       * @description Simulation time per throughput observation
+       * @default 60
+       */
+      interval: number;
+      /**
+       * Relativeprecision
+       * @description Target half-width of the throughput confidence intervals, relative to the mean
+       * @default 0.05
+       */
+      relativePrecision: number;
+      /**
+       * Confidence
+       * @description Confidence level of the intervals
+       * @default 0.95
+       */
+      confidence: number;
+      /**
+       * Batches
+       * @description Number of batch means per confidence interval
+       * @default 10
+       */
+      batches: number;
+    };
   };
   responses: never;
   parameters: never;